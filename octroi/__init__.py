@@ -0,0 +1 @@
+"""Composants de calcul et d'alimentation du dashboard Octroi de Mer"""
@@ -0,0 +1,394 @@
+# api.py
+"""API JSON locale servant les mêmes agrégats que le dashboard, sans interface.
+
+Les réponses sont calculées par le code du dashboard (cube, comparaisons,
+projections, simulateur) et mises en cache sous leur ETag, dérivé de la
+version des données (et du nombre de lots appliqués au journal temps réel
+pour les ressources vivantes) : une requête répétée est servie depuis le cache, déjà
+compressée, ou par un 304 si le client possède la même version. Les
+requêtes sont traitées par un pool de threads borné ; au-delà de la file
+d'attente, le serveur répond 503 plutôt que d'accumuler les connexions.
+
+    python -m octroi.api --port 8502 --workers 8
+    curl --compressed 'http://127.0.0.1:8502/api/v1/metriques?territoire=GLP'
+
+Ressources (``GET /api/v1/<ressource>?territoire=REU&...``) : territoires,
+metriques, mensuel, categories, secteurs, projections, comparaisons,
+simulateur, sante.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import pandas as pd
+
+from octroi.dashboard import OctroiMerDashboard, version_donnees
+from octroi.simulation import SimulationContext
+from octroi.territoires import TERRITOIRES, territoire_valide
+
+logger = logging.getLogger(__name__)
+
+PREFIXE = '/api/v1/'
+HOTE = os.environ.get('OCTROI_API_HOST', '127.0.0.1')
+WORKERS = int(os.environ.get('OCTROI_API_WORKERS', 8))
+# Connexions acceptées en attente d'un worker avant de répondre 503
+FILE_MAX = 32
+# Réponses (corps brut et gzip) conservées, toutes ressources confondues
+CAPACITE_CACHE = 256
+# En deçà, la compression coûte plus qu'elle ne rapporte
+TAILLE_MIN_GZIP = 512
+# Délai minimal entre deux lectures de la source temps réel (mode autonome)
+INTERVALLE_LIVE = 1.0
+
+
+def serialiser(objet):
+    """Objets pandas / numpy convertis en types JSON (NaN -> null, dates ISO)"""
+    if isinstance(objet, pd.DataFrame):
+        return json.loads(objet.to_json(orient='records', date_format='iso'))
+    if isinstance(objet, dict):
+        return {str(cle): serialiser(valeur) for cle, valeur in objet.items()}
+    if isinstance(objet, (list, tuple)):
+        return [serialiser(valeur) for valeur in objet]
+    if isinstance(objet, (bool, np.bool_)):
+        return bool(objet)
+    if isinstance(objet, (int, np.integer)):
+        return int(objet)
+    if isinstance(objet, (float, np.floating)):
+        return float(objet) if np.isfinite(objet) else None
+    if isinstance(objet, (datetime, date)):
+        return objet.isoformat()
+    return objet
+
+
+def _territoires(dashboard):
+    return [{'code': code, **infos} for code, infos in TERRITOIRES.items()]
+
+
+def _metriques(dashboard):
+    return dashboard.compute_key_metrics()
+
+
+def _mensuel(dashboard, niveau='total', mesure='revenu', membre=None, debut=None, fin=None):
+    if membre is not None:
+        return dashboard.cube.serie(niveau, membre, mesure, debut, fin).rename_axis('date').reset_index()
+    return dashboard.cube.slice(niveau, None, mesure, debut, fin)
+
+
+def _categories(dashboard):
+    return dashboard.cube.agreger_courant(dashboard.current_data, {
+        'variation_pct': 'mean',
+        'volume_importation': 'sum',
+        'revenu_mensuel': 'sum',
+        'secteur': 'count'
+    })
+
+
+def _secteurs(dashboard):
+    return dashboard.current_data
+
+
+def _projections(dashboard):
+    projections = dashboard.projections
+    return {
+        'annuel': projections.annuel(),
+        'bandes': projections.bandes().reset_index(),
+        'secteurs': projections.par_secteur()
+    }
+
+
+def _comparaisons(dashboard, niveau='secteur', mesure='revenu', periode=None):
+    return {
+        'total': dashboard.comparaisons.comparer('total', None, mesure, periode),
+        'membres': dashboard.comparaisons.tableau(niveau, mesure, periode)
+    }
+
+
+def _simulateur(dashboard, produit, valeur='1000', type_taux='Normal'):
+    return dashboard.compute_octroi(produit, float(valeur), type_taux)
+
+
+def _sante(dashboard):
+    return {
+        'version': dashboard.data_version,
+        'historique': dashboard.historique.stats(),
+        'ticks': dashboard.event_log.ticks,
+        'sequence': dashboard.event_log.sequence
+    }
+
+
+# Ressource -> (calcul, dépend du flux temps réel)
+RESSOURCES = {
+    'territoires': (_territoires, False),
+    'metriques': (_metriques, True),
+    'mensuel': (_mensuel, False),
+    'categories': (_categories, True),
+    'secteurs': (_secteurs, True),
+    'projections': (_projections, False),
+    'comparaisons': (_comparaisons, False),
+    'simulateur': (_simulateur, False),
+    'sante': (_sante, True),
+}
+
+
+def etag_correspond(entete, etag):
+    """En-tête If-None-Match satisfait par l'ETag : liste, ETags faibles (W/) ou '*'"""
+    if not entete:
+        return False
+    for candidat in entete.split(','):
+        candidat = candidat.strip()
+        if candidat == '*' or candidat.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def erreur_stockage(erreur):
+    """Erreur du moteur de stockage (fichier, base DuckDB) plutôt que de la requête"""
+    duckdb = sys.modules.get('duckdb')
+    return isinstance(erreur, OSError) or (duckdb is not None and isinstance(erreur, duckdb.Error))
+
+
+class OctroiAPI:
+    """Agrégats du dashboard par territoire, avec cache des réponses sérialisées"""
+
+    def __init__(self, seed=None, alimenter=True, capacite_cache=CAPACITE_CACHE):
+        self.seed = seed
+        # Mode autonome : l'API lit elle-même la source temps réel ; à côté du
+        # dashboard, elle se contente du journal partagé alimenté par les sessions
+        self.alimenter = alimenter
+        self.capacite_cache = capacite_cache
+        self._dashboards = {}
+        self._derniere_lecture = {}
+        self._verrous = {code: threading.RLock() for code in TERRITOIRES}
+        self._verrou_cache = threading.Lock()
+        self._reponses = OrderedDict()
+        self.compteurs = {'requetes': 0, 'cache': 0, 'non_modifie': 0}
+
+    def dashboard(self, territoire):
+        """Partition du territoire, reconstruite quand la version des données change"""
+        version = version_donnees(SimulationContext(self.seed, territoire=territoire))
+        dashboard = self._dashboards.get(territoire)
+        if dashboard is not None and dashboard.data_version == version:
+            return dashboard
+        with self._verrous[territoire]:
+            dashboard = self._dashboards.get(territoire)
+            if dashboard is None or dashboard.data_version != version:
+                dashboard = OctroiMerDashboard(SimulationContext(self.seed), territoire=territoire)
+                self._dashboards[territoire] = dashboard
+            return dashboard
+
+    def _rafraichir(self, dashboard):
+        """Aligne les données courantes sur le journal temps réel"""
+        maintenant = time.monotonic()
+        if self.alimenter and maintenant - self._derniere_lecture.get(dashboard.territoire, 0) >= INTERVALLE_LIVE:
+            self._derniere_lecture[dashboard.territoire] = maintenant
+            dashboard.update_live_data()
+        else:
+            dashboard.event_log.appliquer(dashboard.current_data)
+
+    def repondre(self, ressource, parametres, etag_client=None):
+        """(ETag, corps JSON, corps gzip) d'une ressource ; corps None si le client est à jour"""
+        calcul, temps_reel = RESSOURCES[ressource]
+        parametres = dict(parametres)
+        territoire = territoire_valide(parametres.pop('territoire', None))
+        dashboard = self.dashboard(territoire)
+        self._compter('requetes')
+
+        etat = dashboard.data_version
+        if temps_reel:
+            # Seul l'alignement sur le journal temps réel est sérialisé par territoire
+            with self._verrous[territoire]:
+                self._rafraichir(dashboard)
+                etat = f"{dashboard.data_version}-{dashboard.event_log.sequence}"
+        requete = json.dumps([ressource, territoire, sorted(parametres.items())], ensure_ascii=False)
+        etag = f'"{etat}-{zlib.crc32(requete.encode("utf-8")):08x}"'
+        if etag_correspond(etag_client, etag):
+            self._compter('non_modifie')
+            return etag, None, None
+
+        reponse = self._lire_cache(etag)
+        if reponse is not None:
+            self._compter('cache')
+            return reponse
+
+        if temps_reel:
+            # Les données courantes sont modifiées en place par le rafraîchissement
+            with self._verrous[territoire]:
+                donnees = serialiser(calcul(dashboard, **parametres))
+        else:
+            donnees = serialiser(calcul(dashboard, **parametres))
+        corps = json.dumps({'version': dashboard.data_version, 'territoire': territoire, 'donnees': donnees},
+                           ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        compresse = gzip.compress(corps, compresslevel=6) if len(corps) >= TAILLE_MIN_GZIP else None
+        reponse = (etag, corps, compresse)
+        self._ecrire_cache(etag, reponse)
+        return reponse
+
+    def _compter(self, cle):
+        with self._verrou_cache:
+            self.compteurs[cle] += 1
+
+    def _lire_cache(self, etag):
+        with self._verrou_cache:
+            reponse = self._reponses.get(etag)
+            if reponse is not None:
+                self._reponses.move_to_end(etag)
+            return reponse
+
+    def _ecrire_cache(self, etag, reponse):
+        with self._verrou_cache:
+            self._reponses[etag] = reponse
+            while len(self._reponses) > self.capacite_cache:
+                self._reponses.popitem(last=False)
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """Requêtes GET / HEAD de l'API (une requête par connexion, le worker est libéré aussitôt)"""
+
+    server_version = 'OctroiAPI/1.0'
+
+    def do_GET(self):
+        self._servir()
+
+    def do_HEAD(self):
+        self._servir(avec_corps=False)
+
+    def _servir(self, avec_corps=True):
+        url = urlparse(self.path)
+        ressource = url.path[len(PREFIXE):].strip('/') if url.path.startswith(PREFIXE) else None
+        if ressource not in RESSOURCES:
+            self._envoyer_erreur(404, f"Ressource inconnue: {url.path}", avec_corps)
+            return
+        try:
+            etag, corps, compresse = self.server.service.repondre(
+                ressource, parse_qsl(url.query), self.headers.get('If-None-Match'))
+        except (KeyError, ValueError, TypeError, IndexError) as erreur:
+            self._envoyer_erreur(400, f"Paramètres invalides: {erreur}", avec_corps)
+            return
+        except Exception as erreur:
+            if erreur_stockage(erreur):
+                logger.warning("Stockage indisponible pour %s: %s", url.path, erreur)
+                self._envoyer_erreur(503, "Stockage indisponible, réessayer plus tard", avec_corps)
+            else:
+                logger.exception("Erreur interne pour %s", url.path)
+                self._envoyer_erreur(500, "Erreur interne", avec_corps)
+            return
+
+        if corps is None:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        if compresse is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            corps = compresse
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if avec_corps:
+            self.wfile.write(corps)
+
+    def _envoyer_erreur(self, statut, message, avec_corps=True):
+        corps = json.dumps({'erreur': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(statut)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        if statut == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        if avec_corps:
+            self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class BoundedThreadPoolServer(HTTPServer):
+    """Serveur HTTP dont les connexions sont traitées par un pool de threads borné"""
+
+    def __init__(self, adresse, service, workers=WORKERS, file_max=FILE_MAX):
+        super().__init__(adresse, APIRequestHandler)
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='octroi-api')
+        self._places = threading.BoundedSemaphore(workers + file_max)
+
+    def process_request(self, request, client_address):
+        if not self._places.acquire(blocking=False):
+            self._refuser(request)
+            return
+        self._executor.submit(self._traiter, request, client_address)
+
+    def _traiter(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._places.release()
+
+    def _refuser(self, request):
+        """Serveur saturé : 503 immédiat, le client réessaie plus tard"""
+        corps = b'{"erreur":"serveur sature"}'
+        try:
+            request.sendall(b"HTTP/1.0 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                            b"Content-Type: application/json\r\n"
+                            b"Content-Length: " + str(len(corps)).encode() + b"\r\n\r\n" + corps)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+def demarrer(port, hote=HOTE, workers=WORKERS, alimenter=True, seed=None):
+    """Lance l'API dans un thread de fond et retourne le serveur"""
+    serveur = BoundedThreadPoolServer((hote, port), OctroiAPI(seed, alimenter), workers)
+    threading.Thread(target=serveur.serve_forever, name='octroi-api', daemon=True).start()
+    logger.info("API Octroi de Mer sur http://%s:%s%s", hote, port, PREFIXE)
+    return serveur
+
+
+def main():
+    """Sert l'API JSON seule, sans Streamlit"""
+    parser = argparse.ArgumentParser(description="API JSON des agrégats Octroi de Mer")
+    parser.add_argument('--host', default=HOTE)
+    parser.add_argument('--port', type=int, default=int(os.environ.get('OCTROI_API_PORT') or 8502))
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    # Hors `streamlit run`, les caches Streamlit signalent l'absence de session à chaque appel
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    serveur = BoundedThreadPoolServer((args.host, args.port), OctroiAPI(args.seed), args.workers)
+    print(f"API Octroi de Mer sur http://{args.host}:{args.port}{PREFIXE}")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+
+
+if __name__ == "__main__":
+    main()
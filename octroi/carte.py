@@ -0,0 +1,190 @@
+# carte.py
+"""Géométries des communes et carte de la répartition communale de l'octroi de mer.
+
+Le GeoJSON local est quantifié puis simplifié une seule fois au chargement.
+Comme en TopoJSON, les contours sont découpés en arcs aux points de jonction
+entre communes ; chaque arc est simplifié une fois (Douglas-Peucker) et
+réutilisé par les deux communes qui le partagent, ce qui évite les trous et
+chevauchements le long des limites communales.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from octroi.lazy import optional_import
+
+CHEMIN_COMMUNES = os.environ.get(
+    'OCTROI_COMMUNES_GEOJSON',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'communes_reunion.geojson')
+)
+
+# Tolérance de simplification (degrés, ~100 m) et précision de quantification (décimales)
+TOLERANCE = 0.001
+PRECISION = 4
+
+# Part des recettes reversée aux communes (octroi de mer communal), répartie selon la population
+PART_COMMUNES = 0.75
+
+CENTRE_CARTE = (-21.13, 55.53)
+
+
+def quantifier(anneau, precision=PRECISION):
+    """Coordonnées entières sur une grille de 10^-precision degré, sans doublons consécutifs"""
+    points = np.round(np.asarray(anneau, dtype=float) * 10 ** precision).astype(np.int64)
+    garde = np.ones(len(points), dtype=bool)
+    garde[1:] = np.any(points[1:] != points[:-1], axis=1)
+    return points[garde]
+
+
+def simplifier(points, tolerance):
+    """Douglas-Peucker sur une polyligne (extrémités conservées)"""
+    garde = np.zeros(len(points), dtype=bool)
+    garde[[0, -1]] = True
+    coordonnees = points.astype(float)
+    pile = [(0, len(points) - 1)]
+    while pile:
+        debut, fin = pile.pop()
+        if fin - debut < 2:
+            continue
+        origine = coordonnees[debut]
+        direction = coordonnees[fin] - origine
+        relatifs = coordonnees[debut + 1:fin] - origine
+        longueur = np.hypot(*direction)
+        if longueur > 0:
+            distances = np.abs(direction[0] * relatifs[:, 1] - direction[1] * relatifs[:, 0]) / longueur
+        else:
+            distances = np.hypot(relatifs[:, 0], relatifs[:, 1])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            milieu = debut + 1 + i
+            garde[milieu] = True
+            pile += [(debut, milieu), (milieu, fin)]
+    return points[garde]
+
+
+def _anneaux(geometrie):
+    """Anneaux d'un Polygon ou d'un MultiPolygon, regroupés par polygone"""
+    if geometrie['type'] == 'Polygon':
+        return [geometrie['coordinates']]
+    return geometrie['coordinates']
+
+
+class CommunesMap:
+    """Géométries simplifiées des communes et carte choroplèthe des recettes"""
+
+    def __init__(self, chemin=CHEMIN_COMMUNES, tolerance=TOLERANCE, precision=PRECISION):
+        with open(chemin, encoding='utf-8') as fichier:
+            brut = fichier.read()
+        source = json.loads(brut)
+        self.precision = precision
+        self.communes = pd.DataFrame([feature['properties'] for feature in source['features']])[
+            ['code', 'nom', 'population']]
+
+        polygones = [[[quantifier(anneau, precision) for anneau in polygone]
+                      for polygone in _anneaux(feature['geometry'])]
+                     for feature in source['features']]
+
+        # Communes auxquelles appartient chaque point (repérage des limites partagées)
+        occurrences = {}
+        for i, feature in enumerate(polygones):
+            for polygone in feature:
+                for anneau in polygone:
+                    for point in map(tuple, anneau):
+                        occurrences.setdefault(point, set()).add(i)
+
+        self._arcs_simplifies = {}
+        tolerance_grille = tolerance * 10 ** precision
+        features = []
+        for feature, polygones_feature in zip(source['features'], polygones):
+            coordonnees = [[self._simplifier_anneau(anneau, occurrences, tolerance_grille) / 10 ** precision
+                            for anneau in polygone] for polygone in polygones_feature]
+            features.append({
+                'type': 'Feature',
+                'properties': {cle: feature['properties'][cle] for cle in ('code', 'nom', 'population')},
+                'geometry': {'type': 'MultiPolygon',
+                             'coordinates': [[np.round(anneau, precision).tolist() for anneau in polygone]
+                                             for polygone in coordonnees]}
+            })
+        self.geojson = {'type': 'FeatureCollection', 'features': features}
+
+        self.stats = {
+            'points_source': sum(len(anneau) for feature in polygones for polygone in feature for anneau in polygone),
+            'points_simplifies': sum(len(anneau) for feature in features
+                                     for polygone in feature['geometry']['coordinates'] for anneau in polygone),
+            'octets_source': len(brut.encode('utf-8')),
+            'octets_simplifies': len(json.dumps(self.geojson, separators=(',', ':')).encode('utf-8')),
+            'arcs': len(self._arcs_simplifies)
+        }
+
+    def _simplifier_anneau(self, anneau, occurrences, tolerance):
+        """Simplifie un anneau arc par arc, en réutilisant les arcs partagés"""
+        points = anneau[:-1] if len(anneau) > 1 and np.array_equal(anneau[0], anneau[-1]) else anneau
+        n = len(points)
+        if n < 4:
+            return anneau
+        voisins = [frozenset(occurrences[tuple(point)]) for point in points]
+        jonctions = [i for i in range(n) if voisins[i] != voisins[i - 1] or voisins[i] != voisins[(i + 1) % n]]
+        if not jonctions:
+            # Île isolée : deux ancres, le premier point et le plus éloigné
+            jonctions = [0, int(np.argmax(np.hypot(*(points - points[0]).T)))]
+
+        morceaux = []
+        for k, debut in enumerate(jonctions):
+            fin = jonctions[(k + 1) % len(jonctions)]
+            indices = np.arange(debut, fin + 1 if fin > debut else fin + n + 1) % n
+            morceaux.append(self._simplifier_arc(points[indices], tolerance)[:-1])
+        resultat = np.concatenate(morceaux)
+        if len(resultat) < 3:
+            return anneau
+        return np.vstack([resultat, resultat[:1]])
+
+    def _simplifier_arc(self, arc, tolerance):
+        """Arc simplifié, mémorisé sous une clé indépendante du sens de parcours"""
+        cle, inverse = tuple(map(tuple, arc)), tuple(map(tuple, arc[::-1]))
+        retourne = inverse < cle
+        canonique = inverse if retourne else cle
+        if canonique not in self._arcs_simplifies:
+            self._arcs_simplifies[canonique] = simplifier(arc[::-1] if retourne else arc, tolerance)
+        resultat = self._arcs_simplifies[canonique]
+        return resultat[::-1] if retourne else resultat
+
+    def repartir(self, recettes, part=PART_COMMUNES):
+        """Part communale des recettes, répartie au prorata de la population"""
+        repartition = self.communes.copy()
+        repartition['revenu'] = recettes * part * repartition['population'] / repartition['population'].sum()
+        repartition['revenu_par_habitant'] = repartition['revenu'] / repartition['population']
+        return repartition.sort_values('revenu', ascending=False).reset_index(drop=True)
+
+    def carte_folium(self, repartition):
+        """Carte choroplèthe folium (None si folium est absent)"""
+        folium = optional_import('folium')
+        if folium is None:
+            return None
+
+        valeurs = repartition.set_index('code')
+        geojson = {'type': 'FeatureCollection', 'features': [
+            {**feature, 'properties': {
+                **feature['properties'],
+                'revenu': f"{valeurs.at[feature['properties']['code'], 'revenu'] / 1e6:,.1f} M€",
+                'par_habitant': f"{valeurs.at[feature['properties']['code'], 'revenu_par_habitant']:,.0f} €"
+            }} for feature in self.geojson['features']
+        ]}
+
+        carte = folium.Map(location=CENTRE_CARTE, zoom_start=10)
+        choroplethe = folium.Choropleth(
+            geo_data=geojson,
+            data=repartition,
+            columns=['code', 'revenu'],
+            key_on='feature.properties.code',
+            fill_color='YlOrRd',
+            fill_opacity=0.75,
+            line_opacity=0.6,
+            legend_name="Octroi de mer reversé sur 12 mois (€)"
+        ).add_to(carte)
+        choroplethe.geojson.add_child(folium.GeoJsonTooltip(
+            fields=['nom', 'population', 'revenu', 'par_habitant'],
+            aliases=['Commune', 'Population', 'Octroi reversé', 'Par habitant']
+        ))
+        return carte
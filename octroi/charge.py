@@ -0,0 +1,280 @@
+# charge.py
+"""Test de charge : sessions simultanées du dashboard rejouées sans navigateur.
+
+Chaque session virtuelle est un ``AppTest`` Streamlit qui exécute
+``Dashboard.py`` comme le ferait le serveur pour un onglet : ouverture, puis
+un parcours scripté (filtres de la sidebar, changement de page, simulateur,
+bouton « Rafraîchir les données »). Toutes les sessions tournent dans le même
+processus et partagent donc les caches Streamlit, comme sur un pod. On
+mesure la latence de chaque étape (exécution complète du script) et la
+mémoire du processus ; le code retour est non nul si le P95 d'une étape
+dépasse le budget.
+
+    python -m octroi.charge --sessions 20 --iterations 3 --json charge.json
+"""
+import argparse
+import json
+import os
+import resource
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Dashboard.py')
+CENTILES = (50, 90, 95, 99)
+BUDGET_P95_MS = float(os.environ.get('OCTROI_CHARGE_BUDGET_P95_MS', '0'))
+# Versions de Streamlit dont les internes utilisés ici ont été vérifiés (cf. requirements.txt)
+STREAMLIT_TESTE = '>=1.66,<1.67'
+# Internes de streamlit.testing.v1.app_test repris par runtime_partage
+INTERNES_APP_TEST = ('Runtime', 'MediaFileManager', 'MemoryMediaFileStorage', 'DataframeSourceManager',
+                     'MemoryCacheStorageManager', 'BidiComponentManager', 'patch_config_options')
+
+
+def memoire_processus():
+    """Mémoire résidente du processus (octets), pic si /proc est indisponible"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def verifier_streamlit():
+    """Échoue clairement si les internes de Streamlit utilisés par le harnais ont changé"""
+    import streamlit
+    from streamlit.testing.v1 import AppTest, app_test
+
+    manquants = [f"app_test.{nom}" for nom in INTERNES_APP_TEST if not hasattr(app_test, nom)]
+    if hasattr(app_test, 'Runtime') and not hasattr(app_test.Runtime, '_instance'):
+        manquants.append('Runtime._instance')
+    if not hasattr(AppTest.from_string(''), '_page_hash'):
+        manquants.append('AppTest._page_hash')
+    try:
+        from streamlit.navigation.page import calc_hash  # noqa: F401
+    except ImportError:
+        manquants.append('streamlit.navigation.page.calc_hash')
+    if manquants:
+        raise RuntimeError(f"Streamlit {streamlit.__version__} incompatible avec le test de charge "
+                           f"(testé avec streamlit{STREAMLIT_TESTE}) : introuvable {', '.join(manquants)}")
+
+
+@contextmanager
+def runtime_partage():
+    """Runtime factice unique, partagé par toutes les sessions comme sur un serveur.
+
+    AppTest installe un Runtime factice global au début de chaque exécution et
+    le retire à la fin, ce qui casse les sessions voisines quand plusieurs
+    tournent en parallèle : ses affectations sont redirigées vers une
+    sous-classe et le Runtime partagé reste en place pendant tout le test.
+    """
+    from streamlit.testing.v1 import app_test
+
+    verifier_streamlit()
+
+    Runtime = app_test.Runtime
+
+    class RuntimeParSession(Runtime):
+        pass
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = app_test.MediaFileManager(app_test.MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = app_test.DataframeSourceManager()
+    runtime.cache_storage_manager = app_test.MemoryCacheStorageManager()
+    runtime.bidi_component_registry = app_test.BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+
+    app_test.Runtime = RuntimeParSession
+    Runtime._instance = runtime
+    try:
+        with app_test.patch_config_options({'global.appTest': True}):
+            yield runtime
+    finally:
+        app_test.Runtime = Runtime
+        Runtime._instance = None
+
+
+def _widget(elements, label):
+    return next(element for element in elements if element.label.startswith(label))
+
+
+def _page(url):
+    def ouvrir(session, rng):
+        from streamlit.navigation.page import calc_hash
+        # AppTest.switch_page ne connaît que les pages fichiers ; les pages de
+        # st.navigation sont identifiées par le hash de leur url_path
+        session._page_hash = calc_hash(url)
+    return ouvrir
+
+
+def _filtrer_categories(session, rng):
+    filtre = _widget(session.sidebar.multiselect, "Catégories")
+    options = list(filtre.options)
+    filtre.set_value(list(rng.choice(options, size=rng.integers(1, len(options) + 1), replace=False)))
+
+
+def _simuler(session, rng):
+    produit = _widget(session.selectbox, "Produit")
+    produit.set_value(produit.options[rng.integers(len(produit.options))])
+    _widget(session.number_input, "Valeur du produit").set_value(float(rng.integers(100, 100000)))
+    _widget(session.selectbox, "Type de taux").set_value(["Normal", "Réduit", "Spécifique"][rng.integers(3)])
+    _widget(session.button, "Calculer").click()
+
+
+def _rafraichir(session, rng):
+    _widget(session.sidebar.button, "🔄 Rafraîchir").click()
+
+
+# Parcours rejoué par chaque session après l'ouverture : (étape, interaction)
+PARCOURS = [
+    ('filtres', _filtrer_categories),
+    ('page:secteurs', _page('secteurs')),
+    ('simulateur', _simuler),
+    ('rafraichir', _rafraichir),
+    ('page:categories', _page('categories')),
+    ('page:evolution', _page('evolution')),
+    ('page:vue-ensemble', _page('vue-ensemble')),
+]
+
+
+class LoadTest:
+    """Sessions simultanées, latences par étape et échantillons mémoire"""
+
+    def __init__(self, sessions=10, iterations=2, montee=5.0, pause=0.0, seed=0, timeout=300):
+        self.sessions = sessions
+        self.iterations = iterations
+        self.montee = montee
+        self.pause = pause
+        self.seed = seed
+        self.timeout = timeout
+        self.mesures = []
+        self.erreurs = Counter()
+        self.memoire = []
+        self._verrou = threading.Lock()
+
+    def _executer(self, session, etape):
+        debut = time.perf_counter()
+        try:
+            session.run()
+            erreur = session.exception[0].message if len(session.exception) else None
+        except Exception as exception:
+            erreur = f"{type(exception).__name__}: {exception}"
+        duree = (time.perf_counter() - debut) * 1000
+        with self._verrou:
+            self.mesures.append({'etape': etape, 'duree_ms': duree, 'erreur': erreur is not None})
+            if erreur:
+                self.erreurs[f"{etape}: {erreur.splitlines()[0][:120]}"] += 1
+
+    def _session(self, numero):
+        from streamlit.testing.v1 import AppTest
+
+        rng = np.random.default_rng([self.seed, numero])
+        time.sleep(self.montee * numero / max(self.sessions, 1))
+        session = AppTest.from_file(SCRIPT, default_timeout=self.timeout)
+        self._executer(session, 'ouverture')
+        for _ in range(self.iterations):
+            for etape, interaction in PARCOURS:
+                time.sleep(self.pause)
+                try:
+                    interaction(session, rng)
+                except (StopIteration, IndexError, ValueError) as exception:
+                    # Élément absent (page en erreur) : l'étape compte comme échouée
+                    with self._verrou:
+                        self.mesures.append({'etape': etape, 'duree_ms': np.nan, 'erreur': True})
+                        self.erreurs[f"{etape}: élément introuvable ({type(exception).__name__})"] += 1
+                    continue
+                self._executer(session, etape)
+
+    def _echantillonner(self, fin, periode=0.25):
+        while not fin.wait(periode):
+            self.memoire.append(memoire_processus())
+
+    def run(self):
+        """Lance les sessions et retourne le rapport"""
+        self.memoire = [memoire_processus()]
+        fin = threading.Event()
+        echantillonneur = threading.Thread(target=self._echantillonner, args=(fin,), daemon=True)
+        echantillonneur.start()
+        debut = time.perf_counter()
+        with runtime_partage(), ThreadPoolExecutor(max_workers=self.sessions) as executor:
+            list(executor.map(self._session, range(self.sessions)))
+        duree = time.perf_counter() - debut
+        fin.set()
+        echantillonneur.join()
+        self.memoire.append(memoire_processus())
+        return self.rapport(duree)
+
+    def latences(self):
+        """Centiles de latence (ms) par étape"""
+        mesures = pd.DataFrame(self.mesures, columns=['etape', 'duree_ms', 'erreur'])
+        lignes = []
+        for etape, groupe in mesures.groupby('etape', sort=False):
+            durees = groupe['duree_ms'].dropna().to_numpy()
+            ligne = {'etape': etape, 'n': len(groupe), 'erreurs': int(groupe['erreur'].sum())}
+            for centile in CENTILES:
+                ligne[f'p{centile}'] = float(np.percentile(durees, centile)) if len(durees) else np.nan
+            ligne['max'] = float(durees.max()) if len(durees) else np.nan
+            lignes.append(ligne)
+        return pd.DataFrame(lignes)
+
+    def rapport(self, duree):
+        latences = self.latences()
+        return {
+            'sessions': self.sessions,
+            'iterations': self.iterations,
+            'duree_s': duree,
+            'etapes_par_s': len(self.mesures) / duree if duree else np.nan,
+            'memoire_mo': {
+                'debut': self.memoire[0] / 1e6,
+                'pic': max(self.memoire) / 1e6,
+                'fin': self.memoire[-1] / 1e6,
+                'par_session': (max(self.memoire) - self.memoire[0]) / 1e6 / max(self.sessions, 1)
+            },
+            'latences': latences.to_dict(orient='records'),
+            'erreurs': dict(self.erreurs)
+        }
+
+
+def main():
+    """Test de charge en ligne de commande (rapport texte, JSON optionnel)"""
+    parser = argparse.ArgumentParser(description="Test de charge du dashboard (sessions simultanées)")
+    parser.add_argument('--sessions', type=int, default=10, help="sessions simultanées")
+    parser.add_argument('--iterations', type=int, default=2, help="parcours rejoués par session")
+    parser.add_argument('--montee', type=float, default=5.0, help="durée de montée en charge (s)")
+    parser.add_argument('--pause', type=float, default=0.0, help="temps de réflexion entre étapes (s)")
+    parser.add_argument('--seed', type=int, default=0, help="graine des interactions")
+    parser.add_argument('--budget-p95-ms', type=float, default=BUDGET_P95_MS, help="0 = pas de budget")
+    parser.add_argument('--json', help="fichier où écrire le rapport (suivi des benchmarks)")
+    args = parser.parse_args()
+
+    # Le rafraîchissement automatique (pause de 30 s par exécution) fausserait les mesures
+    os.environ.setdefault('OCTROI_AUTO_REFRESH', '0')
+    rapport = LoadTest(args.sessions, args.iterations, args.montee, args.pause, args.seed).run()
+
+    latences = pd.DataFrame(rapport['latences'])
+    print(f"{rapport['sessions']} sessions × {rapport['iterations']} parcours en {rapport['duree_s']:.1f} s "
+          f"({rapport['etapes_par_s']:.1f} étapes/s)")
+    print(latences.to_string(index=False, float_format=lambda valeur: f"{valeur:,.0f}"))
+    memoire = rapport['memoire_mo']
+    print(f"Mémoire: {memoire['debut']:.0f} Mo au départ, pic {memoire['pic']:.0f} Mo, "
+          f"fin {memoire['fin']:.0f} Mo (~{memoire['par_session']:.1f} Mo/session)")
+    for erreur, nombre in rapport['erreurs'].items():
+        print(f"ERREUR ×{nombre} {erreur}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False, default=float)
+
+    depassements = latences[latences['p95'] > args.budget_p95_ms] if args.budget_p95_ms else latences.iloc[:0]
+    for etape in depassements['etape']:
+        print(f"DÉPASSEMENT p95 {etape} (budget {args.budget_p95_ms:.0f} ms)")
+    raise SystemExit(1 if len(depassements) or rapport['erreurs'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+# classement.py
+"""Classements « Top Contribuables » à l'échelle des déclarations en douane.
+
+Les millions de déclarations d'un mois ne sont jamais conservées ni triées :
+chaque lot est fusionné, de façon vectorisée, dans un résumé Space-Saving
+pondéré à mémoire bornée. Le résumé garde les ``capacite`` clés les plus
+lourdes, chacune avec une estimation par excès et son erreur maximale ;
+toute clé absente pèse au plus ``minimum``. Il est maintenu trié : le top K
+se lit en O(K).
+
+``recompter`` refait le décompte exact sur les mêmes lots quand les bornes
+sont jugées trop larges.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+N_DECLARATIONS = 1_000_000
+TAILLE_BLOC = 100_000
+N_IMPORTATEURS = 20_000
+LIGNES_PAR_PRODUIT = 60
+
+# Chapitre de la nomenclature combinée de chaque produit (codes des lignes simulées)
+CHAPITRES = {
+    'Véhicules particuliers': 87, 'Carburants': 27, 'Boissons alcoolisées': 22,
+    'Matériaux construction': 68, 'Produits alimentaires': 21, 'Fruits et légumes': 8,
+    'Équipements électroniques': 85, 'Médicaments': 30, 'Meubles et ameublement': 94,
+    'Machines industrielles': 84
+}
+
+
+def _textuelles(cles):
+    """Masque des clés textuelles (les clés entières sont conservées telles quelles)"""
+    cles = np.asarray(cles)
+    if cles.dtype.kind in 'iu':
+        return np.zeros(len(cles), dtype=bool)
+    if cles.dtype.kind != 'O':
+        return np.ones(len(cles), dtype=bool)
+    return np.array([not isinstance(cle, (int, np.integer)) for cle in cles], dtype=bool)
+
+
+def _cles_entieres(cles):
+    """Clés entières ; seuls les libellés sont hachés (libellé conservé à part)"""
+    cles = np.asarray(cles)
+    if cles.dtype.kind in 'iu':
+        return cles.astype(np.int64)
+    textuelles = _textuelles(cles)
+    entieres = np.empty(len(cles), dtype=np.int64)
+    entieres[~textuelles] = cles[~textuelles].astype(np.int64)
+    entieres[textuelles] = pd.util.hash_array(cles[textuelles].astype(object)).view(np.int64)
+    return entieres
+
+
+class SpaceSaving:
+    """Top-K pondéré à mémoire bornée (Space-Saving fusionnable)"""
+
+    def __init__(self, capacite=1024):
+        self.capacite = capacite
+        self.cles = np.empty(0, dtype=np.int64)
+        self.comptes = np.empty(0)
+        self.erreurs = np.empty(0)
+
+    @property
+    def minimum(self):
+        """Poids maximal d'une clé absente du résumé"""
+        return float(self.comptes[-1]) if len(self.cles) >= self.capacite else 0.0
+
+    def ajouter(self, cles, poids):
+        """Fusionne un lot (clés entières, poids positifs) dans le résumé"""
+        cles, inverse = np.unique(cles, return_inverse=True)
+        poids = np.bincount(inverse, weights=poids)
+        minimum, n = self.minimum, len(self.cles)
+
+        union, position = np.unique(np.concatenate((self.cles, cles)), return_inverse=True)
+        suivies = np.zeros(len(union), dtype=bool)
+        suivies[position[:n]] = True
+        # Une clé nouvelle a pu être évincée auparavant : jusqu'à ``minimum`` d'erreur
+        comptes = np.where(suivies, 0.0, minimum)
+        erreurs = np.where(suivies, 0.0, minimum)
+        comptes[position[:n]] += self.comptes
+        erreurs[position[:n]] = self.erreurs
+        comptes[position[n:]] += poids
+
+        ordre = np.argsort(-comptes, kind='stable')[:self.capacite]
+        self.cles, self.comptes, self.erreurs = union[ordre], comptes[ordre], erreurs[ordre]
+
+    def top(self, k):
+        """Les k clés les plus lourdes : (clés, estimations, erreurs), en O(k)"""
+        return self.cles[:k], self.comptes[:k], self.erreurs[:k]
+
+    def memoire(self):
+        return self.cles.nbytes + self.comptes.nbytes + self.erreurs.nbytes
+
+
+class HeavyHitters:
+    """Plus gros contributeurs d'une dimension (importateur, ligne tarifaire...)"""
+
+    def __init__(self, nom, capacite=1024, libelle=str):
+        self.nom = nom
+        self.resume = SpaceSaving(capacite)
+        self.libelle = libelle
+        self.total = 0.0
+        self.n = 0
+        self._libelles = {}
+
+    def ajouter(self, cles, poids):
+        """Ajoute un lot de déclarations (poids négatifs ou nuls ignorés)"""
+        poids = np.asarray(poids, dtype=float)
+        valides = poids > 0
+        cles_brutes = np.asarray(cles)[valides]
+        poids = poids[valides]
+        if not len(poids):
+            return
+        cles = _cles_entieres(cles_brutes)
+        textuelles = _textuelles(cles_brutes)
+        if textuelles.any():
+            self._libelles.update(zip(cles[textuelles].tolist(), cles_brutes[textuelles].tolist()))
+        self.resume.ajouter(cles, poids)
+        self.total += poids.sum()
+        self.n += len(poids)
+        if len(self._libelles) > 2 * self.resume.capacite:
+            suivies = set(self.resume.cles.tolist())
+            self._libelles = {cle: nom for cle, nom in self._libelles.items() if cle in suivies}
+
+    def enregistrer(self, evenements):
+        """Ajoute les évènements temps réel portant la dimension"""
+        lot = [(e[self.nom], e['revenu']) for e in evenements if e.get(self.nom) is not None]
+        if lot:
+            cles, poids = zip(*lot)
+            entieres = all(isinstance(cle, (int, np.integer)) for cle in cles)
+            self.ajouter(np.array(cles, dtype=np.int64 if entieres else object), poids)
+
+    def nommer(self, cle):
+        """Libellé d'une clé"""
+        libelle = self._libelles.get(cle)
+        return self.libelle(cle) if libelle is None else libelle
+
+    def top(self, k=10):
+        """Top k avec bornes : le poids réel est dans [borne_basse, estimation]"""
+        cles, estimations, erreurs = self.resume.top(k + 1)
+        suivant = estimations[k] if len(cles) > k else self.resume.minimum
+        cles, estimations, erreurs = cles[:k], estimations[:k], erreurs[:k]
+        return pd.DataFrame({
+            'cle': cles,
+            'libelle': [self.nommer(cle) for cle in cles.tolist()],
+            'estimation': estimations,
+            'erreur': erreurs,
+            'borne_basse': estimations - erreurs,
+            # Appartenance au top k certaine si la borne basse dépasse le suivant
+            'garanti': estimations - erreurs >= suivant
+        })
+
+    def bornes(self):
+        """Erreur maximale du résumé"""
+        return {
+            'declarations': self.n,
+            'total': self.total,
+            'erreur_top': self.resume.minimum,
+            'memoire': self.resume.memoire()
+        }
+
+
+def recompter(lots, k=10):
+    """Décompte exact (clé, poids) sur les lots, pour contrôler ou remplacer l'esquisse"""
+    cles, poids = np.empty(0, dtype=np.int64), np.empty(0)
+    for cles_lot, poids_lot in lots:
+        poids_lot = np.asarray(poids_lot, dtype=float)
+        valides = poids_lot > 0
+        cles, inverse = np.unique(np.concatenate((cles, _cles_entieres(np.asarray(cles_lot)[valides]))),
+                                  return_inverse=True)
+        poids = np.bincount(inverse, weights=np.concatenate((poids, poids_lot[valides])), minlength=len(cles))
+    ordre = np.argsort(-poids, kind='stable')[:k]
+    return pd.DataFrame({'cle': cles[ordre], 'poids': poids[ordre]})
+
+
+class DeclarationsSimulees:
+    """Déclarations individuelles simulées du mois courant, cohérentes avec les recettes sectorielles"""
+
+    def __init__(self, current_data, product_data, secteurs, simulation,
+                 n=N_DECLARATIONS, taille_bloc=TAILLE_BLOC):
+        self.simulation = simulation
+        self.n = n
+        self.taille_bloc = taille_bloc
+        self.secteurs = list(secteurs)
+        rng = simulation.stream('declarations_structure')
+
+        # Importateurs : concentration de Zipf, un secteur principal chacun
+        poids = 1 / np.arange(1, N_IMPORTATEURS + 1) ** 1.1
+        self.p_importateurs = poids / poids.sum()
+        self.secteur_importateur = rng.integers(0, len(self.secteurs), N_IMPORTATEURS)
+
+        # Lignes tarifaires : LIGNES_PAR_PRODUIT par produit, triées par secteur
+        produits = product_data.assign(i_secteur=product_data['secteur'].map(
+            {s: i for i, s in enumerate(self.secteurs)})).sort_values('i_secteur')
+        lignes = produits.loc[produits.index.repeat(LIGNES_PAR_PRODUIT)].reset_index(drop=True)
+        rang = np.tile(np.arange(1, LIGNES_PAR_PRODUIT + 1), len(produits))
+        lignes['code'] = [f"{CHAPITRES.get(produit, 99):02d}{(i * 7) % 100:02d} {(i * 131) % 10000:04d}"
+                          for i, produit in enumerate(lignes['produit'])]
+        self.libelles_lignes = (lignes['code'] + ' · ' + lignes['produit']).to_numpy()
+        poids_lignes = 1 / rang
+        totaux = pd.Series(poids_lignes).groupby(lignes['i_secteur'].to_numpy()).transform('sum').to_numpy()
+        cumul = pd.Series(poids_lignes / totaux).groupby(lignes['i_secteur'].to_numpy()).cumsum().to_numpy()
+        # Tirage par secteur : searchsorted sur secteur + u dans les cumuls décalés
+        self._cumul_lignes = lignes['i_secteur'].to_numpy() + cumul
+
+        # Montants log-normaux, calés sur les recettes mensuelles de chaque secteur
+        self.sigma = 1.2
+        recettes = current_data.set_index('secteur')['revenu_mensuel'].reindex(self.secteurs).fillna(0).to_numpy()
+        attendues = n * np.bincount(self.secteur_importateur, weights=self.p_importateurs,
+                                    minlength=len(self.secteurs)) * np.exp(self.sigma ** 2 / 2)
+        self.echelle = np.divide(recettes, attendues, out=np.zeros_like(recettes), where=attendues > 0)
+
+    def blocs(self):
+        """Déclarations par blocs (importateur, ligne tarifaire, secteur, revenu), toujours identiques"""
+        rng = self.simulation.generateur('declarations')
+        for debut in range(0, self.n, self.taille_bloc):
+            taille = min(self.taille_bloc, self.n - debut)
+            importateurs = rng.choice(N_IMPORTATEURS, size=taille, p=self.p_importateurs)
+            secteurs = self.secteur_importateur[importateurs]
+            lignes = np.minimum(np.searchsorted(self._cumul_lignes, secteurs + rng.random(taille), side='right'),
+                                len(self._cumul_lignes) - 1)
+            yield {
+                'importateur': importateurs,
+                'ligne_tarifaire': lignes,
+                'secteur': secteurs,
+                'revenu': rng.lognormal(0, self.sigma, taille) * self.echelle[secteurs]
+            }
+
+    def lots(self, dimension):
+        """Lots (clés, poids) d'une dimension, pour ``recompter``"""
+        for bloc in self.blocs():
+            yield bloc[dimension], bloc['revenu']
+
+    def libelle_importateur(self, cle):
+        return f"IMP-{cle:05d}"
+
+    def libelle_ligne(self, cle):
+        return self.libelles_lignes[cle] if 0 <= cle < len(self.libelles_lignes) else str(cle)
+
+
+class TopContribuables:
+    """Classements des importateurs et des lignes tarifaires, alimentés en continu.
+
+    Partagé par toutes les sessions et par l'API : les accès passent par un
+    verrou. Les déclarations du mois ne sont résumées qu'à la première
+    lecture d'un classement ; le flux temps réel reçu avant est déjà fusionné.
+    """
+
+    def __init__(self, declarations, capacite=1024):
+        self.declarations = declarations
+        self.classements = {
+            'importateur': HeavyHitters('importateur', capacite, libelle=declarations.libelle_importateur),
+            'ligne_tarifaire': HeavyHitters('ligne_tarifaire', capacite, libelle=declarations.libelle_ligne)
+        }
+        self._charge = False
+        self._verrou = threading.Lock()
+
+    def _charger(self):
+        """Résume les déclarations du mois (une seule fois, sous le verrou)"""
+        if self._charge:
+            return
+        for bloc in self.declarations.blocs():
+            for dimension, classement in self.classements.items():
+                classement.ajouter(bloc[dimension], bloc['revenu'])
+        self._charge = True
+
+    def enregistrer(self, evenements):
+        """Déclarations reçues en temps réel (évènements portant importateur / ligne_tarifaire)"""
+        with self._verrou:
+            for classement in self.classements.values():
+                classement.enregistrer(evenements)
+
+    def top(self, dimension, k=10):
+        with self._verrou:
+            self._charger()
+            return self.classements[dimension].top(k)
+
+    def bornes(self, dimension):
+        with self._verrou:
+            self._charger()
+            return self.classements[dimension].bornes()
+
+    def recompter(self, dimension, k=10):
+        """Top k exact, recompté sur les déclarations du mois (hors flux temps réel)"""
+        exact = recompter(self.declarations.lots(dimension), k)
+        with self._verrou:
+            exact['libelle'] = [self.classements[dimension].nommer(cle) for cle in exact['cle'].tolist()]
+        return exact
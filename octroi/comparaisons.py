@@ -0,0 +1,101 @@
+# comparaisons.py
+"""Moteur de comparaison de périodes (N-1, M-1, cumul annuel) sur l'historique.
+
+Les séries denses du cube partagent un même index de périodes mensuelles
+contiguës : les décalages d'un mois et d'un an sont donc de simples
+translations de colonnes, et les cumuls depuis janvier des différences de
+sommes cumulées. Tout est calculé une fois par version des données ; chaque
+comparaison est ensuite une lecture en O(1).
+"""
+import numpy as np
+import pandas as pd
+
+from octroi.cube import MESURES
+
+
+def _decaler(valeurs, decalage):
+    """Translate les colonnes de ``decalage`` mois (NaN en tête)"""
+    resultat = np.full_like(valeurs, np.nan)
+    if decalage < valeurs.shape[1]:
+        resultat[:, decalage:] = valeurs[:, :valeurs.shape[1] - decalage]
+    return resultat
+
+
+def _variation_pct(valeur, reference):
+    return np.divide(valeur - reference, reference,
+                     out=np.full_like(valeur, np.nan), where=(reference != 0) & ~np.isnan(reference)) * 100
+
+
+class PeriodComparator:
+    """Comparaisons N-1, M-1 et cumul annuel par membre du cube"""
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.periodes = cube.periodes
+        self._position = {periode: t for t, periode in enumerate(self.periodes)}
+        # Période en cours (données temps réel) : le mois qui suit l'historique
+        self.periode_courante = self.periodes[-1] + 1
+
+        # Début d'année de chaque période, pour les cumuls depuis janvier
+        t = np.arange(len(self.periodes))
+        debut_annee = t - (cube.mois - 1)
+        self._tables = {}
+        for niveau in cube.appartenance:
+            for mesure in MESURES:
+                valeurs = cube.valeurs(niveau, mesure)
+                cumul = np.concatenate((np.zeros((valeurs.shape[0], 1)), np.cumsum(valeurs, axis=1)), axis=1)
+                ytd = cumul[:, t + 1] - cumul[:, np.maximum(debut_annee, 0)]
+                # Cumul incomplet si l'historique commence en cours d'année
+                ytd[:, debut_annee < 0] = np.nan
+                annee_precedente, mois_precedent, ytd_precedent = (
+                    _decaler(valeurs, 12), _decaler(valeurs, 1), _decaler(ytd, 12))
+                self._tables[(niveau, mesure)] = {
+                    'valeur': valeurs,
+                    'annee_precedente': annee_precedente,
+                    'mois_precedent': mois_precedent,
+                    'yoy_pct': _variation_pct(valeurs, annee_precedente),
+                    'mom_pct': _variation_pct(valeurs, mois_precedent),
+                    'ytd': ytd,
+                    'ytd_precedent': ytd_precedent,
+                    'ytd_pct': _variation_pct(ytd, ytd_precedent)
+                }
+
+    def _t(self, periode):
+        if periode is None:
+            return len(self.periodes) - 1
+        return self._position.get(pd.Period(periode, freq='M'))
+
+    def _ligne(self, niveau, membre):
+        return 0 if membre is None else self.cube.position(niveau, membre)
+
+    def comparer(self, niveau='total', membre=None, mesure='revenu', periode=None):
+        """Valeur, N-1, M-1 et cumul annuel d'un membre pour une période de l'historique"""
+        t = self._t(periode)
+        ligne = self._ligne(niveau, membre)
+        tables = self._tables[(niveau, mesure)]
+        if t is None:
+            return {cle: np.nan for cle in tables}
+        return {cle: float(table[ligne, t]) for cle, table in tables.items()}
+
+    def reference(self, niveau='total', membre=None, mesure='revenu', decalage=1):
+        """Valeur historique ``decalage`` mois avant la période courante"""
+        t = len(self.periodes) - decalage
+        if t < 0:
+            return np.nan
+        return float(self._tables[(niveau, mesure)]['valeur'][self._ligne(niveau, membre), t])
+
+    def variation_courante(self, valeur, niveau='total', membre=None, mesure='revenu', decalage=1):
+        """Variation (%) d'une valeur de la période courante vs ``decalage`` mois avant"""
+        reference = self.reference(niveau, membre, mesure, decalage)
+        if not reference or np.isnan(reference):
+            return np.nan
+        return (valeur / reference - 1) * 100
+
+    def tableau(self, niveau='secteur', mesure='revenu', periode=None):
+        """Comparaisons de tous les membres d'un niveau pour une période"""
+        t = self._t(periode)
+        tables = self._tables[(niveau, mesure)]
+        lignes = {niveau: self.cube.membres[niveau]}
+        for cle, table in tables.items():
+            lignes[cle] = table[:, t] if t is not None else np.nan
+        return pd.DataFrame(lignes)
@@ -0,0 +1,156 @@
+# cube.py
+"""Cube pré-agrégé catégorie → secteur → produit × mois.
+
+L'historique est réduit une seule fois (par version des données) en tableaux
+denses secteur × mois ; les niveaux catégorie, produit et total s'en déduisent
+par produit matriciel avec des matrices d'appartenance. Toute coupe,
+descente hiérarchique ou grille année × mois se lit ensuite par indexation,
+sans regroupement pandas.
+
+Les produits n'ont pas d'historique propre : la recette d'un secteur leur est
+répartie au prorata volume × taux d'octroi.
+"""
+import numpy as np
+import pandas as pd
+
+MESURES = ('revenu', 'volume')
+
+# Niveau enfant pour la descente hiérarchique
+ENFANTS = {'total': 'categorie', 'categorie': 'secteur', 'secteur': 'produit'}
+
+
+class OctroiCube:
+    """Agrégats denses de l'historique, par niveau hiérarchique et par mois"""
+
+    def __init__(self, historical_data, secteurs, product_data):
+        self.membres = {
+            'total': ['TOTAL'],
+            'secteur': list(secteurs),
+            'categorie': sorted({info['categorie'] for info in secteurs.values()}),
+            'produit': product_data['produit'].tolist()
+        }
+        self._position = {niveau: {membre: i for i, membre in enumerate(membres)}
+                          for niveau, membres in self.membres.items()}
+
+        periodes = historical_data['date'].dt.to_period('M')
+        self.periodes = pd.period_range(periodes.min(), periodes.max(), freq='M')
+        self.dates = self.periodes.to_timestamp()
+        self.annees = np.asarray(self.periodes.year)
+        self.mois = np.asarray(self.periodes.month)
+
+        # Tableaux denses secteur × mois (une seule passe sur l'historique)
+        n_secteurs, n_mois = len(self.membres['secteur']), len(self.periodes)
+        i_secteur = historical_data['secteur'].map(self._position['secteur']).to_numpy()
+        dates = historical_data['date']
+        i_mois = ((dates.dt.year - self.periodes[0].year) * 12
+                  + dates.dt.month - self.periodes[0].month).to_numpy()
+        cellule = i_secteur * n_mois + i_mois
+        base = {
+            mesure: np.bincount(cellule, weights=historical_data[colonne].to_numpy(),
+                                minlength=n_secteurs * n_mois).reshape(n_secteurs, n_mois)
+            for mesure, colonne in (('revenu', 'revenu_octroi'), ('volume', 'volume_importation'))
+        }
+
+        # Matrices d'appartenance vers les niveaux agrégés
+        self.appartenance = {
+            'secteur': np.eye(n_secteurs),
+            'categorie': np.array([[secteurs[s]['categorie'] == c for s in self.membres['secteur']]
+                                   for c in self.membres['categorie']], dtype=float),
+            'total': np.ones((1, n_secteurs)),
+            'produit': self._repartition_produits(product_data)
+        }
+        self._valeurs = {
+            (niveau, mesure): matrice @ base[mesure]
+            for niveau, matrice in self.appartenance.items()
+            for mesure in MESURES
+        }
+
+    def _repartition_produits(self, product_data):
+        """Part de chaque produit dans la recette de son secteur (produits × secteurs)"""
+        poids = (product_data['volume'] * product_data['taux_octroi']).to_numpy(dtype=float)
+        colonnes = product_data['secteur'].map(self._position['secteur']).to_numpy()
+        repartition = np.zeros((len(product_data), len(self.membres['secteur'])))
+        repartition[np.arange(len(product_data)), colonnes] = poids
+        totaux = repartition.sum(axis=0)
+        return np.divide(repartition, totaux, out=np.zeros_like(repartition), where=totaux > 0)
+
+    def _index_periodes(self, debut=None, fin=None):
+        debut = 0 if debut is None else self.periodes.searchsorted(pd.Period(debut, freq='M'))
+        fin = len(self.periodes) if fin is None else self.periodes.searchsorted(pd.Period(fin, freq='M'), side='right')
+        return slice(debut, fin)
+
+    def position(self, niveau, membre):
+        """Ligne d'un membre dans les tableaux de son niveau"""
+        return self._position[niveau][membre]
+
+    def valeurs(self, niveau, mesure='revenu'):
+        """Tableau dense membres × mois d'un niveau"""
+        return self._valeurs[(niveau, mesure)]
+
+    def serie(self, niveau='total', membre=None, mesure='revenu', debut=None, fin=None):
+        """Série mensuelle d'un membre (total par défaut)"""
+        ligne = self._position[niveau][membre] if membre is not None else 0
+        periodes = self._index_periodes(debut, fin)
+        return pd.Series(self._valeurs[(niveau, mesure)][ligne, periodes],
+                         index=self.dates[periodes], name=mesure)
+
+    def slice(self, niveau='categorie', membres=None, mesure='revenu', debut=None, fin=None):
+        """Coupe au format long (date, membre, valeur) pour les graphiques"""
+        membres = self.membres[niveau] if membres is None else list(membres)
+        lignes = [self._position[niveau][membre] for membre in membres]
+        periodes = self._index_periodes(debut, fin)
+        bloc = self._valeurs[(niveau, mesure)][lignes, periodes]
+        return pd.DataFrame({
+            'date': np.tile(self.dates[periodes], len(membres)),
+            niveau: np.repeat(membres, bloc.shape[1]),
+            mesure: bloc.ravel()
+        })
+
+    def enfants(self, niveau, membre):
+        """Membres du niveau inférieur rattachés à un membre"""
+        if niveau == 'total':
+            return list(self.membres['categorie'])
+        if niveau == 'categorie':
+            masque = self.appartenance['categorie'][self._position['categorie'][membre]] > 0
+        elif niveau == 'secteur':
+            masque = self.appartenance['produit'][:, self._position['secteur'][membre]] > 0
+        else:
+            raise ValueError(f"Descente impossible depuis le niveau {niveau}")
+        return [m for m, garde in zip(self.membres[ENFANTS[niveau]], masque) if garde]
+
+    def drill(self, niveau, membre, mesure='revenu', debut=None, fin=None):
+        """Descente d'un niveau : séries des enfants d'un membre"""
+        return self.slice(ENFANTS[niveau], self.enfants(niveau, membre), mesure, debut, fin)
+
+    def heatmap(self, niveau='total', membre=None, mesure='revenu'):
+        """Grille année × mois d'un membre, remplie par indexation"""
+        annees = np.unique(self.annees)
+        grille = np.full((len(annees), 12), np.nan)
+        grille[np.searchsorted(annees, self.annees), self.mois - 1] = self.serie(niveau, membre, mesure).to_numpy()
+        return pd.DataFrame(grille, index=pd.Index(annees, name='annee'),
+                            columns=pd.Index(range(1, 13), name='mois'))
+
+    def saisonnalite(self, niveau='secteur', mesure='revenu'):
+        """Moyenne par mois calendaire (1-12) sur les membres et les années"""
+        valeurs = self._valeurs[(niveau, mesure)]
+        sommes = np.bincount(self.mois - 1, weights=valeurs.sum(axis=0), minlength=12)
+        effectifs = np.bincount(self.mois - 1, minlength=12) * valeurs.shape[0]
+        return pd.Series(np.divide(sommes, effectifs, out=np.full(12, np.nan), where=effectifs > 0),
+                         index=pd.Index(range(1, 13), name='mois'), name=mesure)
+
+    def agreger_courant(self, current_data, agregations, niveau='categorie'):
+        """Agrège des colonnes des données courantes vers un niveau ('sum', 'mean', 'count')"""
+        matrice = self.appartenance[niveau]
+        alignees = current_data.set_index('secteur').reindex(self.membres['secteur'])
+        effectifs = matrice @ alignees.index.isin(current_data['secteur']).astype(float)
+        resultat = {niveau: self.membres[niveau]}
+        for colonne, agregation in agregations.items():
+            if agregation == 'count':
+                resultat[colonne] = effectifs.astype(int)
+                continue
+            valeurs = matrice @ alignees[colonne].fillna(0).to_numpy(dtype=float)
+            if agregation == 'mean':
+                valeurs = np.divide(valeurs, effectifs, out=np.full_like(valeurs, np.nan), where=effectifs > 0)
+            resultat[colonne] = valeurs
+        # Comme un groupby : seuls les membres représentés sont retournés
+        return pd.DataFrame(resultat)[effectifs > 0].reset_index(drop=True)
@@ -0,0 +1,771 @@
+# dashboard.py
+"""Cœur du dashboard : données, flux temps réel, en-tête, métriques et sidebar"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from octroi.carte import CommunesMap
+from octroi.classement import DeclarationsSimulees, TopContribuables
+from octroi.comparaisons import PeriodComparator
+from octroi.cube import OctroiCube
+from octroi.historique import MOTIF_IMPORT, creer_historique, signature_import
+from octroi.indicateurs import CHEMIN_INDICATEURS, IndicatorsService
+from octroi.journal import LiveEventLog
+from octroi.lazy import durees_import
+from octroi.montecarlo import MonteCarloProjection
+from octroi.navigation import build_navigation
+from octroi.rapports import FORMATS, RAPPORTS, ReportJobs
+from octroi.scenarios import ScenarioEngine
+from octroi.sessions import SessionMemory
+from octroi.simulation import SimulationContext
+from octroi.sources import SimulatedSource, creer_source
+from octroi.territoires import (TERRITOIRE_DEFAUT, TERRITOIRES, adapter_produits, adapter_secteurs,
+                                territoire_valide)
+
+# Source des données temps réel (vide = simulation)
+# ex: tcp://127.0.0.1:9000, tail:///var/log/declarations.ndjson, replay:///tmp/jour.ndjson?vitesse=20
+LIVE_SOURCE_URL = os.environ.get('OCTROI_LIVE_SOURCE', '')
+
+# Délai minimal entre deux lots de la source simulée, toutes sessions confondues (s)
+INTERVALLE_SIMULATION = 5.0
+
+# Rafraîchissement automatique coché par défaut (0 = décoché, ex. tests de charge)
+AUTO_REFRESH = os.environ.get('OCTROI_AUTO_REFRESH', '1') != '0'
+
+# Port de l'API JSON servie à côté du dashboard (vide = pas d'API)
+API_PORT = os.environ.get('OCTROI_API_PORT', '')
+
+logger = logging.getLogger(__name__)
+
+
+def live_source_url(territoire):
+    """Source temps réel d'un territoire (OCTROI_LIVE_SOURCE_<CODE>, ex. OCTROI_LIVE_SOURCE_GLP)"""
+    return os.environ.get(f'OCTROI_LIVE_SOURCE_{territoire}',
+                          LIVE_SOURCE_URL if territoire == TERRITOIRE_DEFAUT else '')
+
+def select_territory():
+    """Territoire choisi dans la sidebar (conservé dans l'URL)"""
+    codes = list(TERRITOIRES)
+    territoire = st.sidebar.selectbox(
+        "🌍 Territoire", codes,
+        index=codes.index(territoire_valide(st.query_params.get('territoire'))),
+        format_func=lambda code: f"{TERRITOIRES[code]['icone']} {TERRITOIRES[code]['nom']}",
+        key='territoire'
+    )
+    st.query_params['territoire'] = territoire
+    return territoire
+
+
+def motif_import(territoire):
+    """Motif glob des déclarations importées du territoire (None : historique simulé)"""
+    return MOTIF_IMPORT.format(territoire=territoire) if MOTIF_IMPORT else None
+
+def version_donnees(simulation):
+    """Version des données : simulation, suivie de la signature des fichiers importés le cas échéant"""
+    motif = motif_import(simulation.territoire)
+    return f"{simulation.data_version}-{signature_import(motif)}" if motif else simulation.data_version
+
+@st.cache_resource
+def get_live_source(url):
+    """Source de flux partagée entre les sessions (une connexion par URL)"""
+    return creer_source(url).start()
+
+@st.cache_resource(show_spinner=False)
+def get_simulated_source(_dashboard, data_version):
+    """Source simulée unique par territoire : son débit ne croît pas avec le nombre de sessions"""
+    simulation = _dashboard.simulation
+    return SimulatedSource(_dashboard.current_data[['secteur', 'revenu_mensuel', 'volume_importation']].copy(),
+                           intervalle=INTERVALLE_SIMULATION,
+                           tirage=lambda lot: simulation.generateur('live', lot))
+
+@st.cache_resource(show_spinner=False)
+def get_api_server(port):
+    """API JSON lancée une fois par processus, lisant le journal temps réel des sessions"""
+    from octroi.api import demarrer
+    return demarrer(port, alimenter=False)
+
+@st.cache_resource(show_spinner=False)
+def get_history_store(_dashboard, data_version):
+    """Stockage de l'historique (pandas ou DuckDB), simulé seulement si la version manque"""
+    return creer_historique(data_version, _dashboard.initialize_historical_data,
+                            partition=_dashboard.territoire.lower(), motif=motif_import(_dashboard.territoire))
+
+@st.cache_resource(show_spinner=False)
+def load_historical_data(_dashboard, data_version):
+    """Agrégats secteur × mois de l'historique, partagés en lecture seule par les sessions"""
+    agregats = _dashboard.historique.agregats_mensuels()
+    inconnus = sorted(set(agregats['secteur']) - set(_dashboard.secteurs))
+    if inconnus:
+        # Historique importé : les secteurs hors nomenclature sont ignorés
+        logger.warning("Secteurs inconnus ignorés dans l'historique %s : %s", _dashboard.territoire, ', '.join(inconnus))
+        agregats = agregats[agregats['secteur'].isin(list(_dashboard.secteurs))].reset_index(drop=True)
+    manquants = [code for code in _dashboard.secteurs if code not in set(agregats['secteur'])]
+    if manquants:
+        # Historique importé incomplet : ces secteurs partent d'une recette nulle
+        logger.warning("Secteurs absents de l'historique %s : %s", _dashboard.territoire, ', '.join(manquants))
+    return agregats
+
+@st.cache_resource(show_spinner=False)
+def get_cube(_dashboard, data_version):
+    """Cube d'agrégats de l'historique, construit une fois par version des données"""
+    return OctroiCube(_dashboard.historical_data, _dashboard.secteurs, _dashboard.product_data)
+
+@st.cache_resource(show_spinner=False)
+def get_comparator(_dashboard, data_version):
+    """Comparaisons de périodes précalculées, une fois par version des données"""
+    return PeriodComparator(_dashboard.cube)
+
+@st.cache_resource(show_spinner=False)
+def get_scenario_engine(_dashboard, data_version):
+    """Moteur de scénarios de taux (recettes et taux de référence précalculés)"""
+    return ScenarioEngine(_dashboard.cube, _dashboard.historical_data, _dashboard.secteurs)
+
+@st.cache_resource(show_spinner=False)
+def get_monte_carlo(_dashboard, data_version):
+    """Chemins de projection Monte Carlo, simulés une fois par version des données"""
+    return MonteCarloProjection(_dashboard.cube, _dashboard.simulation.stream('projections'))
+
+@st.cache_resource(show_spinner=False)
+def get_communes():
+    """Géométries des communes, simplifiées une fois pour toutes les sessions"""
+    return CommunesMap()
+
+@st.cache_resource(show_spinner=False)
+def get_carte_communes(_dashboard, data_version):
+    """Répartition communale et carte folium, construites une fois et partagées par les sessions"""
+    repartition = get_communes().repartir(_dashboard.cube.valeurs('total')[0, -12:].sum())
+    return repartition, get_communes().carte_folium(repartition)
+
+@st.cache_resource(show_spinner=False)
+def get_top_contribuables(_dashboard, data_version):
+    """Classements à mémoire bornée des déclarations, alimentés ensuite par le flux temps réel"""
+    return TopContribuables(DeclarationsSimulees(_dashboard.current_data, _dashboard.product_data,
+                                                 _dashboard.secteurs, _dashboard.simulation))
+
+@st.cache_data(show_spinner=False)
+def get_exact_top_contribuables(_dashboard, data_version, dimension, k):
+    """Top k exact des déclarations du mois (contrôle des bornes de l'esquisse)"""
+    return _dashboard.top_contribuables.recompter(dimension, k)
+
+@st.cache_resource
+def get_indicators_service(territoire=TERRITOIRE_DEFAUT):
+    """Service des indicateurs économiques partagé (None si le territoire n'a pas de séries)"""
+    if territoire == TERRITOIRE_DEFAUT:
+        return IndicatorsService()
+    chemin = CHEMIN_INDICATEURS.replace('.csv', f'_{territoire.lower()}.csv')
+    return IndicatorsService(chemin) if os.path.exists(chemin) else None
+
+@st.cache_resource
+def get_report_jobs():
+    """File de génération des rapports, partagée (une demande identique n'est générée qu'une fois)"""
+    return ReportJobs()
+
+def session_active(session_id):
+    """Session encore connectée au serveur (toujours vrai hors serveur Streamlit)"""
+    from streamlit import runtime
+    return not runtime.exists() or runtime.get_instance().is_active_session(session_id)
+
+@st.cache_resource
+def get_session_memory():
+    """Données dérivées des sessions, sous budget par session et plafond global"""
+    return SessionMemory(est_active=session_active)
+
+@st.cache_resource
+def get_event_log(territoire, secteurs):
+    """Journal des évènements temps réel d'un territoire, conservé entre les exécutions"""
+    return LiveEventLog(secteurs)
+
+def load_territories(simulation, codes, charges=None):
+    """Partitions des territoires (historique et cube), chargées en parallèle et mises en cache"""
+    partitions = dict(charges or {})
+    manquants = [code for code in codes if code not in partitions]
+    contexte = get_script_run_ctx()
+
+    def charger(code):
+        # Les caches Streamlit des threads de chargement restent rattachés à la session
+        add_script_run_ctx(threading.current_thread(), contexte)
+        partition = OctroiMerDashboard(simulation.pour_territoire(code), territoire=code, temps_reel=False)
+        partition.cube
+        return code, partition
+
+    if manquants:
+        with ThreadPoolExecutor(max_workers=len(manquants)) as executor:
+            partitions.update(executor.map(charger, manquants))
+    return {code: partitions[code] for code in codes}
+
+class OctroiMerDashboard:
+    def __init__(self, simulation=None, territoire=TERRITOIRE_DEFAUT, temps_reel=True):
+        self.territoire = territoire_valide(territoire)
+        self.simulation = (simulation or SimulationContext()).pour_territoire(self.territoire)
+        self.data_version = version_donnees(self.simulation)
+        self.secteurs = adapter_secteurs(self.define_secteurs(), self.territoire)
+        self.historique = get_history_store(self, self.data_version)
+        # Agrégats mensuels (mêmes colonnes que l'historique brut) : seule copie par session
+        self.historical_data = load_historical_data(self, self.data_version)
+        self.product_data = adapter_produits(self.initialize_product_data(), self.territoire)
+        if not temps_reel:
+            # Partition consultée pour les comparaisons : historique et agrégats seulement
+            return
+        self.current_data = self.initialize_current_data()
+        self.indicators = get_indicators_service(self.territoire)
+        self.event_log = self.initialize_event_log()
+        self.live_source = self.initialize_live_source()
+    
+    @property
+    def infos_territoire(self):
+        """Nom, collectivité et population du territoire"""
+        return TERRITOIRES[self.territoire]
+    
+    def territoires(self, codes=None):
+        """Partitions de plusieurs territoires (celle de la session est réutilisée)"""
+        return load_territories(self.simulation, list(codes or TERRITOIRES), {self.territoire: self})
+        
+    @property
+    def cube(self):
+        """Cube d'agrégats partagé (construit au premier accès de la version)"""
+        return get_cube(self, self.data_version)
+    
+    @property
+    def comparaisons(self):
+        """Moteur de comparaison N-1 / M-1 / cumul annuel partagé"""
+        return get_comparator(self, self.data_version)
+    
+    @property
+    def scenarios(self):
+        """Moteur de scénarios de taux partagé"""
+        return get_scenario_engine(self, self.data_version)
+    
+    @property
+    def projections(self):
+        """Projections Monte Carlo partagées (bandes P10/P50/P90)"""
+        return get_monte_carlo(self, self.data_version)
+    
+    @property
+    def carte_communes(self):
+        """Répartition communale des recettes et carte associée (La Réunion uniquement)"""
+        if self.territoire != TERRITOIRE_DEFAUT:
+            return None
+        return get_carte_communes(self, self.data_version)
+    
+    @property
+    def top_contribuables(self):
+        """Classements des importateurs et lignes tarifaires (Space-Saving / Count-Min)"""
+        return get_top_contribuables(self, self.data_version)
+    
+    def top_contribuables_exact(self, dimension, k=10):
+        """Recompte exact (mis en cache) d'un classement"""
+        return get_exact_top_contribuables(self, self.data_version, dimension, k)
+    
+    def derive(self, cle, calculer):
+        """Donnée dérivée propre à la session (filtres, tables éditées), retenue sous budget mémoire"""
+        contexte = get_script_run_ctx(suppress_warning=True)
+        if contexte is None:
+            return calculer()
+        return get_session_memory().obtenir(contexte.session_id, (self.data_version,) + tuple(cle), calculer)
+    
+    def define_secteurs(self):
+        """Définit les secteurs économiques pour l'Octroi de Mer"""
+        return {
+            'AGRICULTURE': {
+                'nom_complet': 'Produits Agricoles',
+                'categorie': 'Alimentation',
+                'sous_categorie': 'Fruits & Légumes',
+                'taux_normal': 2.5,
+                'taux_reduit': 1.3,
+                'taux_specifique': 0.0,
+                'couleur': '#28a745',
+                'poids_total': 15.2,
+                'volume_importation': 450000,
+                'description': 'Fruits, légumes, produits agricoles frais'
+            },
+            'AGROALIMENTAIRE': {
+                'nom_complet': 'Industrie Agroalimentaire',
+                'categorie': 'Alimentation',
+                'sous_categorie': 'Produits Transformés',
+                'taux_normal': 3.2,
+                'taux_reduit': 1.8,
+                'taux_specifique': 0.5,
+                'couleur': '#20c997',
+                'poids_total': 22.8,
+                'volume_importation': 320000,
+                'description': 'Produits alimentaires transformés'
+            },
+            'BOISSONS': {
+                'nom_complet': 'Boissons et Alcools',
+                'categorie': 'Alimentation',
+                'sous_categorie': 'Liquides',
+                'taux_normal': 5.8,
+                'taux_reduit': 3.2,
+                'taux_specifique': 8.5,
+                'couleur': '#fd7e14',
+                'poids_total': 8.5,
+                'volume_importation': 180000,
+                'description': 'Boissons alcoolisées et non-alcoolisées'
+            },
+            'BTP': {
+                'nom_complet': 'Matériaux de Construction',
+                'categorie': 'Industrie',
+                'sous_categorie': 'Matériaux',
+                'taux_normal': 4.2,
+                'taux_reduit': 2.1,
+                'taux_specifique': 1.5,
+                'couleur': '#6f42c1',
+                'poids_total': 12.3,
+                'volume_importation': 280000,
+                'description': 'Ciment, fer, matériaux construction'
+            },
+            'AUTOMOBILE': {
+                'nom_complet': 'Véhicules et Pièces',
+                'categorie': 'Transport',
+                'sous_categorie': 'Véhicules',
+                'taux_normal': 6.5,
+                'taux_reduit': 3.8,
+                'taux_specifique': 12.2,
+                'couleur': '#dc3545',
+                'poids_total': 9.8,
+                'volume_importation': 75000,
+                'description': 'Voitures, pièces détachées'
+            },
+            'ENERGIE': {
+                'nom_complet': 'Produits Pétroliers',
+                'categorie': 'Énergie',
+                'sous_categorie': 'Carburants',
+                'taux_normal': 3.8,
+                'taux_reduit': 2.2,
+                'taux_specifique': 0.8,
+                'couleur': '#ffc107',
+                'poids_total': 14.7,
+                'volume_importation': 420000,
+                'description': 'Carburants, lubrifiants'
+            },
+            'BIENS_EQUIPEMENT': {
+                'nom_complet': 'Biens d\'Équipement',
+                'categorie': 'Industrie',
+                'sous_categorie': 'Machines',
+                'taux_normal': 4.8,
+                'taux_reduit': 2.9,
+                'taux_specifique': 3.2,
+                'couleur': '#6610f2',
+                'poids_total': 7.2,
+                'volume_importation': 95000,
+                'description': 'Machines, équipements industriels'
+            },
+            'BIENS_CONSOMMATION': {
+                'nom_complet': 'Biens de Consommation',
+                'categorie': 'Commerce',
+                'sous_categorie': 'Divers',
+                'taux_normal': 5.2,
+                'taux_reduit': 3.1,
+                'taux_specifique': 4.5,
+                'couleur': '#e83e8c',
+                'poids_total': 16.5,
+                'volume_importation': 210000,
+                'description': 'Électroménager, meubles, textiles'
+            },
+            'PHARMACEUTIQUE': {
+                'nom_complet': 'Produits Pharmaceutiques',
+                'categorie': 'Santé',
+                'sous_categorie': 'Médicaments',
+                'taux_normal': 1.2,
+                'taux_reduit': 0.8,
+                'taux_specifique': 0.3,
+                'couleur': '#0066CC',
+                'poids_total': 4.8,
+                'volume_importation': 65000,
+                'description': 'Médicaments, produits santé'
+            },
+            'TIC': {
+                'nom_complet': 'Technologies Information',
+                'categorie': 'High-Tech',
+                'sous_categorie': 'Électronique',
+                'taux_normal': 4.5,
+                'taux_reduit': 2.7,
+                'taux_specifique': 6.8,
+                'couleur': '#17a2b8',
+                'poids_total': 5.2,
+                'volume_importation': 88000,
+                'description': 'Ordinateurs, téléphones, électronique'
+            }
+        }
+    
+    def initialize_historical_data(self):
+        """Initialise les données historiques de l'Octroi de Mer"""
+        rng = self.simulation.stream('historique')
+        dates = pd.date_range('2020-01-01', self.simulation.date_reference, freq='M')
+        data = []
+        
+        for date in dates:
+            for secteur_code, info in self.secteurs.items():
+                # Revenu de base selon le secteur
+                base_revenue = info['poids_total'] * rng.uniform(0.8, 1.2) * 1000000
+                
+                # Impact COVID (2020)
+                if date.year == 2020 and date.month <= 6:
+                    covid_impact = rng.uniform(0.3, 0.7)
+                elif date.year == 2020:
+                    covid_impact = rng.uniform(0.7, 0.9)
+                elif date.year == 2021:
+                    covid_impact = rng.uniform(0.9, 1.1)
+                else:
+                    covid_impact = rng.uniform(1.0, 1.3)
+                
+                # Variation saisonnière
+                if date.month in [12, 1, 2]:  # Été austral
+                    seasonal_impact = rng.uniform(1.1, 1.3)
+                elif date.month in [6, 7, 8]:  # Hiver austral
+                    seasonal_impact = rng.uniform(0.9, 1.1)
+                else:
+                    seasonal_impact = rng.uniform(0.95, 1.05)
+                
+                revenu = base_revenue * covid_impact * seasonal_impact * rng.uniform(0.95, 1.05)
+                volume = info['volume_importation'] * rng.uniform(0.8, 1.2)
+                
+                data.append({
+                    'date': date,
+                    'secteur': secteur_code,
+                    'revenu_octroi': revenu,
+                    'volume_importation': volume,
+                    'categorie': info['categorie'],
+                    'taux_moyen': info['taux_normal'] * rng.uniform(0.9, 1.1)
+                })
+        
+        return pd.DataFrame(data)
+    
+    def initialize_current_data(self):
+        """Initialise les données courantes"""
+        rng = self.simulation.stream('courant')
+        current_data = []
+        derniers = self.historical_data.groupby('secteur').tail(1).set_index('secteur')
+        for secteur_code, info in self.secteurs.items():
+            # Dernières données historiques (recette nulle si le secteur manque à l'import)
+            last_data = derniers.loc[secteur_code] if secteur_code in derniers.index else {'revenu_octroi': 0.0}
+            
+            # Variation mensuelle simulée
+            change_pct = rng.uniform(-0.08, 0.08)
+            change_abs = last_data['revenu_octroi'] * change_pct
+            
+            current_data.append({
+                'secteur': secteur_code,
+                'nom_complet': info['nom_complet'],
+                'categorie': info['categorie'],
+                'revenu_mensuel': last_data['revenu_octroi'] + change_abs,
+                'variation_pct': change_pct * 100,
+                'variation_abs': change_abs,
+                'volume_importation': info['volume_importation'] * rng.uniform(0.8, 1.2),
+                'taux_normal': info['taux_normal'],
+                'taux_reduit': info['taux_reduit'],
+                'taux_specifique': info['taux_specifique'],
+                'poids_total': info['poids_total'],
+                'revenu_annee_precedente': self.comparaisons.reference('secteur', secteur_code, decalage=12),
+                'projection_annee_courante': last_data['revenu_octroi'] * rng.uniform(1.05, 1.15)
+            })
+        
+        return pd.DataFrame(current_data)
+    
+    def initialize_product_data(self):
+        """Initialise les données par produit"""
+        produits = [
+            {'produit': 'Véhicules particuliers', 'secteur': 'AUTOMOBILE', 'taux_octroi': 12.2, 'volume': 12000},
+            {'produit': 'Carburants', 'secteur': 'ENERGIE', 'taux_octroi': 2.2, 'volume': 420000},
+            {'produit': 'Boissons alcoolisées', 'secteur': 'BOISSONS', 'taux_octroi': 8.5, 'volume': 85000},
+            {'produit': 'Matériaux construction', 'secteur': 'BTP', 'taux_octroi': 2.1, 'volume': 280000},
+            {'produit': 'Produits alimentaires', 'secteur': 'AGROALIMENTAIRE', 'taux_octroi': 1.8, 'volume': 320000},
+            {'produit': 'Fruits et légumes', 'secteur': 'AGRICULTURE', 'taux_octroi': 1.3, 'volume': 450000},
+            {'produit': 'Équipements électroniques', 'secteur': 'TIC', 'taux_octroi': 2.7, 'volume': 88000},
+            {'produit': 'Médicaments', 'secteur': 'PHARMACEUTIQUE', 'taux_octroi': 0.8, 'volume': 65000},
+            {'produit': 'Meubles et ameublement', 'secteur': 'BIENS_CONSOMMATION', 'taux_octroi': 3.1, 'volume': 45000},
+            {'produit': 'Machines industrielles', 'secteur': 'BIENS_EQUIPEMENT', 'taux_octroi': 2.9, 'volume': 35000},
+        ]
+        
+        return pd.DataFrame(produits)
+    
+    def initialize_event_log(self):
+        """Initialise le journal temps réel et y aligne les données courantes"""
+        event_log = get_event_log(self.territoire, tuple(self.secteurs))
+        event_log.ouvrir(self.current_data)
+        event_log.appliquer(self.current_data)
+        return event_log
+    
+    def initialize_live_source(self):
+        """Initialise la source des données temps réel"""
+        url = live_source_url(self.territoire)
+        if url:
+            return get_live_source(url)
+        # Un sous-flux par lot émis : la simulation reste reproductible
+        return get_simulated_source(self, self.data_version)
+    
+    def update_live_data(self):
+        """Met à jour les données en temps réel"""
+        # Lots d'évènements reçus depuis la dernière exécution
+        evenements = self.live_source.poll()
+        self.event_log.enregistrer(evenements)
+        self.event_log.appliquer(self.current_data)
+        self.top_contribuables.enregistrer(evenements)
+    
+    def display_header(self):
+        """Affiche l'en-tête du dashboard"""
+        territoire = self.infos_territoire
+        st.markdown(f'<h1 class="main-header">{territoire["icone"]} Dashboard Octroi de Mer - {territoire["nom"]}</h1>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.markdown('<div class="live-badge">🔴 DONNÉES FISCALES EN TEMPS RÉEL</div>', 
+                       unsafe_allow_html=True)
+            st.markdown("**Surveillance et analyse des recettes de l'Octroi de Mer par secteur économique**")
+        
+        # Bannière du territoire
+        st.markdown(f"""
+        <div class="reunion-flag">
+            <strong>{territoire['collectivite']} - Octroi de Mer</strong><br>
+            <small>Taxe perçue sur les produits importés ({territoire['nom']})</small>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        current_time = datetime.now().strftime('%H:%M:%S')
+        st.sidebar.markdown(f"**🕐 Dernière mise à jour: {current_time}**")
+    
+    def compute_key_metrics(self):
+        """Métriques clés de l'Octroi de Mer (affichées et servies par l'API)"""
+        revenu_total = self.current_data['revenu_mensuel'].sum()
+        volume_total = self.current_data['volume_importation'].sum()
+        return {
+            'revenu_total': revenu_total,
+            'variation_moyenne': self.current_data['variation_pct'].mean(),
+            'volume_total': volume_total,
+            'secteurs_hausse': int((self.current_data['variation_pct'] > 0).sum()),
+            'secteurs': len(self.current_data),
+            # Revenu annuel projeté (médiane des chemins Monte Carlo, fourchette P10-P90)
+            'revenu_annuel_projete': self.projections.annuel(),
+            # Comparaisons avec l'historique (même mois N-1, mois précédent)
+            'variation_annuelle': self.comparaisons.variation_courante(revenu_total, decalage=12),
+            'variation_volume': self.comparaisons.variation_courante(volume_total, mesure='volume', decalage=1)
+        }
+    
+    def compute_octroi(self, produit, valeur, type_taux='Normal'):
+        """Montant d'octroi de mer d'un produit pour une valeur imposable"""
+        produit_data = self.product_data[self.product_data['produit'] == produit].iloc[0]
+        colonne = {'Normal': 'taux_normal', 'Réduit': 'taux_reduit', 'Spécifique': 'taux_specifique'}[type_taux]
+        taux_applique = self.secteurs[produit_data['secteur']][colonne]
+        return {
+            'produit': produit,
+            'secteur': produit_data['secteur'],
+            'type_taux': type_taux,
+            'taux_applique': taux_applique,
+            'valeur': valeur,
+            'montant_octroi': valeur * (taux_applique / 100)
+        }
+    
+    def display_key_metrics(self):
+        """Affiche les métriques clés de l'Octroi de Mer"""
+        st.markdown('<h3 class="section-header">📊 INDICATEURS CLÉS OCTROI DE MER</h3>', 
+                   unsafe_allow_html=True)
+        
+        # Calcul des métriques
+        metriques = self.compute_key_metrics()
+        revenu_total = metriques['revenu_total']
+        variation_moyenne = metriques['variation_moyenne']
+        volume_total = metriques['volume_total']
+        secteurs_hausse = metriques['secteurs_hausse']
+        revenu_annuel_projete = metriques['revenu_annuel_projete']
+        variation_annuelle = metriques['variation_annuelle']
+        variation_volume = metriques['variation_volume']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "Revenu Mensuel Octroi de Mer",
+                f"{revenu_total/1e6:.1f} M€",
+                f"{variation_moyenne:+.2f}%",
+                delta_color="normal"
+            )
+        
+        with col2:
+            st.metric(
+                "Revenu Annuel Projeté",
+                f"{revenu_annuel_projete['p50']/1e6:.0f} M€",
+                f"{variation_annuelle:+.1f}% vs année précédente",
+                help=f"Médiane sur 12 mois ; P10-P90 : {revenu_annuel_projete['p10']/1e6:.0f} - "
+                     f"{revenu_annuel_projete['p90']/1e6:.0f} M€"
+            )
+        
+        with col3:
+            st.metric(
+                "Secteurs en Croissance",
+                f"{secteurs_hausse}/{len(self.current_data)}",
+                f"{secteurs_hausse - (len(self.current_data) - secteurs_hausse):+d} vs décroissance"
+            )
+        
+        with col4:
+            volume_total_formatted = f"{volume_total/1000:.0f}K"
+            st.metric(
+                "Volume Total Importations",
+                volume_total_formatted,
+                f"{variation_volume:+.1f}% vs mois dernier"
+            )
+    
+    def create_sidebar(self):
+        """Crée la sidebar avec les contrôles"""
+        st.sidebar.markdown("## 🎛️ CONTRÔLES D'ANALYSE")
+        
+        # Filtres temporels
+        st.sidebar.markdown("### 📅 Période d'analyse")
+        date_debut = st.sidebar.date_input("Date de début", 
+                                         value=datetime.now() - timedelta(days=365))
+        date_fin = st.sidebar.date_input("Date de fin", 
+                                       value=datetime.now())
+        
+        # Filtres catégories
+        st.sidebar.markdown("### 🏢 Sélection des catégories")
+        categories_selectionnees = st.sidebar.multiselect(
+            "Catégories à afficher:",
+            list(self.current_data['categorie'].unique()),
+            default=list(self.current_data['categorie'].unique())[:3]
+        )
+        
+        # Options d'affichage
+        st.sidebar.markdown("### ⚙️ Options")
+        auto_refresh = st.sidebar.checkbox("Rafraîchissement automatique", value=AUTO_REFRESH)
+        show_details = st.sidebar.checkbox("Afficher détails techniques", value=False)
+        
+        # Bouton de rafraîchissement manuel
+        if st.sidebar.button("🔄 Rafraîchir les données"):
+            self.update_live_data()
+            st.rerun()
+        
+        # Informations économiques
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### 💹 INDICATEURS ÉCONOMIQUES")
+        
+        # Indicateurs économiques précalculés (partagés entre sessions)
+        indicateurs = self.indicators.resume() if self.indicators is not None else {}
+        if not indicateurs:
+            st.sidebar.caption(f"Indicateurs non disponibles pour {self.infos_territoire['nom']}")
+        
+        for indicateur, data in indicateurs.items():
+            st.sidebar.metric(
+                indicateur,
+                f"{data['valeur']:.1f}%",
+                f"{data['variation']:+.1f}%"
+            )
+        
+        if indicateurs:
+            with st.sidebar.expander("🔗 Corrélation avec les recettes"):
+                correlations = self.indicators.correlations(self.historical_data, self.data_version)
+                correlations = correlations.dropna(subset=['correlation'])
+                if correlations.empty:
+                    st.caption("Séries insuffisantes pour calculer les corrélations")
+                for _, ligne in correlations.iterrows():
+                    st.markdown(f"**{ligne['indicateur']}:** {ligne['correlation']:+.2f} "
+                                f"<small>({ligne['mois']} mois)</small>", unsafe_allow_html=True)
+        
+        if show_details:
+            st.sidebar.markdown("### 📡 Flux temps réel")
+            st.sidebar.json(self.live_source.stats())
+            st.sidebar.caption(f"Journal: {self.event_log.memoire() / 1e6:.1f} Mo")
+            historique = self.historique.stats()
+            st.sidebar.caption(f"Historique ({historique['moteur']}): {historique['lignes']:,} lignes, "
+                               f"{historique['memoire'] / 1e6:.1f} Mo")
+            st.sidebar.caption(f"Version des données: {self.data_version}")
+            contexte = get_script_run_ctx(suppress_warning=True)
+            memoire = get_session_memory().stats(contexte.session_id if contexte else None)
+            st.sidebar.caption(f"Session: {memoire['octets_session'] / 1e6:.1f} / {memoire['budget_session'] / 1e6:.0f} Mo · "
+                               f"{memoire['sessions']} sessions: {memoire['octets'] / 1e6:.1f} / "
+                               f"{memoire['plafond'] / 1e6:.0f} Mo ({memoire['evictions']} évictions)")
+        
+        return {
+            'date_debut': date_debut,
+            'date_fin': date_fin,
+            'categories_selectionnees': categories_selectionnees,
+            'auto_refresh': auto_refresh,
+            'show_details': show_details
+        }
+
+    def display_reports(self, controls):
+        """Demande et téléchargement des rapports mensuels (Excel / PDF)"""
+        jobs = get_report_jobs()
+        with st.sidebar.expander("📥 Rapports mensuels"):
+            type_rapport = st.selectbox("Rapport:", list(RAPPORTS), format_func=lambda code: RAPPORTS[code]['titre'],
+                                        key='rapport_type')
+            format_rapport = st.radio("Format:", list(FORMATS), format_func=lambda code: FORMATS[code]['nom'],
+                                      horizontal=True, key='rapport_format')
+            if st.button("Générer le rapport", key='rapport_generer'):
+                # Filtres de la sidebar appliqués au rapport (mois de début et de fin, catégories)
+                filtres = {
+                    'debut': f"{controls['date_debut']:%Y-%m}",
+                    'fin': f"{controls['date_fin']:%Y-%m}",
+                    'categories': sorted(controls['categories_selectionnees'])
+                }
+                sources = {'cube': self.cube, 'comparaisons': self.comparaisons, 'projections': self.projections}
+                entete = {
+                    'Rapport': RAPPORTS[type_rapport]['titre'],
+                    'Territoire': self.infos_territoire['nom'],
+                    'Période': f"{filtres['debut']} → {filtres['fin']}",
+                    'Catégories': ', '.join(filtres['categories']) or 'Toutes',
+                    'Version des données': self.data_version,
+                    'Généré le': datetime.now().strftime('%d/%m/%Y %H:%M')
+                }
+                cle = jobs.soumettre(type_rapport, format_rapport, filtres, self.data_version, sources, entete)
+                demandes = st.session_state.setdefault('rapports', [])
+                if cle not in demandes:
+                    demandes.insert(0, cle)
+            
+            demandes = st.session_state.get('rapports', [])
+            en_cours = any(jobs.etat(cle) in ('en_attente', 'en_cours') for cle in demandes)
+            # Tant qu'un rapport est en file, seule cette liste est réexécutée (toutes les 2 s)
+            st.fragment(self.display_report_jobs, run_every=2 if en_cours else None)(demandes)
+    
+    def display_report_jobs(self, demandes):
+        """État des rapports demandés par la session, téléchargement des artefacts prêts"""
+        jobs = get_report_jobs()
+        icones = {'en_attente': '⏳', 'en_cours': '⚙️', 'termine': '✅', 'erreur': '❌', 'inconnu': '❔'}
+        for cle in demandes:
+            etat = jobs.etat(cle)
+            if etat == 'termine':
+                st.download_button(f"{icones[etat]} {cle}", jobs.lire(cle), file_name=cle,
+                                   mime=FORMATS[cle.rsplit('.', 1)[1]]['mime'], key=f"telecharger_{cle}")
+            else:
+                st.caption(f"{icones[etat]} {cle}")
+                if etat == 'erreur':
+                    st.caption(jobs.erreur(cle))
+    
+    def run_dashboard(self):
+        """Exécute le dashboard complet"""
+        # Mise à jour des données live
+        self.update_live_data()
+        
+        if API_PORT:
+            get_api_server(int(API_PORT))
+        
+        # Sidebar
+        controls = self.create_sidebar()
+        
+        # Header
+        self.display_header()
+        
+        # Métriques clés
+        self.display_key_metrics()
+        
+        # Exports mensuels générés en arrière-plan
+        self.display_reports(controls)
+        
+        # Navigation par pages : seule la page affichée est importée et calculée
+        build_navigation(self).run()
+        
+        if controls['show_details'] and durees_import:
+            st.sidebar.markdown("### ⏱️ Imports à la demande")
+            for module, duree in durees_import.items():
+                st.sidebar.caption(f"{module}: {duree:.0f} ms")
+        
+        # Rafraîchissement automatique
+        if controls['auto_refresh']:
+            time.sleep(30)  # Rafraîchissement toutes les 30 secondes
+            st.rerun()
@@ -0,0 +1,220 @@
+# historique.py
+"""Stockage de l'historique et agrégations mensuelles poussées au moteur.
+
+Le dashboard ne manipule que les agrégats secteur × mois (quelques centaines
+de lignes, mêmes colonnes que l'historique brut) ; cube, comparaisons,
+scénarios et corrélations en dérivent. Deux moteurs :
+
+- ``pandas`` (défaut) : l'historique reste en mémoire, partagé par toutes
+  les sessions du processus ;
+- ``duckdb`` : l'historique est stocké dans une base fichier locale (un
+  fichier par territoire, ex. ``historique_reu.duckdb``) et l'agrégation s'exécute en SQL (lecture parallèle,
+  seul le résultat est matérialisé). La base est conservée entre les
+  redémarrages : une table n'est rechargée que si sa version change.
+  L'écriture (chargement d'une table) est brève ; les lectures passent par
+  une connexion en lecture seule, que plusieurs processus (dashboard, API
+  autonome) peuvent ouvrir en même temps. Si la base est verrouillée par un
+  autre processus, l'historique est conservé en mémoire (pandas).
+
+Au lieu de l'historique simulé, des déclarations réelles peuvent être
+importées depuis des fichiers Parquet ou CSV (mêmes colonnes, une ligne par
+déclaration) ; avec DuckDB elles ne passent pas par pandas :
+
+    OCTROI_HISTORY_BACKEND=duckdb OCTROI_HISTORY_DB=/data/octroi.duckdb streamlit run Dashboard.py
+    OCTROI_HISTORY_IMPORT='/data/declarations/*.parquet' streamlit run Dashboard.py
+"""
+import glob
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from octroi.lazy import optional_import
+
+logger = logging.getLogger(__name__)
+
+BACKEND = os.environ.get('OCTROI_HISTORY_BACKEND', 'pandas')
+CHEMIN_BASE = os.environ.get(
+    'OCTROI_HISTORY_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'historique.duckdb')
+)
+THREADS = int(os.environ.get('OCTROI_DUCKDB_THREADS', os.cpu_count() or 1))
+# Déclarations à importer (motif glob, ``{territoire}`` remplacé par le code du territoire)
+MOTIF_IMPORT = os.environ.get('OCTROI_HISTORY_IMPORT', '')
+
+COLONNES = ['date', 'secteur', 'categorie', 'revenu_octroi', 'volume_importation', 'taux_moyen', 'declarations']
+
+REQUETE_AGREGATS = """
+    SELECT max(date) AS date,
+           secteur,
+           any_value(categorie) AS categorie,
+           sum(revenu_octroi) AS revenu_octroi,
+           sum(volume_importation) AS volume_importation,
+           coalesce(sum(taux_moyen * revenu_octroi) / nullif(sum(revenu_octroi), 0), avg(taux_moyen)) AS taux_moyen,
+           count(*) AS declarations
+    FROM {table}
+    GROUP BY secteur, date_trunc('month', date)
+    ORDER BY date, secteur
+"""
+
+
+def chemin_partition(chemin, partition=None):
+    """Fichier de la base d'une partition (territoire) : ``historique.duckdb`` -> ``historique_reu.duckdb``"""
+    if not partition:
+        return chemin
+    racine, extension = os.path.splitext(chemin)
+    return f"{racine}_{partition}{extension}"
+
+
+def signature_import(motif):
+    """Version d'un import : chemins, tailles et dates de modification des fichiers"""
+    fichiers = sorted(glob.glob(motif))
+    if not fichiers:
+        raise FileNotFoundError(f"Aucun fichier d'historique ne correspond à {motif}")
+    empreinte = hashlib.sha1()
+    for fichier in fichiers:
+        infos = os.stat(fichier)
+        empreinte.update(f"{fichier}:{infos.st_size}:{infos.st_mtime_ns};".encode('utf-8'))
+    return f"import-{empreinte.hexdigest()[:12]}"
+
+
+def lire_fichiers(motif):
+    """Déclarations des fichiers Parquet ou CSV (motif glob) dans un DataFrame"""
+    lire = pd.read_parquet if motif.endswith('.parquet') else pd.read_csv
+    data = pd.concat([lire(fichier) for fichier in sorted(glob.glob(motif))], ignore_index=True)
+    data['date'] = pd.to_datetime(data['date'])
+    return data
+
+
+class PandasHistory:
+    """Historique en mémoire (DataFrame partagé par référence)"""
+
+    nom = 'pandas'
+
+    def __init__(self, historical_data, version=None):
+        self.data = historical_data
+        self.version = version
+
+    def agregats_mensuels(self):
+        """Recettes, volumes et taux moyen pondéré par secteur × mois"""
+        data = self.data.assign(_pondere=self.data['taux_moyen'] * self.data['revenu_octroi'])
+        agregats = data.groupby(['secteur', data['date'].dt.to_period('M')], sort=False).agg(
+            date=('date', 'max'),
+            categorie=('categorie', 'first'),
+            revenu_octroi=('revenu_octroi', 'sum'),
+            volume_importation=('volume_importation', 'sum'),
+            _pondere=('_pondere', 'sum'),
+            taux_brut=('taux_moyen', 'mean'),
+            declarations=('date', 'size')
+        )
+        agregats['taux_moyen'] = (agregats['_pondere'] / agregats['revenu_octroi'].replace(0, np.nan)).fillna(
+            agregats['taux_brut'])
+        return agregats.droplevel(1).reset_index().sort_values(['date', 'secteur'], ignore_index=True)[COLONNES]
+
+    def stats(self):
+        return {'moteur': self.nom, 'lignes': len(self.data),
+                'memoire': int(self.data.memory_usage(deep=True).sum())}
+
+
+class DuckDBHistory:
+    """Historique stocké dans une base DuckDB locale, agrégé en SQL"""
+
+    nom = 'duckdb'
+
+    def __init__(self, duckdb, chemin=CHEMIN_BASE, table='historique', threads=THREADS, lecture_seule=True):
+        self.chemin = chemin
+        self.table = table
+        self.lecture_seule = lecture_seule
+        self._connexion = duckdb.connect(chemin, read_only=lecture_seule)
+        self._connexion.execute(f"SET threads TO {int(threads)}")
+        if not lecture_seule:
+            self._connexion.execute("CREATE TABLE IF NOT EXISTS meta (cle VARCHAR PRIMARY KEY, valeur VARCHAR)")
+
+    def _requete(self, sql, parametres=None):
+        # Un curseur par requête : la connexion est partagée entre les sessions (threads)
+        with self._connexion.cursor() as curseur:
+            return curseur.execute(sql, parametres or []).df()
+
+    @property
+    def version(self):
+        tables = self._requete("SELECT table_name FROM information_schema.tables WHERE table_name = 'meta'")
+        if not len(tables):
+            return None
+        resultat = self._requete("SELECT valeur FROM meta WHERE cle = ?", [f"version_{self.table}"])
+        return resultat['valeur'].iloc[0] if len(resultat) else None
+
+    def fermer(self):
+        self._connexion.close()
+
+    def charger(self, historical_data, version):
+        """Remplace l'historique stocké par un DataFrame"""
+        with self._connexion.cursor() as curseur:
+            curseur.register('source', historical_data)
+            curseur.execute(f"CREATE OR REPLACE TABLE {self.table} AS SELECT * FROM source")
+            curseur.unregister('source')
+            curseur.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", [f"version_{self.table}", version])
+        return self
+
+    def importer(self, motif, version):
+        """Remplace l'historique par des fichiers Parquet ou CSV (motif glob), sans passer par pandas"""
+        lecteur = 'read_parquet' if motif.endswith('.parquet') else 'read_csv_auto'
+        with self._connexion.cursor() as curseur:
+            curseur.execute(f"CREATE OR REPLACE TABLE {self.table} AS SELECT * FROM {lecteur}(?)", [motif])
+            curseur.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", [f"version_{self.table}", version])
+        return self
+
+    def agregats_mensuels(self):
+        """Recettes, volumes et taux moyen pondéré par secteur × mois (agrégation SQL)"""
+        agregats = self._requete(REQUETE_AGREGATS.format(table=self.table))
+        agregats['date'] = pd.to_datetime(agregats['date']).astype('datetime64[ns]')
+        return agregats[COLONNES]
+
+    def stats(self):
+        lignes = self._requete(f"SELECT count(*) AS n FROM {self.table}")['n'].iloc[0]
+        return {'moteur': self.nom, 'lignes': int(lignes), 'fichier': self.chemin,
+                'memoire': os.path.getsize(self.chemin) if os.path.exists(self.chemin) else 0}
+
+
+def _ouvrir_duckdb(duckdb, version, generer, chemin, table, motif):
+    """Base à jour ouverte en lecture seule ; la table n'est écrite que si sa version manque"""
+    if os.path.exists(chemin):
+        lecture = DuckDBHistory(duckdb, chemin, table)
+        if lecture.version == version:
+            return lecture
+        lecture.fermer()
+
+    ecriture = DuckDBHistory(duckdb, chemin, table, lecture_seule=False)
+    try:
+        if motif:
+            ecriture.importer(motif, version)
+        else:
+            ecriture.charger(generer(), version)
+    finally:
+        ecriture.fermer()
+    return DuckDBHistory(duckdb, chemin, table)
+
+
+def creer_historique(version, generer, backend=BACKEND, chemin=CHEMIN_BASE, table='historique',
+                     partition=None, motif=None):
+    """Historique de la version demandée ; ``generer()`` n'est appelé que s'il faut (re)charger.
+
+    Avec ``motif``, les déclarations sont importées des fichiers correspondants
+    au lieu d'être simulées ; la version doit alors inclure ``signature_import(motif)``.
+    """
+    # Un fichier par partition : l'écriture d'une partition ne bute pas sur les
+    # connexions en lecture seule déjà ouvertes sur les autres
+    chemin = chemin_partition(chemin, partition)
+    if backend == 'duckdb':
+        duckdb = optional_import('duckdb')
+        if duckdb is not None:
+            try:
+                return _ouvrir_duckdb(duckdb, version, generer, chemin, table, motif)
+            except duckdb.Error as erreur:
+                # Base verrouillée en écriture par un autre processus, fichier illisible...
+                logger.warning("Base DuckDB %s indisponible (%s) : historique conservé en mémoire (pandas)",
+                               chemin, erreur)
+        else:
+            logger.warning("duckdb n'est pas installé : historique conservé en mémoire (pandas)")
+    return PandasHistory(lire_fichiers(motif) if motif else generer(), version)
@@ -0,0 +1,128 @@
+# indicateurs.py
+"""Service des indicateurs économiques affichés dans la sidebar.
+
+Les séries (inflation, croissance du PIB, chômage, importations) sont lues
+depuis un fichier local, rechargées au-delà d'une durée de validité (TTL) ou
+si le fichier change, et résumées une seule fois (dernière valeur et
+variation) pour toutes les sessions. Les corrélations avec les recettes de
+l'octroi sont calculées une fois par version des données.
+"""
+import os
+import threading
+import time
+
+import pandas as pd
+
+CHEMIN_INDICATEURS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'data', 'indicateurs_economiques.csv')
+
+INDICATEURS = {
+    'inflation': 'Inflation Réunion',
+    'croissance_pib': 'Croissance PIB',
+    'taux_chomage': 'Taux Chômage',
+    'importations': 'Importations Total'
+}
+
+# Valeurs de repli si le fichier est absent
+VALEURS_DEFAUT = {
+    'inflation': 2.8,
+    'croissance_pib': 3.2,
+    'taux_chomage': 18.5,
+    'importations': 4.8
+}
+
+
+class IndicatorsService:
+    """Indicateurs économiques chargés depuis un fichier local, avec TTL"""
+
+    def __init__(self, chemin=CHEMIN_INDICATEURS, ttl=3600):
+        self.chemin = chemin
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._charge_a = 0.0
+        self._signature = None
+        self._series = None
+        self._resume = None
+        self._correlations = {}
+
+    def _signature_fichier(self):
+        try:
+            etat = os.stat(self.chemin)
+        except OSError:
+            return None
+        return (etat.st_mtime_ns, etat.st_size)
+
+    def _charger(self):
+        """Lit les séries et précalcule les valeurs affichées"""
+        signature = self._signature_fichier()
+        if signature is None:
+            series = pd.DataFrame([dict(VALEURS_DEFAUT, date=pd.Timestamp.now().to_period('M'))])
+        else:
+            series = pd.read_csv(self.chemin, comment='#')
+            series['date'] = pd.PeriodIndex(series['date'], freq='M')
+            series = series.sort_values('date').reset_index(drop=True)
+
+        resume = {}
+        for code, libelle in INDICATEURS.items():
+            valeurs = series[code].dropna() if code in series else pd.Series(dtype=float)
+            if valeurs.empty:
+                valeurs = pd.Series([VALEURS_DEFAUT[code]])
+            resume[libelle] = {
+                'valeur': float(valeurs.iloc[-1]),
+                'variation': float(valeurs.iloc[-1] - valeurs.iloc[-2]) if len(valeurs) > 1 else 0.0
+            }
+
+        self._series = series
+        self._resume = resume
+        self._signature = signature
+        self._charge_a = time.time()
+        self._correlations = {}
+
+    def _rafraichir_si_besoin(self):
+        with self._lock:
+            expire = time.time() - self._charge_a > self.ttl
+            if self._resume is None or (expire and self._signature_fichier() != self._signature):
+                self._charger()
+            elif expire:
+                self._charge_a = time.time()
+
+    @property
+    def version(self):
+        """Version des séries chargées (signature du fichier source)"""
+        self._rafraichir_si_besoin()
+        return f"{self._signature[0]}-{self._signature[1]}" if self._signature else 'defaut'
+
+    def resume(self):
+        """Dernière valeur et variation de chaque indicateur"""
+        self._rafraichir_si_besoin()
+        return self._resume
+
+    def series(self):
+        """Séries mensuelles complètes"""
+        self._rafraichir_si_besoin()
+        return self._series
+
+    def correlations(self, historical_data, data_version):
+        """Corrélation des recettes mensuelles avec chaque indicateur (une fois par version)"""
+        self._rafraichir_si_besoin()
+        cle = (data_version, self.version)
+        with self._lock:
+            if cle in self._correlations:
+                return self._correlations[cle]
+
+        revenus = historical_data.groupby(historical_data['date'].dt.to_period('M'))['revenu_octroi'].sum()
+        jointure = self._series.set_index('date').join(revenus.rename('revenu_octroi'), how='inner')
+        lignes = []
+        for code, libelle in INDICATEURS.items():
+            if code not in jointure:
+                continue
+            lignes.append({
+                'indicateur': libelle,
+                'correlation': jointure['revenu_octroi'].corr(jointure[code]),
+                'mois': int(jointure[[code, 'revenu_octroi']].dropna().shape[0])
+            })
+        correlations = pd.DataFrame(lignes, columns=['indicateur', 'correlation', 'mois'])
+
+        with self._lock:
+            self._correlations[cle] = correlations
+        return correlations
@@ -0,0 +1,224 @@
+# journal.py
+"""Journal d'évènements temps réel par secteur, avec snapshots compactés.
+
+Chaque secteur possède un tampon circulaire (tableaux NumPy) des variations
+reçues et un tampon circulaire de snapshots de niveaux absolus. Tous les
+``snapshot_tous`` évènements, le niveau courant est compacté en snapshot :
+l'état à un instant T se reconstruit à partir du dernier snapshot ≤ T et des
+quelques évènements qui le suivent. La mémoire reste bornée par les capacités
+des deux tampons ; au-delà de la fenêtre d'évènements conservée, la précision
+tombe au pas des snapshots.
+"""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from octroi.sources import agreger_lot
+
+
+class LiveEventLog:
+    """Journal append-only des recettes temps réel, borné en mémoire"""
+
+    def __init__(self, secteurs, capacite=4096, snapshot_tous=256, capacite_snapshots=512):
+        if capacite < 2 * snapshot_tous:
+            raise ValueError("La capacité doit couvrir au moins deux intervalles de snapshot")
+        self.secteurs = list(secteurs)
+        self._index = {secteur: i for i, secteur in enumerate(self.secteurs)}
+        self.capacite = capacite
+        self.snapshot_tous = snapshot_tous
+        self.capacite_snapshots = capacite_snapshots
+        n = len(self.secteurs)
+
+        # Évènements : horodatage et variations (revenu, volume)
+        self._ts = np.zeros((n, capacite))
+        self._revenu = np.zeros((n, capacite))
+        self._volume = np.zeros((n, capacite))
+        self._compte = np.zeros(n, dtype=np.int64)
+
+        # Snapshots : horodatage, niveaux absolus et position dans le journal
+        self._snap_ts = np.zeros((n, capacite_snapshots))
+        self._snap_revenu = np.zeros((n, capacite_snapshots))
+        self._snap_volume = np.zeros((n, capacite_snapshots))
+        self._snap_position = np.zeros((n, capacite_snapshots), dtype=np.int64)
+        self._snap_compte = np.zeros(n, dtype=np.int64)
+
+        self._niveau_revenu = np.zeros(n)
+        self._niveau_volume = np.zeros(n)
+        self._variation_pct = np.zeros(n)
+        self._ouverture_revenu = np.zeros(n)
+        self._ouverture_ts = None
+        self._dernier_ts = 0.0
+        self.ignores = 0
+        self.ticks = 0
+        # Lots effectivement appliqués (les lectures vides ne changent pas l'état)
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ouvert(self):
+        return self._ouverture_ts is not None
+
+    def ouvrir(self, current_data, ts=None):
+        """Enregistre l'état d'ouverture à partir des données courantes"""
+        with self._lock:
+            if self.ouvert:
+                return
+            ts = time.time() if ts is None else ts
+            lignes = current_data.set_index('secteur').reindex(self.secteurs)
+            self._niveau_revenu[:] = lignes['revenu_mensuel'].fillna(0).to_numpy()
+            self._niveau_volume[:] = lignes['volume_importation'].fillna(0).to_numpy()
+            self._variation_pct[:] = lignes['variation_pct'].fillna(0).to_numpy()
+            self._ouverture_revenu[:] = self._niveau_revenu
+            self._ouverture_ts = ts
+            self._dernier_ts = ts
+            for i in range(len(self.secteurs)):
+                self._snapshot(i, ts)
+
+    def enregistrer(self, evenements):
+        """Ajoute un lot d'évènements (regroupés par secteur) au journal"""
+        with self._lock:
+            self.ticks += 1
+            if not evenements:
+                return
+            applique = False
+            for secteur, cumul in agreger_lot(evenements).items():
+                i = self._index.get(secteur)
+                if i is None:
+                    self.ignores += cumul['n']
+                    continue
+                applique = True
+                # Horodatages monotones pour permettre la recherche dichotomique
+                ts = max(cumul['ts'], self._dernier_ts)
+                self._dernier_ts = ts
+
+                position = self._compte[i] % self.capacite
+                self._ts[i, position] = ts
+                self._revenu[i, position] = cumul['revenu']
+                self._volume[i, position] = cumul['volume']
+                self._compte[i] += 1
+
+                ancien = self._niveau_revenu[i]
+                self._niveau_revenu[i] += cumul['revenu']
+                self._niveau_volume[i] += cumul['volume']
+                self._variation_pct[i] = (self._niveau_revenu[i] / ancien - 1) * 100 if ancien else 0.0
+
+                derniere_position = self._snap_position[i, (self._snap_compte[i] - 1) % self.capacite_snapshots]
+                if self._compte[i] - derniere_position >= self.snapshot_tous:
+                    self._snapshot(i, ts)
+            if applique:
+                self.sequence += 1
+
+    def _snapshot(self, i, ts):
+        """Compacte le niveau courant du secteur i en snapshot"""
+        position = self._snap_compte[i] % self.capacite_snapshots
+        self._snap_ts[i, position] = ts
+        self._snap_revenu[i, position] = self._niveau_revenu[i]
+        self._snap_volume[i, position] = self._niveau_volume[i]
+        self._snap_position[i, position] = self._compte[i]
+        self._snap_compte[i] += 1
+
+    def _ordonner(self, tableaux, compte, capacite):
+        """Vue chronologique des tampons circulaires d'un secteur"""
+        if compte <= capacite:
+            return [tableau[:compte] for tableau in tableaux]
+        debut = compte % capacite
+        return [np.concatenate((tableau[debut:], tableau[:debut])) for tableau in tableaux]
+
+    def _evenements(self, i):
+        ts, revenu, volume = self._ordonner(
+            (self._ts[i], self._revenu[i], self._volume[i]), self._compte[i], self.capacite)
+        premiere_position = max(0, self._compte[i] - self.capacite)
+        return ts, revenu, volume, premiere_position
+
+    def _snapshots(self, i):
+        return self._ordonner(
+            (self._snap_ts[i], self._snap_revenu[i], self._snap_volume[i], self._snap_position[i]),
+            self._snap_compte[i], self.capacite_snapshots)
+
+    def _etat_secteur(self, i, ts):
+        snap_ts, snap_revenu, snap_volume, snap_position = self._snapshots(i)
+        k = max(0, np.searchsorted(snap_ts, ts, side='right') - 1)
+        revenu, volume = snap_revenu[k], snap_volume[k]
+
+        ev_ts, ev_revenu, ev_volume, premiere_position = self._evenements(i)
+        if snap_position[k] >= premiere_position:
+            debut = snap_position[k] - premiere_position
+            fin = np.searchsorted(ev_ts, ts, side='right')
+            if fin > debut:
+                revenu += ev_revenu[debut:fin].sum()
+                volume += ev_volume[debut:fin].sum()
+        return revenu, volume
+
+    def etat(self, ts=None):
+        """État par secteur (revenu, volume) au temps ts, courant par défaut.
+
+        Avant le plus ancien snapshot conservé, retourne ce snapshot.
+        """
+        with self._lock:
+            if ts is None or ts >= self._dernier_ts:
+                revenus, volumes = self._niveau_revenu.copy(), self._niveau_volume.copy()
+            else:
+                niveaux = [self._etat_secteur(i, ts) for i in range(len(self.secteurs))]
+                revenus = np.array([niveau[0] for niveau in niveaux])
+                volumes = np.array([niveau[1] for niveau in niveaux])
+            variations = self._variation_pct.copy()
+        return pd.DataFrame({
+            'secteur': self.secteurs,
+            'revenu_mensuel': revenus,
+            'volume_importation': volumes,
+            'variation_pct': variations
+        })
+
+    def appliquer(self, current_data):
+        """Reporte l'état courant du journal dans les données courantes (en place)"""
+        etat = self.etat().set_index('secteur')
+        secteurs = current_data['secteur']
+        current_data['revenu_mensuel'] = secteurs.map(etat['revenu_mensuel']).to_numpy()
+        current_data['volume_importation'] = secteurs.map(etat['volume_importation']).to_numpy()
+        current_data['variation_pct'] = secteurs.map(etat['variation_pct']).to_numpy()
+        current_data['variation_abs'] = current_data['revenu_mensuel'] - current_data['revenu_annee_precedente']
+        return current_data
+
+    def serie(self, secteur, points=60):
+        """Série intraday des revenus d'un secteur (snapshots + évènements conservés)"""
+        i = self._index[secteur]
+        with self._lock:
+            ev_ts, ev_revenu, _, premiere_position = self._evenements(i)
+            snap_ts, snap_revenu, _, snap_position = self._snapshots(i)
+            courant = self._niveau_revenu[i]
+        # Niveau après chaque évènement conservé, reconstruit depuis le niveau courant
+        niveaux = courant - (ev_revenu.sum() - np.cumsum(ev_revenu))
+        anciens = snap_position <= premiere_position
+        ts = np.concatenate((snap_ts[anciens], ev_ts))
+        revenus = np.concatenate((snap_revenu[anciens], niveaux))
+        if len(ts) == 0:
+            ts, revenus = np.array([self._ouverture_ts]), np.array([courant])
+        if points and len(ts) > points:
+            selection = np.linspace(0, len(ts) - 1, points).astype(int)
+            ts, revenus = ts[selection], revenus[selection]
+        return ts, revenus
+
+    def tendances(self, points=60):
+        """Tendance de chaque secteur depuis l'ouverture, avec sparkline"""
+        with self._lock:
+            ouverture = self._ouverture_revenu.copy()
+            courant = self._niveau_revenu.copy()
+            evenements = self._compte.copy()
+        variation = np.divide(courant - ouverture, ouverture,
+                              out=np.zeros_like(courant), where=ouverture != 0) * 100
+        return pd.DataFrame({
+            'secteur': self.secteurs,
+            'revenu_ouverture': ouverture,
+            'revenu_courant': courant,
+            'variation_ouverture_pct': variation,
+            'evenements': evenements,
+            'tendance': [list(self.serie(secteur, points)[1]) for secteur in self.secteurs]
+        })
+
+    def memoire(self):
+        """Octets occupés par les tampons du journal"""
+        return sum(tableau.nbytes for tableau in (
+            self._ts, self._revenu, self._volume, self._snap_ts,
+            self._snap_revenu, self._snap_volume, self._snap_position))
@@ -0,0 +1,88 @@
+# lazy.py
+"""Imports à la demande et budget de temps d'import.
+
+Les pages et les bibliothèques lourdes optionnelles ne sont importées qu'au
+moment où elles servent. Chaque premier import est chronométré ; au-delà du
+budget (``OCTROI_IMPORT_BUDGET_MS``), un avertissement est journalisé.
+
+Contrôle à froid (un interpréteur neuf par module, où Streamlit, pandas et
+NumPy sont déjà chargés comme dans l'application ; code retour non nul si un
+module dépasse le budget) :
+
+    python -m octroi.lazy
+"""
+import argparse
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BUDGET_MS = float(os.environ.get('OCTROI_IMPORT_BUDGET_MS', '500'))
+
+# Modules toujours chargés par l'application, exclus de la mesure
+MODULES_SOCLE = ('streamlit', 'pandas', 'numpy')
+
+# Durées des premiers imports effectués par ce processus (ms)
+durees_import = {}
+
+
+def import_module(nom, budget_ms=None):
+    """Importe un module en chronométrant son premier chargement"""
+    if nom in sys.modules:
+        # importlib attend la fin d'un import en cours dans une autre session
+        # (un module encore partiellement initialisé ne doit pas être retourné)
+        return importlib.import_module(nom)
+    budget_ms = IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    debut = time.perf_counter()
+    module = importlib.import_module(nom)
+    duree = (time.perf_counter() - debut) * 1000
+    durees_import[nom] = duree
+    if duree > budget_ms:
+        logger.warning("Import de %s en %.0f ms (budget %.0f ms)", nom, duree, budget_ms)
+    return module
+
+
+def optional_import(nom, budget_ms=None):
+    """Importe une dépendance optionnelle, None si elle n'est pas installée"""
+    try:
+        return import_module(nom, budget_ms)
+    except ImportError:
+        return None
+
+
+def mesurer_import_a_froid(nom):
+    """Durée d'import (ms) d'un module dans un interpréteur neuf, socle déjà chargé"""
+    code = ("import {0}; import time; t = time.perf_counter(); import {1}; "
+            "print((time.perf_counter() - t) * 1000)").format(', '.join(MODULES_SOCLE), nom)
+    resultat = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if resultat.returncode != 0:
+        raise ImportError(resultat.stderr.strip().splitlines()[-1])
+    return float(resultat.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Vérifie le budget d'import à froid des pages et du cœur du dashboard"""
+    from octroi.navigation import PAGES
+
+    parser = argparse.ArgumentParser(description="Contrôle du temps d'import à froid")
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('modules', nargs='*', help="modules à mesurer (défaut: cœur et pages)")
+    args = parser.parse_args()
+
+    modules = args.modules or ['octroi.dashboard'] + sorted({page['module'] for page in PAGES})
+    depassements = 0
+    for nom in modules:
+        duree = mesurer_import_a_froid(nom)
+        statut = 'OK' if duree <= args.budget_ms else 'DÉPASSEMENT'
+        depassements += duree > args.budget_ms
+        print(f"{nom:<32} {duree:>8.0f} ms  {statut}")
+    sys.exit(1 if depassements else 0)
+
+
+if __name__ == "__main__":
+    main()
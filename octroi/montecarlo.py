@@ -0,0 +1,101 @@
+# montecarlo.py
+"""Projections Monte Carlo des recettes et bandes d'incertitude (P10/P50/P90).
+
+Chaque chemin projette la recette d'un secteur à partir du même mois de
+l'année précédente :
+
+    log R[t] = log R[t - 12] + g + ε[t]
+
+La croissance annuelle g est tirée une fois par chemin autour de la
+croissance récente du secteur (incertitude sur la tendance) ; le bruit
+saisonnier ε est ré-échantillonné parmi les résidus des variations sur un
+an, par mois entier, ce qui conserve la corrélation entre secteurs. La
+calibration ne porte que sur les ``FENETRE_CALIBRATION`` derniers mois :
+une rupture ancienne (chute de 2020 puis rattrapage de 2021) ne doit pas
+fixer la tendance projetée. Avec 12 mois d'historique seulement (aucune
+variation sur un an), la croissance est nulle et les chemins reproduisent la
+dernière année ; en deçà de 12 mois, la projection est impossible.
+
+Les chemins sont simulés par blocs (chemins × secteurs × mois) pour borner
+la mémoire ; seuls les totaux nécessaires aux centiles sont conservés.
+"""
+import numpy as np
+import pandas as pd
+
+N_CHEMINS = 10000
+TAILLE_BLOC = 2000
+CENTILES = (10, 50, 90)
+# Variations sur un an retenues pour la calibration (mois les plus récents)
+FENETRE_CALIBRATION = 36
+
+
+class MonteCarloProjection:
+    """Simulation vectorisée de chemins de recettes par secteur"""
+
+    def __init__(self, cube, rng, horizon=12, n_chemins=N_CHEMINS, taille_bloc=TAILLE_BLOC,
+                 fenetre=FENETRE_CALIBRATION):
+        self.secteurs = list(cube.membres['secteur'])
+        self.horizon = horizon
+        self.n_chemins = n_chemins
+        self.dates = pd.date_range(cube.dates[-1], periods=horizon + 1, freq='MS')[1:]
+
+        # Calibration sur les variations sur un an (log) des derniers mois de l'historique
+        historique = np.log(np.maximum(cube.valeurs('secteur', 'revenu'), 1.0))
+        if historique.shape[1] < 12:
+            raise ValueError(f"Projection impossible : {historique.shape[1]} mois d'historique, 12 au minimum")
+        variations = (historique[:, 12:] - historique[:, :-12])[:, -fenetre:]
+        if variations.shape[1] == 0:
+            # Aucune variation sur un an : croissance nulle, sans bruit
+            variations = np.zeros((historique.shape[0], 1))
+        self.croissance = variations.mean(axis=1)
+        residus = variations - self.croissance[:, None]
+        # Erreur type de la croissance moyenne (variations mensuelles recouvrantes : ~1 observation par an)
+        annees_effectives = max(variations.shape[1] / 12, 1.0)
+        self.incertitude_croissance = residus.std(axis=1) / np.sqrt(annees_effectives)
+        # Bruits centrés en niveau (E[exp(ε)] = 1) : sans correction, la somme de
+        # log-normales place la médiane du total au-dessus de la tendance
+        self.residus = residus - np.log(np.exp(residus).mean(axis=1))[:, None]
+        self.derive = self.croissance - self.incertitude_croissance ** 2 / 2
+        self.base = historique[:, -12:]
+
+        # Totaux conservés pour les centiles
+        self.total_mensuel = np.empty((n_chemins, horizon))
+        self.annuel_secteur = np.empty((n_chemins, len(self.secteurs)))
+        for debut in range(0, n_chemins, taille_bloc):
+            fin = min(debut + taille_bloc, n_chemins)
+            chemins = self._simuler(rng, fin - debut)
+            self.total_mensuel[debut:fin] = chemins.sum(axis=1)
+            self.annuel_secteur[debut:fin] = chemins[:, :, :12].sum(axis=2)
+        self.total_annuel = self.annuel_secteur.sum(axis=1)
+
+    def _simuler(self, rng, n):
+        """Bloc de n chemins : tableau chemins × secteurs × mois"""
+        n_secteurs = len(self.secteurs)
+        croissance = self.derive + rng.standard_normal((n, n_secteurs)) * self.incertitude_croissance
+        tirages = rng.integers(0, self.residus.shape[1], size=(n, self.horizon))
+        bruit = self.residus[:, tirages].transpose(1, 0, 2)
+
+        log_chemins = np.empty((n, n_secteurs, self.horizon))
+        for annee in range(0, self.horizon, 12):
+            # Chaque année projetée repart de l'année précédente (historique ou simulée)
+            mois = slice(annee, min(annee + 12, self.horizon))
+            largeur = mois.stop - mois.start
+            precedente = self.base[None, :, :largeur] if annee == 0 else log_chemins[:, :, annee - 12:annee - 12 + largeur]
+            log_chemins[:, :, mois] = precedente + croissance[:, :, None] + bruit[:, :, mois]
+        return np.exp(log_chemins)
+
+    def bandes(self, centiles=CENTILES):
+        """Centiles de la recette totale mensuelle (une colonne par centile)"""
+        valeurs = np.percentile(self.total_mensuel, centiles, axis=0)
+        return pd.DataFrame({f'p{c}': v for c, v in zip(centiles, valeurs)}, index=pd.Index(self.dates, name='date'))
+
+    def annuel(self, centiles=CENTILES):
+        """Centiles de la recette des 12 prochains mois"""
+        return dict(zip((f'p{c}' for c in centiles), np.percentile(self.total_annuel, centiles)))
+
+    def par_secteur(self, centiles=CENTILES):
+        """Centiles de la recette des 12 prochains mois par secteur"""
+        valeurs = np.percentile(self.annuel_secteur, centiles, axis=0)
+        tableau = pd.DataFrame({f'p{c}': v for c, v in zip(centiles, valeurs)})
+        tableau.insert(0, 'secteur', self.secteurs)
+        return tableau
@@ -0,0 +1,38 @@
+# navigation.py
+"""Structure multi-pages : chaque page n'importe son module qu'à l'affichage"""
+import streamlit as st
+
+from octroi.lazy import import_module
+
+PAGES = [
+    {'module': 'octroi.vues.vue_ensemble', 'fonction': 'create_octroi_overview',
+     'titre': "Vue d'Ensemble", 'icone': '📈', 'url': 'vue-ensemble', 'defaut': True},
+    {'module': 'octroi.vues.secteurs', 'fonction': 'create_secteurs_live',
+     'titre': 'Secteurs', 'icone': '🏢', 'url': 'secteurs'},
+    {'module': 'octroi.vues.categories', 'fonction': 'create_categorie_analysis',
+     'titre': 'Catégories', 'icone': '📊', 'url': 'categories'},
+    {'module': 'octroi.vues.evolution', 'fonction': 'create_evolution_analysis',
+     'titre': 'Évolution', 'icone': '📉', 'url': 'evolution'},
+    {'module': 'octroi.vues.territoires', 'fonction': 'create_comparaison_territoires',
+     'titre': 'Territoires', 'icone': '🌍', 'url': 'territoires'},
+    {'module': 'octroi.vues.carte', 'fonction': 'create_carte_communes',
+     'titre': 'Communes', 'icone': '🗺️', 'url': 'communes'},
+    {'module': 'octroi.vues.insights', 'fonction': 'create_insights',
+     'titre': 'Insights', 'icone': '💡', 'url': 'insights'},
+    {'module': 'octroi.vues.insights', 'fonction': 'create_a_propos',
+     'titre': 'À Propos', 'icone': 'ℹ️', 'url': 'a-propos'},
+]
+
+
+def _page(dashboard, page):
+    def afficher():
+        module = import_module(page['module'])
+        getattr(module, page['fonction'])(dashboard)
+    afficher.__name__ = page['fonction']
+    return st.Page(afficher, title=page['titre'], icon=page['icone'],
+                   url_path=page['url'], default=page.get('defaut', False))
+
+
+def build_navigation(dashboard):
+    """Navigation Streamlit ; seule la page sélectionnée est importée et calculée"""
+    return st.navigation([_page(dashboard, page) for page in PAGES], position='top')
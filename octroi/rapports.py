@@ -0,0 +1,333 @@
+# rapports.py
+"""Rapports mensuels (Excel multi-feuilles, PDF) générés en arrière-plan.
+
+Les rapports reprennent les tableaux, graphiques et projections des pages
+Vue d'Ensemble, Catégories et Évolution, à partir des agrégats de
+l'historique (cube, comparaisons, projections) : leur contenu ne dépend que
+du type de rapport, des filtres et de la version des données.
+
+Les demandes sont placées dans une file traitée par un pool de threads :
+l'exécution du script Streamlit n'attend jamais la génération. Une demande
+identique (type, format, filtres, version) réutilise le job en cours ou
+l'artefact déjà écrit dans ``OCTROI_REPORTS_DIR``, téléchargeable
+immédiatement. Les artefacts sont écrits dans un fichier temporaire puis
+renommés : un fichier présent est toujours complet.
+
+Excel nécessite openpyxl (``pip install openpyxl``), le PDF matplotlib.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from octroi.lazy import optional_import
+
+logger = logging.getLogger(__name__)
+
+DOSSIER_RAPPORTS = os.environ.get(
+    'OCTROI_REPORTS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'rapports')
+)
+WORKERS = int(os.environ.get('OCTROI_REPORT_WORKERS', 2))
+# Artefacts plus anciens supprimés au démarrage (jours)
+AGE_MAX_JOURS = float(os.environ.get('OCTROI_REPORTS_MAX_AGE_DAYS', '90'))
+# Lignes de tableau reproduites sur une page PDF (le classeur Excel est complet)
+LIGNES_PDF = 24
+
+FORMATS = {
+    'xlsx': {'nom': 'Excel', 'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'},
+    'pdf': {'nom': 'PDF', 'mime': 'application/pdf'},
+}
+
+
+def _periode_comparaison(comparaisons, filtres):
+    """Dernier mois de la période filtrée présent dans l'historique"""
+    if not filtres.get('fin'):
+        return None
+    return min(pd.Period(filtres['fin'], freq='M'), comparaisons.periodes[-1])
+
+
+def _categories_secteurs(cube):
+    return {secteur: categorie for categorie in cube.membres['categorie']
+            for secteur in cube.enfants('categorie', categorie)}
+
+
+def _retenir(tableau, colonne, filtres):
+    """Lignes des catégories retenues par les filtres"""
+    if not filtres.get('categories'):
+        return tableau.reset_index(drop=True)
+    return tableau[tableau[colonne].isin(filtres['categories'])].reset_index(drop=True)
+
+
+def _mensuel_categories(cube, filtres):
+    coupe = _retenir(cube.slice('categorie', None, 'revenu', filtres.get('debut'), filtres.get('fin')),
+                     'categorie', filtres)
+    return coupe.pivot(index='date', columns='categorie', values='revenu').reset_index().rename_axis(columns=None)
+
+
+def _tableau_secteurs(sources, filtres):
+    tableau = sources['comparaisons'].tableau('secteur', periode=_periode_comparaison(sources['comparaisons'], filtres))
+    tableau.insert(1, 'categorie', tableau['secteur'].map(_categories_secteurs(sources['cube'])))
+    return _retenir(tableau, 'categorie', filtres)
+
+
+def sections_vue_ensemble(sources, filtres):
+    """Synthèse, évolution des recettes, secteurs et catégories"""
+    cube, comparaisons = sources['cube'], sources['comparaisons']
+    periode = _periode_comparaison(comparaisons, filtres)
+    total = comparaisons.comparer('total', periode=periode)
+    annuel = sources['projections'].annuel()
+    synthese = pd.DataFrame([
+        ('Revenu du mois (€)', total['valeur']),
+        ('Variation vs N-1 (%)', total['yoy_pct']),
+        ('Variation vs M-1 (%)', total['mom_pct']),
+        ('Cumul annuel (€)', total['ytd']),
+        ('Cumul vs N-1 (%)', total['ytd_pct']),
+        ('Projection 12 mois P10 (€)', annuel['p10']),
+        ('Projection 12 mois P50 (€)', annuel['p50']),
+        ('Projection 12 mois P90 (€)', annuel['p90']),
+    ], columns=['indicateur', 'valeur'])
+    evolution = cube.serie('total', debut=filtres.get('debut'), fin=filtres.get('fin')).rename_axis('date').reset_index()
+    categories = _retenir(comparaisons.tableau('categorie', periode=periode), 'categorie', filtres)
+    return [
+        {'titre': 'Synthèse', 'donnees': synthese},
+        {'titre': 'Évolution Revenus', 'donnees': evolution,
+         'graphique': {'type': 'ligne', 'x': 'date', 'y': ['revenu']}},
+        {'titre': 'Secteurs', 'donnees': _tableau_secteurs(sources, filtres),
+         'graphique': {'type': 'barres', 'x': 'secteur', 'y': ['valeur']}},
+        {'titre': 'Catégories', 'donnees': categories,
+         'graphique': {'type': 'barres', 'x': 'categorie', 'y': ['yoy_pct']}},
+    ]
+
+
+def sections_categories(sources, filtres):
+    """Performance, évolution comparée, secteurs et saisonnalité des catégories"""
+    comparaisons = sources['comparaisons']
+    categories = _retenir(comparaisons.tableau('categorie', periode=_periode_comparaison(comparaisons, filtres)),
+                          'categorie', filtres)
+    mensuel = _mensuel_categories(sources['cube'], filtres)
+    saisonnalite = mensuel.drop(columns='date').groupby(mensuel['date'].dt.month.rename('mois')).mean().reset_index()
+    secteurs = _tableau_secteurs(sources, filtres).sort_values(['categorie', 'valeur'], ascending=[True, False])
+    return [
+        {'titre': 'Performance Catégories', 'donnees': categories,
+         'graphique': {'type': 'barres', 'x': 'categorie', 'y': ['valeur']}},
+        {'titre': 'Évolution Catégories', 'donnees': mensuel,
+         'graphique': {'type': 'ligne', 'x': 'date', 'y': list(mensuel.columns[1:])}},
+        {'titre': 'Secteurs par Catégorie', 'donnees': secteurs.reset_index(drop=True)},
+        {'titre': 'Saisonnalité', 'donnees': saisonnalite,
+         'graphique': {'type': 'ligne', 'x': 'mois', 'y': list(saisonnalite.columns[1:])}},
+    ]
+
+
+def sections_evolution(sources, filtres):
+    """Historique, grille annuelle, projections Monte Carlo et comparaisons"""
+    cube, projections = sources['cube'], sources['projections']
+    debut, fin = filtres.get('debut'), filtres.get('fin')
+    historique = pd.DataFrame({
+        'revenu': cube.serie('total', debut=debut, fin=fin),
+        'volume': cube.serie('total', mesure='volume', debut=debut, fin=fin)
+    }).rename_axis('date').reset_index()
+    historique['revenu_cumule'] = historique['revenu'].cumsum()
+    grille = cube.heatmap('total').reset_index()
+    grille.columns = ['annee'] + [f'M{mois:02d}' for mois in grille.columns[1:]]
+    par_secteur = projections.par_secteur()
+    par_secteur.insert(1, 'categorie', par_secteur['secteur'].map(_categories_secteurs(cube)))
+    return [
+        {'titre': 'Historique', 'donnees': historique,
+         'graphique': {'type': 'ligne', 'x': 'date', 'y': ['revenu']}},
+        {'titre': 'Revenus par Année', 'donnees': grille},
+        {'titre': 'Projections', 'donnees': projections.bandes().reset_index(),
+         'graphique': {'type': 'ligne', 'x': 'date', 'y': ['p10', 'p50', 'p90']}},
+        {'titre': 'Projections Secteurs', 'donnees': _retenir(par_secteur, 'categorie', filtres),
+         'graphique': {'type': 'barres', 'x': 'secteur', 'y': ['p50']}},
+        {'titre': 'Comparaisons', 'donnees': _tableau_secteurs(sources, filtres),
+         'graphique': {'type': 'barres', 'x': 'secteur', 'y': ['yoy_pct']}},
+    ]
+
+
+RAPPORTS = {
+    'vue_ensemble': {'titre': "Vue d'Ensemble", 'sections': sections_vue_ensemble},
+    'categories': {'titre': 'Catégories', 'sections': sections_categories},
+    'evolution': {'titre': 'Évolution', 'sections': sections_evolution},
+}
+
+
+def ecrire_excel(sections, chemin, entete):
+    """Classeur multi-feuilles : une feuille par section, graphique natif Excel si prévu"""
+    if optional_import('openpyxl') is None:
+        raise RuntimeError("Export Excel indisponible : openpyxl n'est pas installé (pip install openpyxl)")
+    from openpyxl.chart import BarChart, LineChart, Reference
+    from openpyxl.utils import get_column_letter
+
+    with pd.ExcelWriter(chemin, engine='openpyxl') as writer:
+        pd.DataFrame(list(entete.items())).to_excel(writer, sheet_name='Rapport', index=False, header=False)
+        writer.sheets['Rapport'].column_dimensions['A'].width = 24
+        writer.sheets['Rapport'].column_dimensions['B'].width = 48
+        for section in sections:
+            donnees, nom = section['donnees'], section['titre'][:31]
+            donnees.to_excel(writer, sheet_name=nom, index=False)
+            feuille = writer.sheets[nom]
+            for j in range(1, len(donnees.columns) + 1):
+                feuille.column_dimensions[get_column_letter(j)].width = 18
+            graphique = section.get('graphique')
+            if not graphique or donnees.empty:
+                continue
+            colonnes = list(donnees.columns)
+            diagramme = LineChart() if graphique['type'] == 'ligne' else BarChart()
+            diagramme.title = section['titre']
+            diagramme.width, diagramme.height = 24, 12
+            for y in graphique['y']:
+                colonne = colonnes.index(y) + 1
+                diagramme.add_data(Reference(feuille, min_col=colonne, min_row=1, max_row=len(donnees) + 1),
+                                   titles_from_data=True)
+            x = colonnes.index(graphique['x']) + 1
+            diagramme.set_categories(Reference(feuille, min_col=x, min_row=2, max_row=len(donnees) + 1))
+            feuille.add_chart(diagramme, f"{get_column_letter(len(colonnes) + 2)}2")
+
+
+def _formater(valeur):
+    if isinstance(valeur, (pd.Timestamp, datetime, date)):
+        return f"{valeur:%m/%Y}"
+    if isinstance(valeur, (float, np.floating)):
+        if np.isnan(valeur):
+            return '-'
+        return f"{valeur:,.0f}" if abs(valeur) >= 100 else f"{valeur:,.2f}"
+    return str(valeur)
+
+
+def ecrire_pdf(sections, chemin, entete):
+    """Rapport statique : page de garde, puis graphique et tableau par section"""
+    if optional_import('matplotlib') is None:
+        raise RuntimeError("Export PDF indisponible : matplotlib n'est pas installé")
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    # Figures créées sans pyplot : rendu sûr hors du thread principal
+    with PdfPages(chemin, metadata={'Title': entete['Rapport'], 'Subject': entete['Territoire']}) as pdf:
+        garde = Figure(figsize=(11.69, 8.27))
+        garde.text(0.08, 0.8, f"Octroi de Mer - {entete['Rapport']}", fontsize=24, weight='bold')
+        for i, (cle, valeur) in enumerate(entete.items()):
+            garde.text(0.08, 0.68 - i * 0.05, f"{cle} : {valeur}", fontsize=13)
+        pdf.savefig(garde)
+
+        for section in sections:
+            donnees, graphique = section['donnees'], section.get('graphique')
+            page = Figure(figsize=(11.69, 8.27))
+            page.suptitle(section['titre'], fontsize=16, weight='bold')
+            if graphique and not donnees.empty:
+                axe = page.add_axes([0.08, 0.5, 0.88, 0.4])
+                x = donnees[graphique['x']].astype(str) if graphique['type'] == 'barres' else donnees[graphique['x']]
+                for i, y in enumerate(graphique['y']):
+                    if graphique['type'] == 'ligne':
+                        axe.plot(x, donnees[y], label=str(y))
+                    else:
+                        largeur = 0.8 / len(graphique['y'])
+                        axe.bar(np.arange(len(x)) + i * largeur, donnees[y], width=largeur, label=str(y))
+                if graphique['type'] == 'barres':
+                    axe.set_xticks(np.arange(len(x)), x, rotation=30, ha='right', fontsize=8)
+                if len(graphique['y']) > 1:
+                    axe.legend(fontsize=8)
+                axe.grid(alpha=0.3)
+                cadre_tableau = [0.04, 0.03, 0.92, 0.36]
+            else:
+                cadre_tableau = [0.04, 0.05, 0.92, 0.82]
+            axe_tableau = page.add_axes(cadre_tableau)
+            axe_tableau.axis('off')
+            extrait = donnees.head(LIGNES_PDF // (2 if graphique else 1))
+            if not extrait.empty:
+                tableau = axe_tableau.table(cellText=[[_formater(v) for v in ligne] for ligne in extrait.to_numpy()],
+                                            colLabels=[str(colonne) for colonne in extrait.columns],
+                                            loc='upper center', cellLoc='right')
+                tableau.auto_set_font_size(False)
+                tableau.set_fontsize(7)
+            if len(donnees) > len(extrait):
+                axe_tableau.set_title(f"{len(extrait)} premières lignes sur {len(donnees)}", fontsize=8, loc='left')
+            pdf.savefig(page)
+
+
+ECRITURES = {'xlsx': ecrire_excel, 'pdf': ecrire_pdf}
+
+
+class ReportJobs:
+    """File de génération des rapports et cache disque des artefacts"""
+
+    def __init__(self, dossier=DOSSIER_RAPPORTS, workers=WORKERS, age_max_jours=AGE_MAX_JOURS):
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='octroi-rapports')
+        self._jobs = {}
+        self._verrou = threading.Lock()
+        self.purger(age_max_jours)
+
+    def cle(self, type_rapport, format_rapport, filtres, version):
+        """Identifiant (et nom de fichier) d'un rapport"""
+        empreinte = hashlib.sha1(json.dumps([type_rapport, format_rapport, filtres, version],
+                                            sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+        return f"{type_rapport}_{version}_{empreinte}.{format_rapport}"
+
+    def chemin(self, cle):
+        return os.path.join(self.dossier, cle)
+
+    def soumettre(self, type_rapport, format_rapport, filtres, version, sources, entete):
+        """Place un rapport dans la file (sans doublon) et retourne sa clé"""
+        cle = self.cle(type_rapport, format_rapport, filtres, version)
+        with self._verrou:
+            job = self._jobs.get(cle)
+            en_vie = job is not None and not (job.done() and job.exception() is not None)
+            if not en_vie and not os.path.exists(self.chemin(cle)):
+                self._jobs[cle] = self._executor.submit(
+                    self._generer, cle, type_rapport, format_rapport, filtres, sources, entete)
+        return cle
+
+    def etat(self, cle):
+        """'termine', 'en_cours', 'en_attente', 'erreur' ou 'inconnu'"""
+        if os.path.exists(self.chemin(cle)):
+            return 'termine'
+        job = self._jobs.get(cle)
+        if job is None:
+            return 'inconnu'
+        if job.done():
+            return 'erreur' if job.exception() is not None else 'termine'
+        return 'en_cours' if job.running() else 'en_attente'
+
+    def erreur(self, cle):
+        job = self._jobs.get(cle)
+        return str(job.exception()) if job is not None and job.done() and job.exception() else None
+
+    def lire(self, cle):
+        with open(self.chemin(cle), 'rb') as fichier:
+            return fichier.read()
+
+    def _generer(self, cle, type_rapport, format_rapport, filtres, sources, entete):
+        debut = time.perf_counter()
+        sections = RAPPORTS[type_rapport]['sections'](sources, filtres)
+        # Temporaire caché, même extension (le moteur Excel la vérifie)
+        temporaire = os.path.join(self.dossier, f".{threading.get_ident()}.{cle}")
+        try:
+            ECRITURES[format_rapport](sections, temporaire, entete)
+            os.replace(temporaire, self.chemin(cle))
+        finally:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+        logger.info("Rapport %s généré en %.1f s", cle, time.perf_counter() - debut)
+        return self.chemin(cle)
+
+    def purger(self, age_max_jours):
+        """Supprime les artefacts trop anciens et les fichiers temporaires abandonnés"""
+        maintenant = time.time()
+        for nom in os.listdir(self.dossier):
+            chemin = os.path.join(self.dossier, nom)
+            # Un temporaire récent peut appartenir à une génération en cours (autre processus)
+            age_max = 1 / 24 if nom.startswith('.') else age_max_jours
+            if os.path.getmtime(chemin) < maintenant - age_max * 86400:
+                try:
+                    os.remove(chemin)
+                except OSError:
+                    pass
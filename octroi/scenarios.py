@@ -0,0 +1,152 @@
+# scenarios.py
+"""Moteur de scénarios de taux (« what-if ») sur l'historique et l'horizon projeté.
+
+Un scénario modifie le taux normal de certains secteurs (en points) et peut
+fixer une élasticité-prix des volumes importés. Pour K scénarios, S secteurs
+et T + H mois, les recettes sont recalculées en une seule opération NumPy
+sur un tableau K × S × (T + H) :
+
+    facteur = (taux + Δ) / taux × (1 + élasticité × Δ / (100 + taux))
+
+Le second terme traduit la baisse (ou hausse) des volumes quand le prix
+toutes taxes d'un produit importé varie de Δ / (100 + taux).
+"""
+import numpy as np
+import pandas as pd
+
+SCENARIO_REFERENCE = 'Référence'
+
+
+class ScenarioEngine:
+    """Recalcul vectorisé des recettes pour un ensemble de scénarios de taux"""
+
+    def __init__(self, cube, historical_data, secteurs, horizon=12):
+        self.secteurs = list(secteurs)
+        self.horizon = horizon
+        self.dates_historique = cube.dates
+        self.dates_projection = pd.date_range(cube.dates[-1], periods=horizon + 1, freq='MS')[1:]
+        self.dates = self.dates_historique.append(self.dates_projection)
+        n_secteurs, n_mois = len(self.secteurs), len(cube.dates)
+
+        # Recettes et taux moyens (pondérés par la recette) par secteur × mois
+        historique = cube.valeurs('secteur', 'revenu')
+        i_secteur = historical_data['secteur'].map({s: i for i, s in enumerate(self.secteurs)}).to_numpy()
+        i_mois = cube.dates.get_indexer(historical_data['date'].dt.to_period('M').dt.to_timestamp())
+        cellule = i_secteur * n_mois + i_mois
+        ponderation = np.bincount(cellule, weights=historical_data['revenu_octroi'].to_numpy(),
+                                  minlength=n_secteurs * n_mois)
+        taux_ponderes = np.bincount(cellule, weights=(historical_data['taux_moyen'] * historical_data['revenu_octroi']).to_numpy(),
+                                    minlength=n_secteurs * n_mois)
+        taux_normaux = np.array([secteurs[s]['taux_normal'] for s in self.secteurs])
+        taux_historique = np.divide(taux_ponderes, ponderation,
+                                    out=np.repeat(taux_normaux, n_mois).astype(float),
+                                    where=ponderation > 0).reshape(n_secteurs, n_mois)
+
+        # Projection de référence : même mois N-1 × croissance sur 12 mois glissants
+        douze_derniers = historique[:, -12:].sum(axis=1)
+        douze_precedents = historique[:, -24:-12].sum(axis=1)
+        croissance = np.clip(np.divide(douze_derniers, douze_precedents, out=np.ones(n_secteurs),
+                                       where=douze_precedents > 0) - 1, -0.2, 0.2)
+        mois_futurs = np.arange(horizon)
+        base_saisonniere = historique[:, n_mois - 12 + mois_futurs % 12]
+        projection = base_saisonniere * (1 + croissance)[:, None] ** (1 + mois_futurs[None, :] // 12)
+
+        self.recettes = np.concatenate((historique, projection), axis=1)
+        self.taux = np.concatenate((taux_historique, np.repeat(taux_normaux[:, None], horizon, axis=1)), axis=1)
+        self.n_historique = n_mois
+
+    def _matrices(self, scenarios):
+        """Écarts de taux et élasticités par scénario × secteur"""
+        deltas = np.zeros((len(scenarios), len(self.secteurs)))
+        elasticites = np.zeros_like(deltas)
+        position = {secteur: i for i, secteur in enumerate(self.secteurs)}
+        for k, scenario in enumerate(scenarios):
+            for secteur, delta in scenario.get('taux', {}).items():
+                deltas[k, position[secteur]] = delta
+            for secteur, elasticite in scenario.get('elasticites', {}).items():
+                elasticites[k, position[secteur]] = elasticite
+        return deltas, elasticites
+
+    def evaluer(self, scenarios):
+        """Recettes K × S × (T + H) de chaque scénario ; la référence est ajoutée en tête"""
+        scenarios = [{'nom': SCENARIO_REFERENCE}] + list(scenarios)
+        deltas, elasticites = self._matrices(scenarios)
+        delta = deltas[:, :, None]
+        taux = np.broadcast_to(self.taux, (len(scenarios),) + self.taux.shape)
+        nouveaux_taux = np.maximum(taux + delta, 0.0)
+        facteur = np.divide(nouveaux_taux, taux, out=np.ones_like(nouveaux_taux), where=taux > 0)
+        facteur *= np.maximum(1 + elasticites[:, :, None] * (nouveaux_taux - taux) / (100 + taux), 0.0)
+        return ScenarioResults([scenario['nom'] for scenario in scenarios], self, self.recettes[None] * facteur)
+
+
+class ScenarioResults:
+    """Résultats d'un ensemble de scénarios, comparés à la référence"""
+
+    def __init__(self, noms, moteur, recettes):
+        self.noms = noms
+        self.moteur = moteur
+        self.recettes = recettes
+
+    @property
+    def nbytes(self):
+        """Empreinte propre des résultats (le moteur est partagé)"""
+        return self.recettes.nbytes
+
+    def synthese(self):
+        """Recettes et écarts à la référence, historique et projection"""
+        n = self.moteur.n_historique
+        historique = self.recettes[:, :, :n].sum(axis=(1, 2))
+        projection = self.recettes[:, :, n:].sum(axis=(1, 2))
+        return pd.DataFrame({
+            'scenario': self.noms,
+            'revenu_historique': historique,
+            'ecart_historique': historique - historique[0],
+            'ecart_historique_pct': (historique / historique[0] - 1) * 100,
+            'revenu_projete': projection,
+            'ecart_projete': projection - projection[0],
+            'ecart_projete_pct': (projection / projection[0] - 1) * 100
+        })
+
+    def par_secteur(self, periode='projection'):
+        """Écart à la référence par scénario et secteur (format long)"""
+        n = self.moteur.n_historique
+        bloc = self.recettes[:, :, n:] if periode == 'projection' else self.recettes[:, :, :n]
+        totaux = bloc.sum(axis=2)
+        ecarts = totaux - totaux[0]
+        return pd.DataFrame({
+            'scenario': np.repeat(self.noms, len(self.moteur.secteurs)),
+            'secteur': np.tile(self.moteur.secteurs, len(self.noms)),
+            'revenu': totaux.ravel(),
+            'ecart': ecarts.ravel()
+        })
+
+    def mensuel(self):
+        """Recettes totales mensuelles de chaque scénario (format long)"""
+        totaux = self.recettes.sum(axis=1)
+        n_mois = totaux.shape[1]
+        return pd.DataFrame({
+            'date': np.tile(self.moteur.dates, len(self.noms)),
+            'scenario': np.repeat(self.noms, n_mois),
+            'revenu': totaux.ravel(),
+            'type': np.tile(np.where(np.arange(n_mois) < self.moteur.n_historique, 'Historique', 'Projection'),
+                            len(self.noms))
+        })
+
+
+def scenarios_depuis_table(table):
+    """Construit les scénarios à partir d'une table (scenario, secteur, delta_taux, elasticite)"""
+    scenarios = {}
+    for _, ligne in table.dropna(subset=['scenario', 'secteur']).iterrows():
+        scenario = scenarios.setdefault(ligne['scenario'], {'nom': ligne['scenario'], 'taux': {}, 'elasticites': {}})
+        scenario['taux'][ligne['secteur']] = float(ligne['delta_taux']) if pd.notna(ligne['delta_taux']) else 0.0
+        scenario['elasticites'][ligne['secteur']] = float(ligne['elasticite']) if pd.notna(ligne['elasticite']) else 0.0
+    return list(scenarios.values())
+
+
+def balayage(secteurs, deltas, elasticite=0.0):
+    """Série de scénarios appliquant chaque écart de taux aux secteurs donnés"""
+    return [{
+        'nom': f"{'+'.join(secteurs)} {delta:+.2f} pt",
+        'taux': {secteur: delta for secteur in secteurs},
+        'elasticites': {secteur: elasticite for secteur in secteurs}
+    } for delta in deltas if delta != 0]
@@ -0,0 +1,165 @@
+# sessions.py
+"""Mémoire des sessions : budget par session et éviction LRU sous un plafond global.
+
+Les données en lecture seule (agrégats de l'historique, cube, carte) sont
+partagées par référence entre toutes les sessions du processus. Seules les
+données dérivées propres à une session (résultats calculés à partir de ses
+filtres ou de ses tables éditées) sont conservées ici, comptées en octets :
+
+- au-delà de son budget, une session perd ses entrées les plus anciennes ;
+- au-delà du plafond global, les entrées les moins récemment utilisées sont
+  évincées, toutes sessions confondues (onglets abandonnés d'abord) ;
+- les sessions inactives depuis ``OCTROI_SESSION_IDLE_S`` ou déconnectées
+  sont purgées, à chaque accès et par un thread de surveillance (pod sans
+  trafic compris).
+
+Une entrée évincée est simplement recalculée à la prochaine exécution. Les
+autres tableaux propres à une session (filtres de la page Secteurs, sélections)
+sont des temporaires d'une exécution du script, libérés à sa fin : ils ne
+sont pas comptés ici.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import pandas as pd
+
+BUDGET_SESSION = float(os.environ.get('OCTROI_SESSION_BUDGET_MB', '32')) * 1e6
+PLAFOND_GLOBAL = float(os.environ.get('OCTROI_SESSION_MEMORY_MB', '256')) * 1e6
+INACTIVITE = float(os.environ.get('OCTROI_SESSION_IDLE_S', '900'))
+# Intervalle maximal entre deux purges du thread de surveillance (s)
+PERIODE_PURGE = 60.0
+
+
+def taille_octets(objet):
+    """Taille approchée (octets) d'une donnée dérivée"""
+    if isinstance(objet, pd.DataFrame):
+        return int(objet.memory_usage(deep=True).sum())
+    if isinstance(objet, (pd.Series, pd.Index)):
+        return int(objet.memory_usage(deep=True))
+    if isinstance(objet, (str, bytes)):
+        return len(objet)
+    if isinstance(objet, dict):
+        return sum(taille_octets(valeur) for valeur in objet.values())
+    if isinstance(objet, (list, tuple)):
+        return sum(taille_octets(valeur) for valeur in objet)
+    if hasattr(objet, 'to_plotly_json'):
+        return len(objet.to_json())
+    # Tableaux NumPy et objets qui déclarent leur empreinte propre (hors données partagées)
+    if hasattr(objet, 'nbytes'):
+        return int(objet.nbytes)
+    return sys.getsizeof(objet)
+
+
+class SessionMemory:
+    """Données dérivées par session, sous budget et plafond mémoire"""
+
+    def __init__(self, budget_session=BUDGET_SESSION, plafond=PLAFOND_GLOBAL, inactivite=INACTIVITE,
+                 est_active=None, surveiller=True):
+        self.budget_session = budget_session
+        self.plafond = plafond
+        self.inactivite = inactivite
+        # Session encore connectée ? (None : seule l'inactivité compte)
+        self.est_active = est_active
+        # (session, clé) -> (valeur, taille), du moins au plus récemment utilisé
+        self._entrees = OrderedDict()
+        self._octets = Counter()
+        self._activite = {}
+        self._verrou = threading.Lock()
+        self.evictions = 0
+        self._arret = threading.Event()
+        if surveiller:
+            periode = min(max(self.inactivite / 4, 1.0), PERIODE_PURGE)
+            threading.Thread(target=self._surveiller, args=(periode,), daemon=True,
+                             name='octroi-sessions').start()
+
+    def _surveiller(self, periode):
+        while not self._arret.wait(periode):
+            self.purger()
+
+    def arreter(self):
+        self._arret.set()
+
+    def obtenir(self, session, cle, calculer):
+        """Valeur conservée pour la session, calculée (et retenue si possible) sinon"""
+        with self._verrou:
+            self._purger_inactives()
+            self._activite[session] = time.monotonic()
+            entree = self._entrees.get((session, cle))
+            if entree is not None:
+                self._entrees.move_to_end((session, cle))
+                return entree[0]
+
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées
+        valeur = calculer()
+        taille = taille_octets(valeur)
+        with self._verrou:
+            # La session a pu être purgée pendant le calcul : elle redevient active
+            self._activite[session] = time.monotonic()
+            if taille <= self.budget_session and (session, cle) not in self._entrees:
+                self._entrees[(session, cle)] = (valeur, taille)
+                self._octets[session] += taille
+                self._evincer(session)
+        return valeur
+
+    def _retirer(self, cle):
+        _, taille = self._entrees.pop(cle)
+        self._octets[cle[0]] -= taille
+        if self._octets[cle[0]] <= 0:
+            del self._octets[cle[0]]
+        self.evictions += 1
+
+    def _oublier(self, sessions):
+        for cle in [cle for cle in self._entrees if cle[0] in sessions]:
+            self._retirer(cle)
+        for session in sessions:
+            self._activite.pop(session, None)
+
+    def _purger_inactives(self):
+        maintenant = time.monotonic()
+        inactives = {s for s, derniere in self._activite.items() if maintenant - derniere > self.inactivite}
+        if inactives:
+            self._oublier(inactives)
+
+    def purger(self):
+        """Oublie les sessions inactives ou déconnectées"""
+        with self._verrou:
+            sessions = list(self._activite)
+        # Test de connexion hors verrou (il interroge le serveur)
+        deconnectees = set() if self.est_active is None else {s for s in sessions if not self.est_active(s)}
+        with self._verrou:
+            self._purger_inactives()
+            self._oublier(deconnectees & set(self._activite))
+
+    def _evincer(self, session):
+        if self._octets[session] > self.budget_session:
+            for cle in [cle for cle in self._entrees if cle[0] == session]:
+                if self._octets[session] <= self.budget_session:
+                    break
+                self._retirer(cle)
+
+        while self._entrees and self.octets > self.plafond:
+            self._retirer(next(iter(self._entrees)))
+
+    @property
+    def octets(self):
+        return sum(self._octets.values())
+
+    def liberer(self, session):
+        """Oublie toutes les données d'une session"""
+        with self._verrou:
+            self._oublier({session})
+
+    def stats(self, session=None):
+        with self._verrou:
+            return {
+                'sessions': len(self._octets),
+                'entrees': len(self._entrees),
+                'octets': self.octets,
+                'octets_session': self._octets.get(session, 0),
+                'budget_session': self.budget_session,
+                'plafond': self.plafond,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,63 @@
+# simulation.py
+"""Contexte de simulation : aléa reproductible et versionnage des données.
+
+Chaque sous-système (historique, données courantes, flux temps réel,
+projections, métriques, indicateurs) tire ses nombres d'un générateur NumPy
+indépendant, dérivé de la graine commune et du nom du sous-système. Deux
+exécutions avec la même graine produisent donc les mêmes données, ce qui
+permet de les mettre en cache par version.
+
+Chaque territoire a ses propres flux (la graine est combinée au code du
+territoire) ; La Réunion, territoire d'origine, conserve les flux historiques.
+"""
+import os
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from octroi.territoires import TERRITOIRE_DEFAUT
+
+# Code département de La Réunion, graine par défaut des démonstrations
+DEFAULT_SEED = 974
+
+
+def seed_from_env():
+    """Graine lue dans OCTROI_SEED (graine par défaut si absente)"""
+    valeur = os.environ.get('OCTROI_SEED', '')
+    return int(valeur) if valeur.strip() else DEFAULT_SEED
+
+
+class SimulationContext:
+    """Générateurs indépendants par sous-système, dérivés d'une graine unique"""
+
+    def __init__(self, seed=None, date_reference=None, territoire=TERRITOIRE_DEFAUT):
+        self.seed = seed_from_env() if seed is None else int(seed)
+        self.date_reference = date_reference or datetime.now()
+        self.territoire = territoire
+        self._streams = {}
+
+    def pour_territoire(self, territoire):
+        """Contexte d'un autre territoire (même graine, même mois de référence)"""
+        if territoire == self.territoire:
+            return self
+        return SimulationContext(self.seed, self.date_reference, territoire)
+
+    def stream(self, nom, *cles):
+        """Générateur du sous-système ``nom`` (``cles`` : sous-flux, ex. numéro de tick)"""
+        identifiant = (nom,) + cles
+        if identifiant not in self._streams:
+            self._streams[identifiant] = self.generateur(nom, *cles)
+        return self._streams[identifiant]
+
+    def generateur(self, nom, *cles):
+        """Nouveau générateur du sous-système, pour rejouer un tirage depuis le début"""
+        prefixe = () if self.territoire == TERRITOIRE_DEFAUT else (zlib.crc32(self.territoire.encode('utf-8')),)
+        sequence = np.random.SeedSequence(
+            self.seed, spawn_key=prefixe + (zlib.crc32(nom.encode('utf-8')),) + tuple(int(cle) for cle in cles))
+        return np.random.default_rng(sequence)
+
+    @property
+    def data_version(self):
+        """Version des données simulées : territoire, graine et mois de référence"""
+        return f"{self.territoire.lower()}-s{self.seed}-{self.date_reference:%Y%m}"
@@ -0,0 +1,420 @@
+# sources.py
+"""Sources de données temps réel pour le bandeau "DONNÉES FISCALES EN TEMPS RÉEL".
+
+Un évènement est un dictionnaire décrivant une recette d'octroi perçue :
+
+    {"ts": 1728400000.0, "secteur": "BTP", "revenu": 1520.4, "volume": 12}
+
+Les sources réseau et fichier tournent dans une boucle asyncio dédiée
+(thread de fond) ; le dashboard récupère à chaque exécution les lots déjà
+constitués via ``poll()`` sans jamais bloquer.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DELAI_EXPIRE = object()
+
+
+def parse_evenement(ligne):
+    """Convertit une ligne NDJSON (ou un dict) en évènement, None si invalide"""
+    if isinstance(ligne, dict):
+        brut = ligne
+    else:
+        if isinstance(ligne, bytes):
+            ligne = ligne.decode('utf-8', errors='replace')
+        ligne = ligne.strip()
+        if not ligne:
+            return None
+        try:
+            brut = json.loads(ligne)
+        except ValueError:
+            return None
+    if not isinstance(brut, dict) or 'secteur' not in brut:
+        return None
+    try:
+        evenement = dict(brut)
+        evenement['ts'] = float(brut.get('ts', time.time()))
+        evenement['revenu'] = float(brut.get('revenu', 0.0))
+        evenement['volume'] = float(brut.get('volume', 0.0))
+    except (TypeError, ValueError):
+        return None
+    return evenement
+
+
+def agreger_lot(evenements):
+    """Regroupe un lot d'évènements par secteur (sommes revenu/volume)"""
+    agregats = {}
+    for evenement in evenements:
+        cumul = agregats.setdefault(evenement['secteur'],
+                                    {'revenu': 0.0, 'volume': 0.0, 'n': 0, 'ts': 0.0})
+        cumul['revenu'] += evenement['revenu']
+        cumul['volume'] += evenement['volume']
+        cumul['n'] += 1
+        cumul['ts'] = max(cumul['ts'], evenement['ts'])
+    return agregats
+
+
+class LiveDataSource:
+    """Interface commune des sources de données temps réel"""
+
+    def start(self):
+        """Démarre la source (sans effet par défaut)"""
+        return self
+
+    def poll(self):
+        """Retourne les évènements reçus depuis le dernier appel"""
+        raise NotImplementedError
+
+    def stats(self):
+        """Statistiques de débit de la source"""
+        return {}
+
+    def close(self):
+        """Arrête la source"""
+
+
+class SimulatedSource(LiveDataSource):
+    """Source simulée reproduisant les variations aléatoires historiques du dashboard.
+
+    Partagée par plusieurs consommateurs, elle émet au plus un lot toutes les
+    ``intervalle`` secondes : le débit simulé ne dépend pas du nombre de
+    sessions qui l'interrogent. ``tirage(n)`` fournit le générateur du n-ième
+    lot (simulation reproductible).
+    """
+
+    def __init__(self, current_data, probabilite=0.4, rng=None, intervalle=0.0, tirage=None):
+        self.current_data = current_data
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.probabilite = probabilite
+        self.intervalle = intervalle
+        self.tirage = tirage
+        self._evenements = 0
+        self._lots = 0
+        self._derniere_emission = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        with self._lock:
+            maintenant = time.time()
+            if self._derniere_emission is not None and maintenant - self._derniere_emission < self.intervalle:
+                return []
+            self._derniere_emission = maintenant
+            rng = self.tirage(self._lots) if self.tirage is not None else self.rng
+            self._lots += 1
+            evenements = []
+            for _, ligne in self.current_data.iterrows():
+                if rng.random() < self.probabilite:  # 40% de chance de changement
+                    variation = rng.uniform(-0.03, 0.03)
+                    evenements.append({
+                        'ts': maintenant,
+                        'secteur': ligne['secteur'],
+                        'revenu': ligne['revenu_mensuel'] * variation,
+                        'volume': ligne['volume_importation'] * rng.uniform(-0.05, 0.05)
+                    })
+            self._evenements += len(evenements)
+            return evenements
+
+    def stats(self):
+        return {'source': 'simulation', 'evenements': self._evenements, 'lots': self._lots}
+
+
+class AsyncStreamSource(LiveDataSource):
+    """Connecteur asyncio : lecture du flux, file bornée et constitution de lots.
+
+    La file ``asyncio.Queue`` bornée assure la contre-pression : quand le
+    dashboard ne consomme plus, le lecteur cesse de lire le flux (et TCP
+    ralentit l'émetteur). Les lots prêts sont limités à ``lots_max``.
+    """
+
+    nom = 'flux'
+
+    def __init__(self, taille_lot=500, intervalle_lot=0.5, taille_file=10000, lots_max=64):
+        self.taille_lot = taille_lot
+        self.intervalle_lot = intervalle_lot
+        self.taille_file = taille_file
+        self.lots_max = lots_max
+        self._lots = collections.deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            'source': self.nom,
+            'evenements': 0,
+            'lots': 0,
+            'rejets': 0,
+            'attentes_contre_pression': 0,
+            'latence_s': 0.0,
+            'termine': False
+        }
+        self._debut = None
+
+    async def lignes(self):
+        """Générateur asynchrone des lignes brutes du flux"""
+        raise NotImplementedError
+        yield
+
+    def start(self):
+        if self._thread is None:
+            self._debut = time.time()
+            self._thread = threading.Thread(target=self._executer, name=f'octroi-{self.nom}', daemon=True)
+            self._thread.start()
+        return self
+
+    def _executer(self):
+        asyncio.run(self._pipeline())
+
+    async def _pipeline(self):
+        file = asyncio.Queue(maxsize=self.taille_file)
+        producteur = asyncio.create_task(self._produire(file))
+        try:
+            await self._grouper(file)
+        finally:
+            producteur.cancel()
+            self._stats['termine'] = True
+
+    async def _produire(self, file):
+        annule = False
+        try:
+            async for ligne in self.lignes():
+                if self._stop.is_set():
+                    break
+                evenement = parse_evenement(ligne)
+                if evenement is None:
+                    self._stats['rejets'] += 1
+                    continue
+                await file.put(evenement)
+        except asyncio.CancelledError:
+            # Groupeur déjà arrêté : personne n'attend la fin de flux
+            annule = True
+            raise
+        except OSError as erreur:
+            self._stats['erreur'] = str(erreur)
+        except Exception as erreur:
+            logger.exception("Source %s interrompue", self.nom)
+            self._stats['erreur'] = f"{type(erreur).__name__}: {erreur}"
+        finally:
+            # Fin de flux (même sur erreur) : le groupeur publie le dernier lot puis s'arrête
+            if not annule:
+                await file.put(None)
+
+    async def _grouper(self, file):
+        loop = asyncio.get_running_loop()
+        lot = []
+        echeance = loop.time() + self.intervalle_lot
+        while not self._stop.is_set():
+            try:
+                evenement = await asyncio.wait_for(file.get(), max(0.0, echeance - loop.time()))
+            except asyncio.TimeoutError:
+                evenement = _DELAI_EXPIRE
+            if evenement is None:
+                break
+            if evenement is not _DELAI_EXPIRE:
+                lot.append(evenement)
+            if len(lot) >= self.taille_lot or loop.time() >= echeance:
+                if lot:
+                    await self._publier(lot)
+                    lot = []
+                echeance = loop.time() + self.intervalle_lot
+        if lot:
+            await self._publier(lot)
+
+    async def _publier(self, lot):
+        while not self._stop.is_set():
+            with self._lock:
+                if len(self._lots) < self.lots_max:
+                    self._lots.append(lot)
+                    self._stats['lots'] += 1
+                    return
+            # Le consommateur est en retard : on suspend la lecture du flux
+            self._stats['attentes_contre_pression'] += 1
+            await asyncio.sleep(self.intervalle_lot)
+
+    def poll(self):
+        with self._lock:
+            lots = list(self._lots)
+            self._lots.clear()
+        evenements = [evenement for lot in lots for evenement in lot]
+        if evenements:
+            self._stats['evenements'] += len(evenements)
+            self._stats['latence_s'] = max(0.0, time.time() - evenements[-1]['ts'])
+        return evenements
+
+    def stats(self):
+        stats = dict(self._stats)
+        duree = time.time() - self._debut if self._debut else 0.0
+        stats['debit_evt_s'] = stats['evenements'] / duree if duree > 0 else 0.0
+        with self._lock:
+            stats['lots_en_attente'] = len(self._lots)
+        return stats
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.intervalle_lot + 1)
+
+
+class SocketSource(AsyncStreamSource):
+    """Flux NDJSON lu sur une socket TCP, avec reconnexion automatique"""
+
+    nom = 'tcp'
+
+    def __init__(self, hote, port, delai_reconnexion=2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.hote = hote
+        self.port = port
+        self.delai_reconnexion = delai_reconnexion
+
+    async def lignes(self):
+        while not self._stop.is_set():
+            try:
+                reader, writer = await asyncio.open_connection(self.hote, self.port)
+            except OSError:
+                await asyncio.sleep(self.delai_reconnexion)
+                continue
+            try:
+                while not self._stop.is_set():
+                    ligne = await reader.readline()
+                    if not ligne:
+                        break
+                    yield ligne
+            finally:
+                writer.close()
+            await asyncio.sleep(self.delai_reconnexion)
+
+
+class FileTailSource(AsyncStreamSource):
+    """Suivi d'un fichier NDJSON en cours d'écriture (équivalent de ``tail -f``)"""
+
+    nom = 'fichier'
+
+    def __init__(self, chemin, depuis_debut=False, delai_scrutation=0.2, **kwargs):
+        super().__init__(**kwargs)
+        self.chemin = chemin
+        self.depuis_debut = depuis_debut
+        self.delai_scrutation = delai_scrutation
+
+    async def lignes(self):
+        while not os.path.exists(self.chemin):
+            if self._stop.is_set():
+                return
+            await asyncio.sleep(self.delai_scrutation)
+        with open(self.chemin, 'r', encoding='utf-8') as fichier:
+            if not self.depuis_debut:
+                fichier.seek(0, os.SEEK_END)
+            reste = ''
+            while not self._stop.is_set():
+                ligne = fichier.readline()
+                if not ligne:
+                    await asyncio.sleep(self.delai_scrutation)
+                    continue
+                if not ligne.endswith('\n'):
+                    # Ligne en cours d'écriture : on attend la suite
+                    reste += ligne
+                    continue
+                yield reste + ligne
+                reste = ''
+
+
+class ReplaySource(AsyncStreamSource):
+    """Rejoue un enregistrement NDJSON à N× la vitesse réelle (tests de charge).
+
+    Les horodatages sont recalés sur l'heure du rejeu ; l'original est
+    conservé dans ``ts_origine``. ``vitesse=0`` rejoue sans attente.
+    """
+
+    nom = 'rejeu'
+
+    def __init__(self, chemin, vitesse=1.0, boucle=False, **kwargs):
+        super().__init__(**kwargs)
+        self.chemin = chemin
+        self.vitesse = vitesse
+        self.boucle = boucle
+
+    async def lignes(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            debut_mur = loop.time()
+            debut_ts = time.time()
+            t0 = None
+            with open(self.chemin, 'r', encoding='utf-8') as fichier:
+                for ligne in fichier:
+                    if self._stop.is_set():
+                        return
+                    evenement = parse_evenement(ligne)
+                    if evenement is None:
+                        self._stats['rejets'] += 1
+                        continue
+                    if t0 is None:
+                        t0 = evenement['ts']
+                    ecart = (evenement['ts'] - t0) / self.vitesse if self.vitesse > 0 else 0.0
+                    attente = debut_mur + ecart - loop.time()
+                    if attente > 0:
+                        await asyncio.sleep(attente)
+                    evenement['ts_origine'] = evenement['ts']
+                    evenement['ts'] = debut_ts + ecart
+                    yield evenement
+            if not self.boucle:
+                return
+
+
+def creer_source(url, **kwargs):
+    """Construit une source à partir d'une URL de configuration.
+
+    ``tcp://hote:port``, ``tail:///chemin.ndjson`` ou
+    ``replay:///chemin.ndjson?vitesse=10&boucle=1``.
+    """
+    cible = urlparse(url)
+    options = {cle: valeurs[-1] for cle, valeurs in parse_qs(cible.query).items()}
+    if 'taille_lot' in options:
+        kwargs.setdefault('taille_lot', int(options['taille_lot']))
+    if 'intervalle_lot' in options:
+        kwargs.setdefault('intervalle_lot', float(options['intervalle_lot']))
+
+    if cible.scheme == 'tcp':
+        return SocketSource(cible.hostname, cible.port, **kwargs)
+    if cible.scheme in ('tail', 'file'):
+        return FileTailSource(cible.path, depuis_debut=options.get('depuis_debut') == '1', **kwargs)
+    if cible.scheme == 'replay':
+        return ReplaySource(cible.path,
+                            vitesse=float(options.get('vitesse', 1.0)),
+                            boucle=options.get('boucle') == '1',
+                            **kwargs)
+    raise ValueError(f"Source temps réel inconnue: {url}")
+
+
+def main():
+    """Mesure hors ligne du débit d'une source (ex: rejeu à 50×)"""
+    parser = argparse.ArgumentParser(description="Mesure du débit d'une source temps réel")
+    parser.add_argument('url', help="ex: replay:///tmp/declarations.ndjson?vitesse=50")
+    parser.add_argument('--duree', type=float, default=10.0, help="durée de la mesure (s)")
+    parser.add_argument('--periode', type=float, default=1.0, help="période de consommation (s)")
+    args = parser.parse_args()
+
+    source = creer_source(args.url).start()
+    fin = time.time() + args.duree
+    try:
+        while time.time() < fin:
+            time.sleep(args.periode)
+            termine = source.stats()['termine']
+            evenements = source.poll()
+            print(f"{len(evenements):>8} évènements, {len(agreger_lot(evenements)):>3} secteurs touchés")
+            if termine and not evenements:
+                break
+    finally:
+        source.close()
+    print(json.dumps(source.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
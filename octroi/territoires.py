@@ -0,0 +1,60 @@
+# territoires.py
+"""Territoires où s'applique l'octroi de mer (les cinq DROM).
+
+Chaque territoire est une partition indépendante : définition des secteurs,
+historique, données courantes et état temps réel. La Réunion sert de schéma
+de référence ; les autres territoires en dérivent par une échelle économique
+et un profil sectoriel (poids et taux propres, chaque collectivité votant ses
+taux).
+"""
+TERRITOIRE_DEFAUT = 'REU'
+
+TERRITOIRES = {
+    'REU': {'nom': 'La Réunion', 'departement': '974', 'icone': '🏝️', 'population': 885000,
+            'collectivite': 'Région Réunion', 'echelle': 1.0},
+    'GLP': {'nom': 'Guadeloupe', 'departement': '971', 'icone': '🌴', 'population': 378000,
+            'collectivite': 'Région Guadeloupe', 'echelle': 0.55},
+    'MTQ': {'nom': 'Martinique', 'departement': '972', 'icone': '🌺', 'population': 350000,
+            'collectivite': 'Collectivité Territoriale de Martinique', 'echelle': 0.52},
+    'GUF': {'nom': 'Guyane', 'departement': '973', 'icone': '🌳', 'population': 295000,
+            'collectivite': 'Collectivité Territoriale de Guyane', 'echelle': 0.36},
+    'MYT': {'nom': 'Mayotte', 'departement': '976', 'icone': '🐢', 'population': 320000,
+            'collectivite': 'Département de Mayotte', 'echelle': 0.18},
+}
+
+# Écarts au schéma de référence : multiplicateurs de poids et taux normaux propres
+PROFILS = {
+    'GLP': {'poids': {'BOISSONS': 0.8, 'ENERGIE': 1.1}, 'taux': {'BOISSONS': 7.5, 'AUTOMOBILE': 14.0}},
+    'MTQ': {'poids': {'BOISSONS': 0.8, 'BIENS_CONSOMMATION': 1.1}, 'taux': {'BOISSONS': 7.5, 'TIC': 5.5}},
+    'GUF': {'poids': {'BTP': 1.4, 'ENERGIE': 1.3, 'TIC': 0.8}, 'taux': {'BTP': 7.0, 'ENERGIE': 5.0}},
+    'MYT': {'poids': {'AGROALIMENTAIRE': 1.5, 'BTP': 1.3, 'AUTOMOBILE': 0.6}, 'taux': {'AGROALIMENTAIRE': 4.5}},
+}
+
+
+def territoire_valide(code):
+    """Code de territoire connu (territoire par défaut sinon)"""
+    code = (code or '').upper()
+    return code if code in TERRITOIRES else TERRITOIRE_DEFAUT
+
+
+def adapter_secteurs(secteurs, territoire):
+    """Secteurs d'un territoire, dérivés du schéma de référence"""
+    if territoire == TERRITOIRE_DEFAUT:
+        return secteurs
+    echelle = TERRITOIRES[territoire]['echelle']
+    profil = PROFILS.get(territoire, {})
+    adaptes = {}
+    for code, info in secteurs.items():
+        info = dict(info)
+        info['poids_total'] = round(info['poids_total'] * echelle * profil.get('poids', {}).get(code, 1.0), 2)
+        info['volume_importation'] = int(info['volume_importation'] * echelle)
+        info['taux_normal'] = profil.get('taux', {}).get(code, info['taux_normal'])
+        adaptes[code] = info
+    return adaptes
+
+
+def adapter_produits(product_data, territoire):
+    """Volumes par produit mis à l'échelle du territoire"""
+    if territoire == TERRITOIRE_DEFAUT:
+        return product_data
+    return product_data.assign(volume=(product_data['volume'] * TERRITOIRES[territoire]['echelle']).astype(int))
@@ -0,0 +1 @@
+"""Pages du dashboard, importées à la demande par la navigation"""
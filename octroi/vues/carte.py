@@ -0,0 +1,55 @@
+# carte.py
+"""Page Communes : répartition communale de l'octroi de mer"""
+import streamlit as st
+
+from octroi.carte import PART_COMMUNES
+from octroi.lazy import optional_import
+
+
+def create_carte_communes(dashboard):
+    """Carte choroplèthe des recettes reversées aux 24 communes"""
+    st.markdown('<h3 class="section-header">🗺️ RÉPARTITION COMMUNALE</h3>', 
+               unsafe_allow_html=True)
+
+    if dashboard.carte_communes is None:
+        st.info(f"Géométries communales non disponibles pour {dashboard.infos_territoire['nom']}.")
+        return
+
+    repartition, carte = dashboard.carte_communes
+    st.markdown(f"**{PART_COMMUNES:.0%}** des recettes des 12 derniers mois, reversés aux communes "
+                "au prorata de leur population.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Reversé", f"{repartition['revenu'].sum()/1e6:.0f} M€")
+    with col2:
+        st.metric("Par Habitant", f"{repartition['revenu'].sum() / repartition['population'].sum():.0f} €")
+    with col3:
+        premiere = repartition.iloc[0]
+        st.metric("Première Commune", premiere['nom'], f"{premiere['revenu']/1e6:.1f} M€", delta_color="off")
+
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        streamlit_folium = optional_import('streamlit_folium')
+        if carte is None or streamlit_folium is None:
+            st.info("Installer `folium` et `streamlit-folium` pour afficher la carte des communes.")
+        else:
+            # Carte construite une fois par version des données ; aucune interaction renvoyée au script
+            streamlit_folium.st_folium(carte, height=520, width=None, returned_objects=[],
+                                       key='carte_communes')
+
+    with col2:
+        st.dataframe(
+            repartition,
+            column_config={
+                'code': "Code INSEE",
+                'nom': "Commune",
+                'population': st.column_config.NumberColumn("Population", format="%d"),
+                'revenu': st.column_config.NumberColumn("Octroi reversé (€)", format="%.0f"),
+                'revenu_par_habitant': st.column_config.NumberColumn("Par habitant (€)", format="%.0f")
+            },
+            hide_index=True,
+            width='stretch',
+            height=520
+        )
@@ -0,0 +1,147 @@
+# categories.py
+"""Page Analyse par catégorie"""
+import streamlit as st
+import plotly.express as px
+
+
+def create_categorie_analysis(dashboard):
+    """Analyse par catégorie détaillée"""
+    st.markdown('<h3 class="section-header">📊 ANALYSE PAR CATÉGORIE DÉTAILLÉE</h3>', 
+               unsafe_allow_html=True)
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Performance Catégorielle", "Comparaison Catégories", "Tendances", "Exploration"])
+
+    with tab1:
+        # Performance détaillée par catégorie
+        categorie_performance = dashboard.cube.agreger_courant(dashboard.current_data, {
+            'variation_pct': 'mean',
+            'volume_importation': 'sum',
+            'revenu_mensuel': 'sum',
+            'secteur': 'count'
+        })
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig = px.bar(categorie_performance, 
+                        x='categorie', 
+                        y='variation_pct',
+                        title='Performance Moyenne par Catégorie (%)',
+                        color='variation_pct',
+                        color_continuous_scale='RdYlGn')
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            fig = px.scatter(categorie_performance, 
+                           x='revenu_mensuel', 
+                           y='variation_pct',
+                           size='volume_importation',
+                           color='categorie',
+                           title='Performance vs Revenus par Catégorie',
+                           hover_name='categorie',
+                           size_max=60)
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab2:
+        # Comparaison historique des catégories
+        categorie_evolution = dashboard.cube.slice('categorie')
+
+        fig = px.line(categorie_evolution, 
+                     x='date', 
+                     y='revenu',
+                     color='categorie',
+                     title='Évolution Comparative des Catégories (2020-2024)',
+                     color_discrete_sequence=px.colors.qualitative.Set3)
+        fig.update_layout(yaxis_title="Revenus Octroi de Mer (€)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab3:
+        # Analyse des tendances par catégorie
+        st.subheader("Tendances et Perspectives par Catégorie")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("""
+            ### 📈 Catégories en Croissance
+
+            **🏭 BTP & Construction:**
+            - Boom immobilier à La Réunion
+            - Projets d'infrastructure publique
+            - Reconstruction post-cyclone
+
+            **💊 Santé & Pharmaceutique:**
+            - Vieillissement de la population
+            - Investissements santé publique
+            - Innovations médicales
+
+            **🛒 Biens de Consommation:**
+            - Croissance démographique
+            - Augmentation pouvoir d'achat
+            - Développement retail
+            """)
+
+        with col2:
+            st.markdown("""
+            ### 📉 Catégories en Décroissance
+
+            **⛽ Énergie Traditionnelle:**
+            - Transition vers énergies renouvelables
+            - Politiques environnementales
+            - Électrification transports
+
+            **🚗 Automobile:**
+            - Saturation du marché
+            - Prix élevés des véhicules
+            - Alternative transports publics
+
+            **🍷 Boissons Alcoolisées:**
+            - Campagnes santé publique
+            - Changement habitudes consommation
+            - Fiscalité accrue
+            """)
+
+    with tab4:
+        # Descente catégorie → secteur → produit, lue dans le cube
+        st.subheader("Exploration Catégorie → Secteur → Produit")
+        cube = dashboard.cube
+
+        col1, col2 = st.columns(2)
+        with col1:
+            categorie = st.selectbox("Catégorie:", cube.membres['categorie'], key='exploration_categorie')
+        with col2:
+            secteur = st.selectbox("Secteur:", ['Tous'] + cube.enfants('categorie', categorie),
+                                   key='exploration_secteur')
+
+        if secteur == 'Tous':
+            detail = cube.drill('categorie', categorie)
+            niveau, titre = 'secteur', f'Revenus des Secteurs - {categorie}'
+        else:
+            detail = cube.drill('secteur', secteur)
+            niveau, titre = 'produit', f'Revenus des Produits - {secteur}'
+
+        fig = px.area(detail, 
+                     x='date', 
+                     y='revenu',
+                     color=niveau,
+                     title=titre,
+                     color_discrete_sequence=px.colors.qualitative.Set3)
+        fig.update_layout(yaxis_title="Revenus Octroi de Mer (€)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+        col1, col2 = st.columns(2)
+        with col1:
+            heatmap_data = (cube.heatmap('categorie', categorie) if secteur == 'Tous'
+                            else cube.heatmap('secteur', secteur)) / 1e6
+            fig = px.imshow(heatmap_data,
+                           title='Revenus Mensuels par Année (Millions €)',
+                           color_continuous_scale='Blues',
+                           aspect="auto")
+            st.plotly_chart(fig, config={'displayModeBar': False})
+        with col2:
+            totaux = detail.groupby(niveau, sort=False)['revenu'].sum().reset_index()
+            fig = px.pie(totaux, 
+                        values='revenu', 
+                        names=niveau,
+                        title='Répartition sur la Période')
+            st.plotly_chart(fig, config={'displayModeBar': False})
@@ -0,0 +1,138 @@
+# evolution.py
+"""Page Évolution des revenus"""
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def create_evolution_analysis(dashboard):
+    """Analyse de l'évolution des revenus"""
+    st.markdown('<h3 class="section-header">📈 ÉVOLUTION DES REVENUS</h3>', 
+               unsafe_allow_html=True)
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Analyse Historique", "Saisonnalité", "Projections", "Comparaisons"])
+
+    with tab1:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Performance cumulative
+            monthly_totals = dashboard.cube.serie('total').rename_axis('date_group').reset_index()
+            monthly_totals['cumulative_revenue'] = monthly_totals['revenu'].cumsum()
+
+            fig = px.line(monthly_totals, 
+                         x='date_group', 
+                         y='cumulative_revenue',
+                         title='Revenus Cumulatifs de l\'Octroi de Mer (€)')
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            # Revenus mensuels par année
+            heatmap_data = dashboard.cube.heatmap('total') / 1e6  # Conversion en millions
+
+            fig = px.imshow(heatmap_data,
+                           title='Revenus Mensuels par Année (Millions €)',
+                           color_continuous_scale='Blues',
+                           aspect="auto")
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab2:
+        # Analyse de saisonnalité
+        saisonnalite_moyenne = dashboard.cube.saisonnalite('secteur').reset_index()
+        saisonnalite_moyenne['revenu_M'] = saisonnalite_moyenne['revenu'] / 1e6
+
+        fig = px.line(saisonnalite_moyenne, 
+                     x='mois', 
+                     y='revenu_M',
+                     title='Saisonnalité des Revenus - Moyenne Mensuelle',
+                     markers=True)
+        fig.update_layout(xaxis_title="Mois", yaxis_title="Revenus Moyens (Millions €)")
+        fig.update_xaxes(tickvals=list(range(1, 13)), 
+                       ticktext=['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Jun', 
+                               'Jul', 'Aoû', 'Sep', 'Oct', 'Nov', 'Dec'])
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab3:
+        # Projections futures
+        st.subheader("Projections des Revenus")
+
+        # Bandes d'incertitude issues des chemins Monte Carlo
+        projections = dashboard.projections
+        bandes = projections.bandes()
+        bandes.index = bandes.index + pd.offsets.MonthEnd(0)
+
+        # Données historiques récentes pour comparaison
+        derniere_date = dashboard.historical_data['date'].max()
+        historique_recent = dashboard.cube.serie('total', debut=derniere_date - timedelta(days=365))
+        historique_recent.index = historique_recent.index + pd.offsets.MonthEnd(0)
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=bandes.index, y=bandes['p90'], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=bandes.index, y=bandes['p10'], mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor='rgba(239, 65, 53, 0.2)', name='P10 - P90'))
+        fig.add_trace(go.Scatter(x=historique_recent.index, y=historique_recent.values, mode='lines',
+                                 name='Historique', line=dict(color='#0055A4')))
+        fig.add_trace(go.Scatter(x=bandes.index, y=bandes['p50'], mode='lines',
+                                 name='Projection (P50)', line=dict(color='#EF4135')))
+        fig.update_layout(title=f'Projection des Revenus - 12 Mois ({projections.n_chemins:,} simulations)',
+                          yaxis_title="Revenus (€)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+        annuel = projections.annuel()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Scénario bas (P10)", f"{annuel['p10']/1e6:.0f} M€")
+        col2.metric("Médiane (P50)", f"{annuel['p50']/1e6:.0f} M€")
+        col3.metric("Scénario haut (P90)", f"{annuel['p90']/1e6:.0f} M€")
+
+        st.dataframe(
+            projections.par_secteur(),
+            column_config={
+                'secteur': "Secteur",
+                'p10': st.column_config.NumberColumn("P10 (€)", format="%.0f"),
+                'p50': st.column_config.NumberColumn("P50 (€)", format="%.0f"),
+                'p90': st.column_config.NumberColumn("P90 (€)", format="%.0f")
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+    with tab4:
+        # Comparaisons N-1, M-1 et cumul annuel (lectures précalculées)
+        st.subheader("Comparaisons de Périodes")
+        comparaisons = dashboard.comparaisons
+
+        col1, col2 = st.columns(2)
+        with col1:
+            niveau = st.selectbox("Niveau:", ['secteur', 'categorie'],
+                                  format_func={'secteur': 'Secteurs', 'categorie': 'Catégories'}.get)
+        with col2:
+            periodes = list(comparaisons.periodes[::-1][:24])
+            periode = st.selectbox("Période:", periodes, format_func=lambda p: p.strftime('%m/%Y'))
+
+        tableau = comparaisons.tableau(niveau, periode=periode)
+        st.dataframe(
+            tableau[[niveau, 'valeur', 'yoy_pct', 'mom_pct', 'ytd', 'ytd_pct']],
+            column_config={
+                niveau: niveau.capitalize(),
+                'valeur': st.column_config.NumberColumn("Revenu du mois (€)", format="%.0f"),
+                'yoy_pct': st.column_config.NumberColumn("vs N-1 (%)", format="%+.1f"),
+                'mom_pct': st.column_config.NumberColumn("vs M-1 (%)", format="%+.1f"),
+                'ytd': st.column_config.NumberColumn("Cumul annuel (€)", format="%.0f"),
+                'ytd_pct': st.column_config.NumberColumn("Cumul vs N-1 (%)", format="%+.1f")
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+        fig = px.bar(tableau, 
+                    x=niveau, 
+                    y='yoy_pct',
+                    title=f"Variation sur un an - {periode.strftime('%m/%Y')} (%)",
+                    color='yoy_pct',
+                    color_continuous_scale='RdYlGn')
+        fig.update_layout(yaxis_title="Variation N-1 (%)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
@@ -0,0 +1,99 @@
+# insights.py
+"""Pages Insights et À Propos"""
+import streamlit as st
+
+
+def create_insights(dashboard):
+    """Insights stratégiques"""
+    st.markdown("## 💡 INSIGHTS STRATÉGIQUES")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        ### 🎯 TENDANCES FISCALES
+
+        **📈 Dynamiques Sectorielles:**
+        - Forte croissance BTP et construction
+        - Stabilité secteur agroalimentaire
+        - Déclin progressif énergies fossiles
+
+        **🏝️ Facteurs Réunionnais:**
+        - Croissance démographique soutenue
+        - Développement infrastructures
+        - Tourisme en augmentation
+
+        **💰 Impact Économique:**
+        - Financement services publics
+        - Soutien à l'économie locale
+        - Redistribution territoriale
+        """)
+
+    with col2:
+        st.markdown("""
+        ### 🚨 DÉFIS ET OPPORTUNITÉS
+
+        **⚡ Défis à Relever:**
+        - Évolution réglementaire européenne
+        - Contrôles douaniers renforcés
+        - Fraude et optimisation fiscale
+
+        **💡 Opportunités:**
+        - Digitalisation des procédures
+        - Élargissement assiette fiscale
+        - Cooperation régionale
+
+        **🔮 Perspectives:**
+        - Croissance modérée des revenus
+        - Diversification des sources
+        - Modernisation continue
+        """)
+
+    st.markdown("""
+    ### 📋 RECOMMANDATIONS OPÉRATIONNELLES
+
+    1. **Optimisation Contrôle:** Renforcer les contrôles sur les secteurs à forts enjeux
+    2. **Digitalisation:** Accélérer la dématérialisation des déclarations
+    3. **Formation:** Former les agents aux nouvelles réglementations
+    4. **Communication:** Améliorer l'information des contribuables
+    5. **Innovation:** Développer de nouveaux outils d'analyse de données
+    """)
+
+
+def create_a_propos(dashboard):
+    """Présentation du dashboard et des sources"""
+    st.markdown("## 📋 À propos de ce dashboard")
+    st.markdown("""
+    Ce dashboard présente une analyse en temps réel des recettes de l'Octroi de Mer 
+    à La Réunion, taxe perçue sur les produits importés dans le département.
+
+    **Couverture:**
+    - 10 secteurs économiques principaux
+    - Données historiques depuis 2020
+    - Analyse par catégorie et produit
+    - Indicateurs de performance en temps réel
+
+    **Sources des données:**
+    - Direction Générale des Douanes et Droits Indirects
+    - Chambre de Commerce et d'Industrie
+    - INSEE Réunion
+    - Collectivité Territoriale de La Réunion
+
+    **📊 Méthodologie:**
+    Les données sont agrégées et anonymisées
+    Méthodes statistiques pour les projections
+    Actualisation mensuelle des indicateurs
+
+    **⚠️ Avertissement:** 
+    Ce dashboard est un outil d'aide à la décision.
+    Les données peuvent être sujettes à révision.
+    """)
+
+    st.markdown("---")
+    st.markdown("""
+    **📞 Contact:**
+    - Direction Générale des Douanes et Droits Indirects
+    - Site web: www.douane.gouv.fr
+    - Email: reunion@douane.finances.gouv.fr
+    - Adresse: Saint-Denis, La Réunion
+    """)
@@ -0,0 +1,276 @@
+# secteurs.py
+"""Page Secteurs en temps réel"""
+import time
+from datetime import datetime
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from octroi.scenarios import balayage, scenarios_depuis_table
+
+
+def create_secteurs_live(dashboard):
+    """Affiche les secteurs en temps réel"""
+    st.markdown('<h3 class="section-header">🏢 SECTEURS ÉCONOMIQUES EN TEMPS RÉEL</h3>', 
+               unsafe_allow_html=True)
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Tableau des Revenus", "Analyse Catégorie", "Simulateur",
+                                            "Tendance Intraday", "Scénarios de Taux"])
+
+    with tab1:
+        # Filtres pour les secteurs
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            categorie_filtre = st.selectbox("Catégorie:", 
+                                          ['Toutes'] + list(dashboard.current_data['categorie'].unique()))
+        with col2:
+            performance_filtre = st.selectbox("Performance:", 
+                                            ['Tous', 'En croissance', 'En décroissance', 'Stable'])
+        with col3:
+            tri_filtre = st.selectbox("Trier par:", 
+                                    ['Revenu mensuel', 'Variation %', 'Volume importation', 'Taux normal'])
+
+        # Application des filtres (chaque filtre produit un nouveau tableau : pas de copie préalable)
+        secteurs_filtres = dashboard.current_data
+        if categorie_filtre != 'Toutes':
+            secteurs_filtres = secteurs_filtres[secteurs_filtres['categorie'] == categorie_filtre]
+        if performance_filtre == 'En croissance':
+            secteurs_filtres = secteurs_filtres[secteurs_filtres['variation_pct'] > 0]
+        elif performance_filtre == 'En décroissance':
+            secteurs_filtres = secteurs_filtres[secteurs_filtres['variation_pct'] < 0]
+        elif performance_filtre == 'Stable':
+            secteurs_filtres = secteurs_filtres[secteurs_filtres['variation_pct'] == 0]
+
+        # Tri
+        if tri_filtre == 'Revenu mensuel':
+            secteurs_filtres = secteurs_filtres.sort_values('revenu_mensuel', ascending=False)
+        elif tri_filtre == 'Variation %':
+            secteurs_filtres = secteurs_filtres.sort_values('variation_pct', ascending=False)
+        elif tri_filtre == 'Volume importation':
+            secteurs_filtres = secteurs_filtres.sort_values('volume_importation', ascending=False)
+        elif tri_filtre == 'Taux normal':
+            secteurs_filtres = secteurs_filtres.sort_values('taux_normal', ascending=False)
+
+        # Affichage des secteurs
+        for _, secteur in secteurs_filtres.iterrows():
+            change_class = ""
+            if secteur['variation_pct'] > 0:
+                change_class = "positive"
+            elif secteur['variation_pct'] < 0:
+                change_class = "negative"
+            else:
+                change_class = "neutral"
+
+            col1, col2, col3, col4, col5 = st.columns([1, 2, 1, 1, 1])
+            with col1:
+                st.markdown(f"**{secteur['secteur']}**")
+                st.markdown(f"*{secteur['categorie']}*")
+            with col2:
+                st.markdown(f"**{secteur['nom_complet']}**")
+                st.markdown(f"Taux normal: {secteur['taux_normal']}%")
+            with col3:
+                st.markdown(f"**{secteur['revenu_mensuel']/1000:.0f}K€**")
+                st.markdown(f"Taux réduit: {secteur['taux_reduit']}%")
+            with col4:
+                variation_str = f"{secteur['variation_pct']:+.2f}%"
+                st.markdown(f"**{variation_str}**")
+                st.markdown(f"{secteur['variation_abs']/1000:+.0f}K€")
+            with col5:
+                st.markdown(f"<div class='revenue-change {change_class}'>{variation_str}</div>", 
+                           unsafe_allow_html=True)
+                st.markdown(f"Vol: {secteur['volume_importation']:,.0f}")
+
+            st.markdown("---")
+
+    with tab2:
+        # Analyse détaillée par catégorie
+        categorie_selectionnee = st.selectbox("Sélectionnez une catégorie:", 
+                                            dashboard.current_data['categorie'].unique())
+
+        if categorie_selectionnee:
+            # Secteurs de la catégorie lus dans le cube (positions, sans filtre de colonne)
+            secteurs_categorie = dashboard.current_data.set_index('secteur').loc[
+                dashboard.cube.enfants('categorie', categorie_selectionnee)
+            ].reset_index()
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Performance des secteurs de la catégorie
+                fig = px.bar(secteurs_categorie, 
+                            x='secteur', 
+                            y='variation_pct',
+                            title=f'Performance des Secteurs - {categorie_selectionnee}',
+                            color='variation_pct',
+                            color_continuous_scale='RdYlGn')
+                st.plotly_chart(fig, config={'displayModeBar': False})
+
+            with col2:
+                # Répartition des revenus dans la catégorie
+                fig = px.pie(secteurs_categorie, 
+                            values='revenu_mensuel', 
+                            names='secteur',
+                            title=f'Répartition des Revenus - {categorie_selectionnee}')
+                st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab3:
+        # Simulateur d'Octroi de Mer
+        st.subheader("Simulateur de Calcul d'Octroi de Mer")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            produit_selectionne = st.selectbox("Produit:", 
+                                             dashboard.product_data['produit'].unique())
+            valeur_produit = st.number_input("Valeur du produit (€)", 
+                                           min_value=0.0, value=1000.0)
+
+        with col2:
+            volume_import = st.number_input("Volume/Quantité", 
+                                          min_value=1, value=100)
+            type_taux = st.selectbox("Type de taux:", 
+                                   ["Normal", "Réduit", "Spécifique"])
+
+        with col3:
+            pays_origine = st.selectbox("Pays d'origine:", 
+                                      ["France", "UE", "Pays tiers", "DOM"])
+            calculer = st.button("Calculer l'Octroi de Mer")
+
+        if calculer:
+            # Calcul selon le type de taux (même calcul que l'API)
+            calcul = dashboard.compute_octroi(produit_selectionne, valeur_produit, type_taux)
+
+            st.success(f"""
+            **Résultat du calcul:**
+            - Produit: {produit_selectionne}
+            - Secteur: {calcul['secteur']}
+            - Taux appliqué: {calcul['taux_applique']}%
+            - Valeur imposable: {valeur_produit:,.2f}€
+            - **Montant Octroi de Mer: {calcul['montant_octroi']:,.2f}€**
+            """)
+
+    with tab4:
+        # Tendance depuis l'ouverture, reconstruite à partir du journal
+        st.subheader("Tendance Intraday par Secteur")
+
+        tendances = dashboard.event_log.tendances()
+        st.dataframe(
+            tendances,
+            column_config={
+                'secteur': 'Secteur',
+                'revenu_ouverture': st.column_config.NumberColumn("Ouverture (€)", format="%.0f"),
+                'revenu_courant': st.column_config.NumberColumn("Courant (€)", format="%.0f"),
+                'variation_ouverture_pct': st.column_config.NumberColumn("Depuis ouverture (%)", format="%+.2f"),
+                'evenements': "Évènements",
+                'tendance': st.column_config.LineChartColumn("Tendance")
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+        # État du journal à un instant donné
+        minutes = st.slider("État il y a (minutes):", min_value=0, max_value=240, value=0, step=5)
+        instant = time.time() - minutes * 60
+        etat_passe = dashboard.event_log.etat(instant)
+        fig = px.bar(etat_passe, 
+                    x='secteur', 
+                    y='revenu_mensuel',
+                    title=f"Revenus par Secteur à {datetime.fromtimestamp(instant).strftime('%H:%M')}",
+                    color='secteur',
+                    color_discrete_sequence=px.colors.qualitative.Set3)
+        fig.update_layout(yaxis_title="Revenus (€)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab5:
+        # Scénarios de taux évalués ensemble sur l'historique et l'horizon projeté
+        st.subheader("Scénarios de Taux d'Octroi de Mer")
+        st.markdown("Écart de **taux normal** en points par secteur, avec élasticité-prix "
+                    "optionnelle des volumes importés (ex: -0.5).")
+
+        scenarios_defaut = pd.DataFrame([
+            {'scenario': 'BTP & Auto +0.5 pt', 'secteur': 'BTP', 'delta_taux': 0.5, 'elasticite': 0.0},
+            {'scenario': 'BTP & Auto +0.5 pt', 'secteur': 'AUTOMOBILE', 'delta_taux': 0.5, 'elasticite': 0.0},
+            {'scenario': 'BTP & Auto +0.5 pt (élastique)', 'secteur': 'BTP', 'delta_taux': 0.5, 'elasticite': -0.8},
+            {'scenario': 'BTP & Auto +0.5 pt (élastique)', 'secteur': 'AUTOMOBILE', 'delta_taux': 0.5, 'elasticite': -1.2},
+        ])
+        table = st.data_editor(
+            scenarios_defaut,
+            num_rows='dynamic',
+            column_config={
+                'scenario': st.column_config.TextColumn("Scénario", required=True),
+                'secteur': st.column_config.SelectboxColumn("Secteur", options=list(dashboard.secteurs), required=True),
+                'delta_taux': st.column_config.NumberColumn("Δ taux (pt)", step=0.05, format="%+.2f"),
+                'elasticite': st.column_config.NumberColumn("Élasticité", step=0.1, format="%.2f")
+            },
+            hide_index=True,
+            width='stretch',
+            key='scenarios_taux'
+        )
+
+        with st.expander("Balayage d'écarts de taux"):
+            col1, col2 = st.columns(2)
+            with col1:
+                secteurs_balayage = st.multiselect("Secteurs:", list(dashboard.secteurs), key='balayage_secteurs')
+                elasticite_balayage = st.number_input("Élasticité:", value=0.0, step=0.1, key='balayage_elasticite')
+            with col2:
+                ecart_min, ecart_max = st.slider("Écarts de taux (pt):", -2.0, 2.0, (-1.0, 1.0), step=0.25,
+                                                 key='balayage_ecarts')
+
+        scenarios = scenarios_depuis_table(table)
+        if secteurs_balayage:
+            scenarios += balayage(secteurs_balayage, np.arange(ecart_min, ecart_max + 0.125, 0.25),
+                                  elasticite_balayage)
+
+        # Résultats propres à la session, conservés tant que la table ne change pas
+        resultats = dashboard.derive(('scenarios', repr(scenarios)),
+                                     lambda: dashboard.scenarios.evaluer(scenarios))
+        synthese = resultats.synthese()
+
+        st.dataframe(
+            synthese,
+            column_config={
+                'scenario': "Scénario",
+                'revenu_historique': st.column_config.NumberColumn("Recettes historiques (€)", format="%.0f"),
+                'ecart_historique': st.column_config.NumberColumn("Écart historique (€)", format="%+.0f"),
+                'ecart_historique_pct': st.column_config.NumberColumn("Écart historique (%)", format="%+.2f"),
+                'revenu_projete': st.column_config.NumberColumn("Recettes 12 mois (€)", format="%.0f"),
+                'ecart_projete': st.column_config.NumberColumn("Écart 12 mois (€)", format="%+.0f"),
+                'ecart_projete_pct': st.column_config.NumberColumn("Écart 12 mois (%)", format="%+.2f")
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig = px.bar(synthese.iloc[1:], 
+                        x='ecart_projete', 
+                        y='scenario',
+                        orientation='h',
+                        title='Écart de Recettes sur 12 Mois vs Référence (€)',
+                        color='ecart_projete',
+                        color_continuous_scale='RdYlGn')
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            par_secteur = resultats.par_secteur()
+            fig = px.bar(par_secteur[par_secteur['scenario'] != synthese['scenario'].iloc[0]], 
+                        x='scenario', 
+                        y='ecart',
+                        color='secteur',
+                        title='Contribution des Secteurs à l\'Écart (12 mois, €)',
+                        color_discrete_sequence=px.colors.qualitative.Set3)
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+
+        mensuel = resultats.mensuel()
+        fig = px.line(mensuel[mensuel['date'] >= mensuel['date'].max() - pd.DateOffset(months=35)], 
+                     x='date', 
+                     y='revenu',
+                     color='scenario',
+                     line_dash='type',
+                     title='Recettes Mensuelles par Scénario (€)')
+        st.plotly_chart(fig, config={'displayModeBar': False})
@@ -0,0 +1,106 @@
+# territoires.py
+"""Page Territoires : comparaison des cinq DROM"""
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from octroi.territoires import TERRITOIRES
+
+
+def create_comparaison_territoires(dashboard):
+    """Comparaison des recettes entre territoires, à partir des cubes de chaque partition"""
+    st.markdown('<h3 class="section-header">🌍 COMPARAISON DES TERRITOIRES</h3>', 
+               unsafe_allow_html=True)
+
+    codes = st.multiselect("Territoires:", list(TERRITOIRES), default=list(TERRITOIRES),
+                           format_func=lambda code: TERRITOIRES[code]['nom'])
+    if not codes:
+        st.info("Sélectionner au moins un territoire.")
+        return
+
+    debut = time.perf_counter()
+    with st.spinner("Chargement des partitions..."):
+        partitions = dashboard.territoires(codes)
+    duree = time.perf_counter() - debut
+
+    # Synthèse sur 12 mois glissants, lue dans les cubes pré-agrégés
+    synthese = []
+    for code, partition in partitions.items():
+        cube = partition.cube
+        total = cube.valeurs('total')[0]
+        recettes, precedentes = total[-12:].sum(), total[-24:-12].sum()
+        categories = cube.valeurs('categorie')[:, -12:].sum(axis=1)
+        synthese.append({
+            'territoire': TERRITOIRES[code]['nom'],
+            'recettes_12m': recettes,
+            'variation_pct': (recettes / precedentes - 1) * 100 if precedentes else np.nan,
+            'par_habitant': recettes / TERRITOIRES[code]['population'],
+            'categorie_principale': cube.membres['categorie'][int(np.argmax(categories))]
+        })
+    synthese = pd.DataFrame(synthese)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Recettes 12 mois (sélection)", f"{synthese['recettes_12m'].sum()/1e6:.0f} M€")
+    with col2:
+        premier = synthese.loc[synthese['par_habitant'].idxmax()]
+        st.metric("Plus forte recette par habitant", premier['territoire'], f"{premier['par_habitant']:.0f} €",
+                  delta_color="off")
+    with col3:
+        dynamique = synthese.loc[synthese['variation_pct'].idxmax()]
+        st.metric("Plus forte croissance", dynamique['territoire'], f"{dynamique['variation_pct']:+.1f}%")
+
+    st.dataframe(
+        synthese,
+        column_config={
+            'territoire': "Territoire",
+            'recettes_12m': st.column_config.NumberColumn("Recettes 12 mois (€)", format="%.0f"),
+            'variation_pct': st.column_config.NumberColumn("vs 12 mois précédents (%)", format="%+.1f"),
+            'par_habitant': st.column_config.NumberColumn("Par habitant (€)", format="%.0f"),
+            'categorie_principale': "Catégorie principale"
+        },
+        hide_index=True,
+        width='stretch'
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        evolution = pd.concat([
+            partition.cube.serie('total').rename('revenu').rename_axis('date').reset_index().assign(
+                territoire=TERRITOIRES[code]['nom'])
+            for code, partition in partitions.items()
+        ])
+        evolution['revenu_M'] = evolution['revenu'] / 1e6
+        fig = px.line(evolution, 
+                     x='date', 
+                     y='revenu_M',
+                     color='territoire',
+                     title='Recettes Mensuelles par Territoire (M€)')
+        fig.update_layout(yaxis_title="Revenus (Millions €)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with col2:
+        structure = pd.concat([
+            pd.DataFrame({
+                'territoire': TERRITOIRES[code]['nom'],
+                'categorie': partition.cube.membres['categorie'],
+                'revenu': partition.cube.valeurs('categorie')[:, -12:].sum(axis=1)
+            })
+            for code, partition in partitions.items()
+        ])
+        structure['part'] = structure['revenu'] / structure.groupby('territoire')['revenu'].transform('sum') * 100
+        fig = px.bar(structure, 
+                    x='territoire', 
+                    y='part',
+                    color='categorie',
+                    title='Structure des Recettes par Catégorie (12 mois, %)',
+                    color_discrete_sequence=px.colors.qualitative.Set3)
+        fig.update_layout(yaxis_title="Part (%)")
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+    st.caption(f"{len(partitions)} partitions chargées en {duree * 1000:.0f} ms "
+               "(chargement parallèle à la première consultation, puis cache par version des données)")
@@ -0,0 +1,152 @@
+# vue_ensemble.py
+"""Page Vue d'Ensemble"""
+import streamlit as st
+import plotly.express as px
+
+DIMENSIONS = {'importateur': 'Importateurs', 'ligne_tarifaire': 'Lignes tarifaires'}
+
+
+def create_octroi_overview(dashboard):
+    """Crée la vue d'ensemble de l'Octroi de Mer"""
+    st.markdown('<h3 class="section-header">🏛️ VUE D\'ENSEMBLE OCTROI DE MER</h3>', 
+               unsafe_allow_html=True)
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Évolution Revenus", "Répartition Secteurs", "Top Contribuables", "Analyse Taux"])
+
+    with tab1:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Évolution des revenus totaux
+            evolution_totale = dashboard.cube.serie('total').rename_axis('date').reset_index()
+            evolution_totale['revenu_mensuel_M'] = evolution_totale['revenu'] / 1e6
+
+            fig = px.line(evolution_totale, 
+                         x='date', 
+                         y='revenu_mensuel_M',
+                         title='Évolution des Revenus de l\'Octroi de Mer (2020-2024)',
+                         color_discrete_sequence=['#0055A4'])
+            fig.update_layout(yaxis_title="Revenus (Millions €)")
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            # Performance par catégorie
+            performance_categories = dashboard.cube.agreger_courant(dashboard.current_data, {
+                'variation_pct': 'mean',
+                'revenu_mensuel': 'sum'
+            })
+
+            fig = px.bar(performance_categories, 
+                        x='categorie', 
+                        y='variation_pct',
+                        title='Performance Mensuelle par Catégorie (%)',
+                        color='categorie',
+                        color_discrete_sequence=px.colors.qualitative.Set3)
+            fig.update_layout(yaxis_title="Variation (%)")
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab2:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Répartition par secteur
+            fig = px.pie(dashboard.current_data, 
+                        values='revenu_mensuel', 
+                        names='secteur',
+                        title='Répartition des Revenus par Secteur',
+                        color='secteur',
+                        color_discrete_sequence=px.colors.qualitative.Set3)
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            # Volume d'importation par secteur
+            fig = px.bar(dashboard.current_data, 
+                        x='secteur', 
+                        y='volume_importation',
+                        title='Volume d\'Importation par Secteur',
+                        color='secteur',
+                        color_discrete_sequence=px.colors.qualitative.Set3)
+            fig.update_layout(yaxis_title="Volume d'Importation")
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+    with tab3:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Top contributeurs
+            top_contributeurs = dashboard.current_data.nlargest(10, 'revenu_mensuel')
+            fig = px.bar(top_contributeurs, 
+                        x='revenu_mensuel', 
+                        y='secteur',
+                        orientation='h',
+                        title='Top 10 des Secteurs Contribuant aux Revenus',
+                        color='revenu_mensuel',
+                        color_continuous_scale='Blues')
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        with col2:
+            # Croissance la plus forte
+            top_croissance = dashboard.current_data.nlargest(10, 'variation_pct')
+            fig = px.bar(top_croissance, 
+                        x='variation_pct', 
+                        y='secteur',
+                        orientation='h',
+                        title='Top 10 des Croissances Sectorielles (%)',
+                        color='variation_pct',
+                        color_continuous_scale='Greens')
+            st.plotly_chart(fig, config={'displayModeBar': False})
+
+        # Classements au niveau des déclarations (résumés à mémoire bornée)
+        st.subheader("Top Contribuables du Mois")
+        dimension = st.radio("Classement:", list(DIMENSIONS), format_func=DIMENSIONS.get, horizontal=True)
+        top = dashboard.top_contribuables.top(dimension, 10)
+        bornes = dashboard.top_contribuables.bornes(dimension)
+
+        fig = px.bar(top, 
+                    x='estimation', 
+                    y='libelle',
+                    orientation='h',
+                    error_x_minus='erreur',
+                    error_x=[0] * len(top),
+                    title=f'Top 10 {DIMENSIONS[dimension]} (Octroi de Mer, €)',
+                    color='estimation',
+                    color_continuous_scale='Blues')
+        fig.update_layout(yaxis={'categoryorder': 'total ascending'}, yaxis_title=None)
+        st.plotly_chart(fig, config={'displayModeBar': False})
+        st.caption(f"{bornes['declarations']:,} déclarations · {top['garanti'].sum()}/{len(top)} rangs garantis · "
+                   f"erreur max. hors top {bornes['erreur_top']:,.0f} € · "
+                   f"mémoire {bornes['memoire'] / 1e3:.0f} Ko")
+
+        if st.checkbox("Recompte exact des déclarations du mois"):
+            exact = dashboard.top_contribuables_exact(dimension, 10)
+            ecarts = top.set_index('cle')['estimation'] - exact.set_index('cle')['poids']
+            st.dataframe(
+                exact[['libelle', 'poids']].assign(rang_esquisse=exact['cle'].map(
+                    {cle: rang + 1 for rang, cle in enumerate(top['cle'])})),
+                column_config={
+                    'libelle': "Contribuable",
+                    'poids': st.column_config.NumberColumn("Octroi exact (€)", format="%.0f"),
+                    'rang_esquisse': st.column_config.NumberColumn("Rang esquisse", format="%d")
+                },
+                hide_index=True,
+                width='stretch'
+            )
+            st.caption(f"Écart maximal observé : {ecarts.abs().max():,.0f} €")
+
+    with tab4:
+        # Analyse des taux par produit
+        st.subheader("Analyse des Taux d'Octroi de Mer")
+
+        fig = px.scatter(dashboard.product_data, 
+                       x='taux_octroi', 
+                       y='volume',
+                       size='volume',
+                       color='secteur',
+                       title='Taux d\'Octroi vs Volume d\'Importation',
+                       hover_name='produit',
+                       size_max=40)
+        st.plotly_chart(fig, config={'displayModeBar': False})
+
+        # Tableau des taux
+        st.dataframe(dashboard.product_data[['produit', 'secteur', 'taux_octroi', 'volume']], 
+                    use_container_width=True)
@@ -0,0 +1,51 @@
+# conftest.py
+import numpy as np
+import pandas as pd
+import pytest
+
+SECTEURS = {
+    'BTP': {'categorie': 'Construction'},
+    'MATERIAUX': {'categorie': 'Construction'},
+    'TIC': {'categorie': 'Services'},
+}
+
+
+@pytest.fixture
+def secteurs():
+    return SECTEURS
+
+
+@pytest.fixture
+def historique():
+    """Historique synthétique : plusieurs lignes par secteur et par mois (2021-01 à 2024-06)"""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2021-01-01', '2024-06-01', freq='MS')
+    lignes = []
+    for secteur, infos in SECTEURS.items():
+        for date in dates:
+            for jour in (3, 17):
+                lignes.append({
+                    'date': date + pd.Timedelta(days=jour),
+                    'secteur': secteur,
+                    'categorie': infos['categorie'],
+                    'revenu_octroi': rng.uniform(1e5, 2e5),
+                    'volume_importation': rng.uniform(100, 200),
+                    'taux_moyen': rng.uniform(1, 3),
+                })
+    return pd.DataFrame(lignes)
+
+
+@pytest.fixture
+def produits():
+    return pd.DataFrame([
+        {'produit': 'Ciment', 'secteur': 'MATERIAUX', 'taux_octroi': 2.0, 'volume': 300},
+        {'produit': 'Acier', 'secteur': 'MATERIAUX', 'taux_octroi': 1.0, 'volume': 200},
+        {'produit': 'Engins', 'secteur': 'BTP', 'taux_octroi': 2.5, 'volume': 50},
+        {'produit': 'Téléphones', 'secteur': 'TIC', 'taux_octroi': 2.7, 'volume': 80},
+    ])
+
+
+@pytest.fixture
+def cube(historique, secteurs, produits):
+    from octroi.cube import OctroiCube
+    return OctroiCube(historique, secteurs, produits)
@@ -0,0 +1,96 @@
+# test_api.py
+import json
+import logging
+import urllib.error
+import urllib.request
+
+import pytest
+
+from octroi.api import PREFIXE, demarrer, etag_correspond
+
+
+@pytest.fixture(scope='module')
+def serveur():
+    # Hors `streamlit run`, les caches Streamlit signalent l'absence de session à chaque appel
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    serveur = demarrer(0, workers=2, alimenter=False, seed=7)
+    yield serveur
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def requete(serveur, ressource, entetes=None):
+    """(statut, en-têtes, corps JSON) d'une requête GET"""
+    hote, port = serveur.server_address
+    demande = urllib.request.Request(f"http://{hote}:{port}{PREFIXE}{ressource}", headers=entetes or {})
+    try:
+        with urllib.request.urlopen(demande, timeout=60) as reponse:
+            return reponse.status, reponse.headers, json.loads(reponse.read())
+    except urllib.error.HTTPError as erreur:
+        corps = erreur.read()
+        return erreur.code, erreur.headers, json.loads(corps) if corps else None
+
+
+def test_etag_correspond():
+    etag = '"v1-0-abc"'
+    assert etag_correspond(etag, etag)
+    assert etag_correspond(f'W/{etag}', etag)
+    assert etag_correspond(f'"autre", W/{etag}', etag)
+    assert etag_correspond('*', etag)
+    assert not etag_correspond('"autre"', etag)
+    assert not etag_correspond(None, etag)
+
+
+def test_200_puis_304(serveur):
+    statut, entetes, corps = requete(serveur, 'mensuel?territoire=GLP&niveau=categorie')
+    assert statut == 200
+    assert corps['territoire'] == 'GLP' and corps['donnees']
+    etag = entetes['ETag']
+
+    for entete in (etag, f'W/{etag}', f'"perime", {etag}', '*'):
+        assert requete(serveur, 'mensuel?territoire=GLP&niveau=categorie', {'If-None-Match': entete})[0] == 304
+    assert requete(serveur, 'mensuel?territoire=GLP&niveau=categorie', {'If-None-Match': '"perime"'})[0] == 200
+    # Ressource ou paramètres invalides
+    assert requete(serveur, 'inconnue')[0] == 404
+
+
+def test_etag_suit_les_evenements_appliques(serveur):
+    statut, entetes, corps = requete(serveur, 'secteurs?territoire=REU')
+    assert statut == 200
+    etag = entetes['ETag']
+    journal = serveur.service.dashboard('REU').event_log
+
+    # Lecture vide : l'état ne change pas, le client reste à jour
+    journal.enregistrer([])
+    assert requete(serveur, 'secteurs?territoire=REU', {'If-None-Match': etag})[0] == 304
+
+    secteur = corps['donnees'][0]['secteur']
+    revenu = corps['donnees'][0]['revenu_mensuel']
+    journal.enregistrer([{'ts': 1e12, 'secteur': secteur, 'revenu': 1000.0, 'volume': 1.0}])
+    statut, entetes, corps = requete(serveur, 'secteurs?territoire=REU', {'If-None-Match': etag})
+    assert statut == 200 and entetes['ETag'] != etag
+    assert corps['donnees'][0]['revenu_mensuel'] == pytest.approx(revenu + 1000.0)
+
+
+def test_503_stockage_indisponible(serveur, monkeypatch):
+    def repondre(*args):
+        raise OSError("base verrouillée")
+
+    monkeypatch.setattr(serveur.service, 'repondre', repondre)
+    statut, entetes, corps = requete(serveur, 'metriques?territoire=REU')
+    assert statut == 503 and entetes['Retry-After'] == '1'
+    assert 'Stockage' in corps['erreur']
+
+
+def test_503_serveur_sature(serveur):
+    # Toutes les places (workers et file d'attente) sont prises
+    places = 0
+    while serveur._places.acquire(blocking=False):
+        places += 1
+    try:
+        statut, entetes, corps = requete(serveur, 'territoires')
+        assert statut == 503 and corps == {'erreur': 'serveur sature'}
+    finally:
+        for _ in range(places):
+            serveur._places.release()
+    assert requete(serveur, 'territoires')[0] == 200
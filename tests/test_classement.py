@@ -0,0 +1,53 @@
+# test_classement.py
+import numpy as np
+import pandas as pd
+
+from octroi.classement import HeavyHitters, SpaceSaving
+
+
+def flux_zipf(n=200_000, cles=5000, taille_lot=10_000, graine=0):
+    rng = np.random.default_rng(graine)
+    probabilites = 1 / np.arange(1, cles + 1) ** 1.1
+    probabilites /= probabilites.sum()
+    for _ in range(n // taille_lot):
+        yield rng.choice(cles, size=taille_lot, p=probabilites), rng.lognormal(0, 1, taille_lot)
+
+
+def test_space_saving_bornes():
+    resume = SpaceSaving(capacite=256)
+    exact = pd.Series(dtype=float)
+    for cles, poids in flux_zipf():
+        resume.ajouter(cles, poids)
+        exact = exact.add(pd.Series(poids).groupby(cles).sum(), fill_value=0)
+
+    reels = exact.reindex(resume.cles).to_numpy()
+    # Estimation par excès, d'au plus l'erreur déclarée
+    assert np.all(reels <= resume.comptes + 1e-6)
+    assert np.all(reels >= resume.comptes - resume.erreurs - 1e-6)
+    # Toute clé absente du résumé pèse au plus le minimum
+    absentes = exact.drop(resume.cles, errors='ignore')
+    assert absentes.max() <= resume.minimum + 1e-6
+    # Les clés les plus lourdes sont toutes suivies
+    assert set(exact.nlargest(10).index) <= set(resume.cles.tolist())
+
+
+def test_cles_entieres_et_libelles_fusionnees():
+    classement = HeavyHitters('importateur', capacite=16, libelle=lambda cle: f"IMP-{cle:05d}")
+    classement.ajouter(np.array([0, 1, 1]), [100.0, 50.0, 50.0])
+    classement.enregistrer([
+        {'importateur': 0, 'revenu': 10.0},
+        {'importateur': np.int64(1), 'revenu': 5.0},
+        {'importateur': 'SARL Port Est', 'revenu': 7.0},
+        {'revenu': 3.0},
+    ])
+    classement.enregistrer([{'importateur': 'SARL Port Est', 'revenu': 1.0}, {'importateur': 0, 'revenu': 1.0}])
+
+    top = classement.top(5)
+    assert top['estimation'].tolist() == [111.0, 105.0, 8.0]
+    assert top['libelle'].tolist() == ['IMP-00000', 'IMP-00001', 'SARL Port Est']
+
+
+def test_libelle_vide_conserve():
+    classement = HeavyHitters('ligne_tarifaire', libelle=lambda cle: 'défaut')
+    classement.ajouter(np.array([''], dtype=object), [1.0])
+    assert classement.top(1)['libelle'].tolist() == ['']
@@ -0,0 +1,44 @@
+# test_comparaisons.py
+import numpy as np
+import pandas as pd
+
+from octroi.comparaisons import PeriodComparator
+
+
+def mensuel(historique, secteur=None):
+    lignes = historique if secteur is None else historique[historique['secteur'] == secteur]
+    return lignes.groupby(lignes['date'].dt.to_period('M'))['revenu_octroi'].sum()
+
+
+def test_yoy_mom_ytd(cube, historique):
+    comparaisons = PeriodComparator(cube)
+    serie = mensuel(historique, 'TIC')
+    resultat = comparaisons.comparer('secteur', 'TIC', periode='2023-05')
+
+    mai, mai_n1, avril = (serie[pd.Period(p, 'M')] for p in ('2023-05', '2022-05', '2023-04'))
+    ytd = serie['2023-01':'2023-05'].sum()
+    ytd_n1 = serie['2022-01':'2022-05'].sum()
+    assert np.isclose(resultat['valeur'], mai)
+    assert np.isclose(resultat['yoy_pct'], (mai / mai_n1 - 1) * 100)
+    assert np.isclose(resultat['mom_pct'], (mai / avril - 1) * 100)
+    assert np.isclose(resultat['ytd'], ytd)
+    assert np.isclose(resultat['ytd_pct'], (ytd / ytd_n1 - 1) * 100)
+
+
+def test_premiere_annee_sans_reference(cube):
+    comparaisons = PeriodComparator(cube)
+    resultat = comparaisons.comparer('total', periode='2021-03')
+    assert np.isnan(resultat['yoy_pct']) and np.isnan(resultat['ytd_pct'])
+    assert np.isnan(comparaisons.comparer(periode='2019-01')['valeur'])
+
+
+def test_tableau_et_periode_courante(cube, historique):
+    comparaisons = PeriodComparator(cube)
+    tableau = comparaisons.tableau('categorie', periode='2024-06').set_index('categorie')
+    juin = historique[historique['date'].dt.to_period('M') == pd.Period('2024-06', 'M')]
+    assert np.isclose(tableau.loc['Services', 'valeur'], juin[juin['categorie'] == 'Services']['revenu_octroi'].sum())
+
+    # Période courante (2024-07) comparée à juillet 2023
+    assert comparaisons.periode_courante == pd.Period('2024-07', 'M')
+    reference = mensuel(historique)[pd.Period('2023-07', 'M')]
+    assert np.isclose(comparaisons.variation_courante(reference * 1.1, decalage=12), 10.0)
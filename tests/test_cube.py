@@ -0,0 +1,33 @@
+# test_cube.py
+import numpy as np
+
+
+def test_agregats_comme_groupby(cube, historique):
+    mois = historique['date'].dt.to_period('M')
+    par_secteur = historique.groupby(['secteur', mois])['revenu_octroi'].sum().unstack()
+    par_categorie = historique.groupby(['categorie', mois])['volume_importation'].sum().unstack()
+
+    assert np.allclose(cube.valeurs('secteur'), par_secteur.loc[cube.membres['secteur']].to_numpy())
+    assert np.allclose(cube.valeurs('categorie', 'volume'),
+                       par_categorie.loc[cube.membres['categorie']].to_numpy())
+    assert np.allclose(cube.serie('total').to_numpy(), historique.groupby(mois)['revenu_octroi'].sum().to_numpy())
+
+
+def test_coupes_et_descente(cube, historique):
+    coupe = cube.slice('secteur', ['TIC'], debut='2023-01', fin='2023-12')
+    attendu = historique[(historique['secteur'] == 'TIC') & (historique['date'].dt.year == 2023)]
+    assert len(coupe) == 12
+    assert np.isclose(coupe['revenu'].sum(), attendu['revenu_octroi'].sum())
+
+    assert cube.enfants('categorie', 'Construction') == ['BTP', 'MATERIAUX']
+    produits = cube.drill('secteur', 'MATERIAUX')
+    # Recette du secteur répartie au prorata volume × taux : 600 / 800 pour le ciment
+    ciment = produits[produits['produit'] == 'Ciment']['revenu'].sum()
+    assert np.isclose(ciment, 0.75 * cube.serie('secteur', 'MATERIAUX').sum())
+
+
+def test_heatmap(cube):
+    grille = cube.heatmap('total')
+    assert list(grille.index) == [2021, 2022, 2023, 2024]
+    assert grille.loc[2024, 7:].isna().all()
+    assert np.isclose(grille.loc[2022].sum(), cube.serie('total', debut='2022-01', fin='2022-12').sum())
@@ -0,0 +1,69 @@
+# test_historique.py
+import pandas as pd
+import pytest
+
+from octroi.historique import PandasHistory, creer_historique, signature_import
+
+duckdb = pytest.importorskip('duckdb')
+
+
+def comparer(resultat, attendu):
+    pd.testing.assert_frame_equal(resultat.reset_index(drop=True), attendu.reset_index(drop=True),
+                                  check_dtype=False, rtol=1e-9)
+
+
+def test_duckdb_identique_pandas(historique, tmp_path):
+    attendu = PandasHistory(historique).agregats_mensuels()
+    stockage = creer_historique('v1', lambda: historique, backend='duckdb', chemin=str(tmp_path / 'h.duckdb'))
+    assert stockage.nom == 'duckdb'
+    comparer(stockage.agregats_mensuels(), attendu)
+    # Deux déclarations par secteur et par mois
+    assert (attendu['declarations'] == 2).all()
+
+
+def test_reouverture_lecture_seule(historique, tmp_path):
+    chemin = str(tmp_path / 'h.duckdb')
+    appels = []
+
+    def generer():
+        appels.append(1)
+        return historique
+
+    premier = creer_historique('v1', generer, backend='duckdb', chemin=chemin)
+    attendu = premier.agregats_mensuels()
+    premier.fermer()
+
+    # Version déjà stockée : base rouverte en lecture seule, sans régénérer
+    second = creer_historique('v1', generer, backend='duckdb', chemin=chemin)
+    assert len(appels) == 1
+    assert second.lecture_seule and second.version == 'v1'
+    comparer(second.agregats_mensuels(), attendu)
+    with pytest.raises(duckdb.Error):
+        second._requete(f"DELETE FROM {second.table}")
+    second.fermer()
+
+    # Nouvelle version : la table est réécrite
+    troisieme = creer_historique('v2', generer, backend='duckdb', chemin=chemin)
+    assert len(appels) == 2 and troisieme.version == 'v2'
+    troisieme.fermer()
+
+
+def test_import_fichiers(historique, tmp_path):
+    for annee, lignes in historique.groupby(historique['date'].dt.year):
+        lignes.to_parquet(tmp_path / f"declarations_{annee}.parquet", index=False)
+    motif = str(tmp_path / '*.parquet')
+    version = signature_import(motif)
+    assert version.startswith('import-')
+
+    attendu = PandasHistory(historique).agregats_mensuels()
+    stockage = creer_historique(version, None, backend='duckdb', chemin=str(tmp_path / 'h.duckdb'), motif=motif)
+    assert stockage.version == version
+    comparer(stockage.agregats_mensuels(), attendu)
+    comparer(creer_historique(version, None, motif=motif).agregats_mensuels(), attendu)
+
+    # Un fichier modifié change la version, donc les caches qui en dépendent
+    historique.head(10).to_parquet(tmp_path / 'declarations_2024.parquet', index=False)
+    assert signature_import(motif) != version
+
+    with pytest.raises(FileNotFoundError):
+        signature_import(str(tmp_path / '*.csv'))
@@ -0,0 +1,45 @@
+# test_journal.py
+import numpy as np
+import pandas as pd
+
+from octroi.journal import LiveEventLog
+
+SECTEURS = ['BTP', 'TIC']
+
+
+def journal_rempli(n=40, capacite=8, snapshot_tous=4):
+    current_data = pd.DataFrame({'secteur': SECTEURS, 'revenu_mensuel': [1000.0, 500.0],
+                                 'volume_importation': [10.0, 5.0], 'variation_pct': [0.0, 0.0]})
+    journal = LiveEventLog(SECTEURS, capacite=capacite, snapshot_tous=snapshot_tous, capacite_snapshots=64)
+    journal.ouvrir(current_data, ts=0.0)
+    revenus = np.random.default_rng(0).uniform(-20, 20, size=n)
+    for t, revenu in enumerate(revenus, start=1):
+        journal.enregistrer([{'ts': float(t), 'secteur': 'BTP', 'revenu': revenu, 'volume': 1.0}])
+    return journal, revenus
+
+
+def somme_directe(revenus, ts):
+    return 1000.0 + revenus[:int(ts)].sum()
+
+
+def etat_btp(journal, ts):
+    return journal.etat(ts).set_index('secteur').loc['BTP', 'revenu_mensuel']
+
+
+def test_etat_dans_la_fenetre_conservee():
+    journal, revenus = journal_rempli()
+    # Les 8 derniers évènements sont conservés : reconstruction exacte
+    for ts in (33.0, 35.5, 39.0):
+        assert np.isclose(etat_btp(journal, ts), somme_directe(revenus, ts))
+    assert np.isclose(etat_btp(journal, None), somme_directe(revenus, 40))
+    # Secteur sans évènement : niveau d'ouverture
+    assert journal.etat(20.0).set_index('secteur').loc['TIC', 'revenu_mensuel'] == 500.0
+
+
+def test_etat_hors_fenetre_au_pas_des_snapshots():
+    journal, revenus = journal_rempli()
+    # Évènements écrasés : précision au dernier snapshot (tous les 4 évènements)
+    for ts in (4.0, 10.0, 22.5):
+        snapshot = 4 * (int(ts) // 4)
+        assert np.isclose(etat_btp(journal, ts), somme_directe(revenus, snapshot))
+    assert journal.memoire() == journal_rempli(n=1)[0].memoire()
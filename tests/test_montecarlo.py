@@ -0,0 +1,55 @@
+# test_montecarlo.py
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from octroi.montecarlo import MonteCarloProjection
+
+
+def cube_synthetique(revenus, debut='2020-01-01'):
+    """Cube minimal (secteurs × mois) pour la calibration Monte Carlo"""
+    revenus = np.atleast_2d(np.asarray(revenus, dtype=float))
+    return SimpleNamespace(
+        membres={'secteur': [f'S{i}' for i in range(len(revenus))]},
+        dates=pd.date_range(debut, periods=revenus.shape[1], freq='MS'),
+        valeurs=lambda niveau, mesure='revenu': revenus
+    )
+
+
+def test_p50_historique_plat():
+    rng = np.random.default_rng(1)
+    saison = 1 + 0.2 * np.sin(np.arange(12) * np.pi / 6)
+    revenus = 1e6 * np.tile(saison, (3, 6)) * np.exp(rng.normal(0, 0.15, (3, 72)))
+    projection = MonteCarloProjection(cube_synthetique(revenus), np.random.default_rng(0), n_chemins=4000)
+
+    recent = revenus[:, -12:].sum()
+    annuel = projection.annuel()
+    assert abs(annuel['p50'] / recent - 1) < 0.03
+    assert annuel['p10'] < recent < annuel['p90']
+
+
+def test_rupture_ancienne_ignoree():
+    # Chute puis rattrapage (2020-2021), plat ensuite : la tendance projetée reste plate
+    niveaux = np.concatenate([np.full(12, 0.5), np.full(12, 1.0), np.full(48, 1.0)])
+    revenus = 1e6 * niveaux[None, :]
+    projection = MonteCarloProjection(cube_synthetique(revenus), np.random.default_rng(0), n_chemins=1000)
+
+    assert projection.croissance == 0
+    assert np.allclose(projection.bandes()['p50'], 1e6)
+
+
+def test_douze_mois_croissance_nulle():
+    saison = 1e6 * (1 + 0.2 * np.sin(np.arange(12) * np.pi / 6))
+    projection = MonteCarloProjection(cube_synthetique(np.tile(saison, (2, 1))), np.random.default_rng(0),
+                                      horizon=24, n_chemins=200)
+
+    assert np.all(projection.croissance == 0)
+    assert np.allclose(projection.bandes()['p50'], 2 * np.tile(saison, 2))
+    assert np.isclose(projection.annuel()['p10'], 2 * saison.sum())
+
+
+def test_historique_trop_court():
+    with pytest.raises(ValueError, match="12 au minimum"):
+        MonteCarloProjection(cube_synthetique(np.ones((1, 11))), np.random.default_rng(0))
@@ -0,0 +1,93 @@
+# test_rapports.py
+import threading
+
+import pytest
+
+from octroi import rapports
+from octroi.rapports import ReportJobs
+
+FILTRES = {'categories': ['Construction'], 'debut': '2023-01', 'fin': '2024-06'}
+
+
+class Generations(list):
+    """Filtres des rapports générés"""
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    """Rapport factice : compte les générations, bloquées jusqu'à ``liberer``"""
+    generations = Generations()
+    liberer = threading.Event()
+
+    def sections(sources, filtres):
+        generations.append(dict(filtres))
+        liberer.wait(10)
+        return []
+
+    def ecrire(sections, chemin, entete):
+        with open(chemin, 'wb') as fichier:
+            fichier.write(entete.encode('utf-8'))
+
+    monkeypatch.setitem(rapports.RAPPORTS, 'test', {'titre': 'Test', 'sections': sections})
+    monkeypatch.setitem(rapports.ECRITURES, 'xlsx', ecrire)
+    monkeypatch.setitem(rapports.ECRITURES, 'pdf', ecrire)
+    generations.liberer = liberer
+    return generations
+
+
+def attendre(jobs, cle):
+    jobs._jobs[cle].result(timeout=10)
+
+
+def test_demandes_identiques_dedupliquees(generations, tmp_path):
+    jobs = ReportJobs(str(tmp_path), workers=2)
+    cle = jobs.soumettre('test', 'xlsx', FILTRES, 'v1', {}, 'entete')
+    # Même demande, filtres dans un autre ordre : même job en cours
+    assert jobs.soumettre('test', 'xlsx', dict(reversed(list(FILTRES.items()))), 'v1', {}, 'entete') == cle
+    assert jobs.etat(cle) in ('en_cours', 'en_attente')
+
+    generations.liberer.set()
+    attendre(jobs, cle)
+    assert jobs.etat(cle) == 'termine' and jobs.lire(cle) == b'entete'
+    # Artefact déjà écrit : réutilisé, y compris par une autre instance (redémarrage)
+    assert jobs.soumettre('test', 'xlsx', FILTRES, 'v1', {}, 'entete') == cle
+    assert ReportJobs(str(tmp_path)).soumettre('test', 'xlsx', FILTRES, 'v1', {}, 'entete') == cle
+    assert len(generations) == 1
+
+
+def test_cle_suit_type_format_filtres_version(generations, tmp_path):
+    generations.liberer.set()
+    jobs = ReportJobs(str(tmp_path), workers=2)
+    cles = [
+        jobs.soumettre('test', 'xlsx', FILTRES, 'v1', {}, 'entete'),
+        jobs.soumettre('test', 'pdf', FILTRES, 'v1', {}, 'entete'),
+        jobs.soumettre('test', 'xlsx', {**FILTRES, 'categories': ['Services']}, 'v1', {}, 'entete'),
+        jobs.soumettre('test', 'xlsx', FILTRES, 'v2', {}, 'entete'),
+    ]
+    assert len(set(cles)) == 4
+    assert jobs.cle('categories', 'xlsx', FILTRES, 'v1') not in cles
+    for cle in cles:
+        attendre(jobs, cle)
+    assert len(generations) == 4
+
+
+def test_job_en_erreur_resoumis(generations, tmp_path, monkeypatch):
+    generations.liberer.set()
+
+    def echec(sections, chemin, entete):
+        raise RuntimeError("moteur absent")
+
+    monkeypatch.setitem(rapports.ECRITURES, 'pdf', echec)
+    jobs = ReportJobs(str(tmp_path), workers=1)
+    cle = jobs.soumettre('test', 'pdf', FILTRES, 'v1', {}, 'entete')
+    with pytest.raises(RuntimeError):
+        attendre(jobs, cle)
+    assert jobs.etat(cle) == 'erreur' and 'moteur absent' in jobs.erreur(cle)
+
+    monkeypatch.setitem(rapports.ECRITURES, 'pdf', lambda sections, chemin, entete: open(chemin, 'wb').close())
+    assert jobs.soumettre('test', 'pdf', FILTRES, 'v1', {}, 'entete') == cle
+    attendre(jobs, cle)
+    assert jobs.etat(cle) == 'termine'
+    assert len(generations) == 2
+    # Aucun temporaire abandonné dans le dossier
+    assert sorted(p.name for p in tmp_path.iterdir()) == [cle]
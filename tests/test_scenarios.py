@@ -0,0 +1,47 @@
+# test_scenarios.py
+import numpy as np
+import pandas as pd
+
+from octroi.scenarios import ScenarioEngine, balayage, scenarios_depuis_table
+
+
+def moteur(cube, historique, secteurs):
+    taux = {'BTP': 2.0, 'MATERIAUX': 2.5, 'TIC': 4.0}
+    return ScenarioEngine(cube, historique, {s: {**infos, 'taux_normal': taux[s]} for s, infos in secteurs.items()})
+
+
+def test_facteur_applique_au_secteur(cube, historique, secteurs):
+    resultats = moteur(cube, historique, secteurs).evaluer([
+        {'nom': 'TIC +1', 'taux': {'TIC': 1.0}},
+        {'nom': 'TIC +1 élastique', 'taux': {'TIC': 1.0}, 'elasticites': {'TIC': -2.0}},
+    ])
+    ecarts = resultats.par_secteur().set_index(['scenario', 'secteur'])
+    reference = ecarts.loc[('Référence', 'TIC'), 'revenu']
+
+    # Projection au taux normal 4 % : facteur 5 / 4, puis volumes × (1 - 2 × 1 / 104)
+    assert np.isclose(ecarts.loc[('TIC +1', 'TIC'), 'revenu'], reference * 5 / 4)
+    assert np.isclose(ecarts.loc[('TIC +1 élastique', 'TIC'), 'revenu'], reference * 5 / 4 * (1 - 2 / 104))
+    assert ecarts.loc[('TIC +1', 'BTP'), 'ecart'] == 0
+
+    synthese = resultats.synthese().set_index('scenario')
+    assert np.isclose(synthese.loc['TIC +1', 'ecart_projete'], reference / 4)
+    assert synthese.loc['Référence', 'ecart_historique'] == 0
+
+
+def test_historique_au_taux_moyen_pondere(cube, historique, secteurs):
+    resultats = moteur(cube, historique, secteurs).evaluer([{'nom': 'BTP +0.5', 'taux': {'BTP': 0.5}}])
+    btp = historique[historique['secteur'] == 'BTP']
+    mois = btp['date'].dt.to_period('M')
+    recettes = btp.groupby(mois)['revenu_octroi'].sum()
+    taux = (btp['taux_moyen'] * btp['revenu_octroi']).groupby(mois).sum() / recettes
+    attendu = (recettes * (taux + 0.5) / taux).sum()
+    historique_btp = resultats.par_secteur('historique').set_index(['scenario', 'secteur'])
+    assert np.isclose(historique_btp.loc[('BTP +0.5', 'BTP'), 'revenu'], attendu)
+
+
+def test_table_et_balayage():
+    table = pd.DataFrame({'scenario': ['A', 'A', None], 'secteur': ['TIC', 'BTP', 'TIC'],
+                          'delta_taux': [1.0, None, 2.0], 'elasticite': [-1.0, 0.5, 0.0]})
+    assert scenarios_depuis_table(table) == [
+        {'nom': 'A', 'taux': {'TIC': 1.0, 'BTP': 0.0}, 'elasticites': {'TIC': -1.0, 'BTP': 0.5}}]
+    assert [s['nom'] for s in balayage(['TIC'], [-1, 0, 1])] == ['TIC -1.00 pt', 'TIC +1.00 pt']
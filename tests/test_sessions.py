@@ -0,0 +1,109 @@
+# test_sessions.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from octroi import sessions
+from octroi.sessions import SessionMemory, taille_octets
+
+
+class Horloge:
+    """time.monotonic contrôlé par le test"""
+
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    horloge = Horloge()
+    monkeypatch.setattr(sessions.time, 'monotonic', horloge)
+    return horloge
+
+
+def memoire(**options):
+    return SessionMemory(**{'budget_session': 300, 'plafond': 500, 'inactivite': 60, 'surveiller': False,
+                            **options})
+
+
+def test_taille_octets():
+    assert taille_octets(b'x' * 100) == 100
+    assert taille_octets(np.zeros(10)) == 80
+    assert taille_octets({'a': b'xx', 'b': [b'xxx', 'yyyy']}) == 9
+    assert taille_octets(pd.DataFrame({'a': np.zeros(4)})) >= 32
+
+
+def test_valeur_conservee_puis_recalculee(horloge):
+    memoire_sessions = memoire()
+    appels = []
+
+    def calculer():
+        appels.append(1)
+        return b'x' * 100
+
+    assert memoire_sessions.obtenir('s1', 'cle', calculer) == b'x' * 100
+    memoire_sessions.obtenir('s1', 'cle', calculer)
+    assert len(appels) == 1
+    # Trop volumineuse pour le budget : calculée, jamais retenue
+    memoire_sessions.obtenir('s1', 'grosse', lambda: b'x' * 400)
+    assert memoire_sessions.stats('s1')['octets_session'] == 100
+
+
+def test_budget_session_lru(horloge):
+    memoire_sessions = memoire()
+    for cle in ('a', 'b', 'c'):
+        memoire_sessions.obtenir('s1', cle, lambda: b'x' * 100)
+    # 'a' redevient la plus récente : 'b' est évincée en premier
+    memoire_sessions.obtenir('s1', 'a', lambda: pytest.fail("'a' doit être conservée"))
+    memoire_sessions.obtenir('s1', 'd', lambda: b'x' * 100)
+
+    assert set(cle for _, cle in memoire_sessions._entrees) == {'a', 'c', 'd'}
+    assert memoire_sessions.stats('s1')['octets_session'] == 300
+    assert memoire_sessions.evictions == 1
+
+
+def test_plafond_global_lru(horloge):
+    memoire_sessions = memoire()
+    memoire_sessions.obtenir('s1', 'a', lambda: b'x' * 200)
+    horloge.t += 1
+    memoire_sessions.obtenir('s2', 'a', lambda: b'x' * 200)
+    horloge.t += 1
+    memoire_sessions.obtenir('s1', 'a', lambda: pytest.fail("entrée conservée"))
+    # Plafond dépassé : l'entrée la moins récemment utilisée (s2) est évincée
+    memoire_sessions.obtenir('s3', 'a', lambda: b'x' * 200)
+
+    stats = memoire_sessions.stats()
+    assert stats['octets'] == 400 <= stats['plafond']
+    assert set(session for session, _ in memoire_sessions._entrees) == {'s1', 's3'}
+
+
+def test_purge_sessions_inactives(horloge):
+    memoire_sessions = memoire()
+    memoire_sessions.obtenir('s1', 'a', lambda: b'x' * 100)
+    horloge.t += 30
+    memoire_sessions.obtenir('s2', 'a', lambda: b'x' * 100)
+    horloge.t += 40
+
+    # s1 inactive depuis 70 s (> 60 s), s2 depuis 40 s
+    memoire_sessions.purger()
+    assert memoire_sessions.stats('s1')['octets_session'] == 0
+    assert memoire_sessions.stats('s2')['octets_session'] == 100
+    assert memoire_sessions.stats()['sessions'] == 1
+
+
+def test_purge_sessions_deconnectees(horloge):
+    connectees = {'s1', 's2'}
+    memoire_sessions = memoire(est_active=lambda session: session in connectees)
+    for session in connectees:
+        memoire_sessions.obtenir(session, 'a', lambda: b'x' * 100)
+
+    connectees.discard('s2')
+    memoire_sessions.purger()
+    assert memoire_sessions.stats('s2')['octets_session'] == 0
+    assert memoire_sessions.stats('s1')['octets_session'] == 100
+
+    memoire_sessions.liberer('s1')
+    assert memoire_sessions.stats()['entrees'] == 0
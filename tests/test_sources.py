@@ -0,0 +1,48 @@
+# test_sources.py
+import json
+import time
+
+from octroi.sources import agreger_lot, creer_source, parse_evenement
+
+
+def attendre_fin(source, delai=5.0):
+    fin = time.time() + delai
+    while not source.stats()['termine'] and time.time() < fin:
+        time.sleep(0.02)
+    return source.poll()
+
+
+def test_parse_evenement():
+    assert parse_evenement(b'{"secteur": "BTP", "revenu": "12.5"}\n')['revenu'] == 12.5
+    assert parse_evenement('{"revenu": 3}') is None
+    assert parse_evenement('{"secteur": "BTP", "revenu": "abc"}') is None
+    assert parse_evenement('pas du json') is None
+
+
+def test_rejeu_ndjson(tmp_path):
+    chemin = tmp_path / 'journee.ndjson'
+    lignes = [
+        json.dumps({'ts': 1000.0, 'secteur': 'BTP', 'revenu': 100.0, 'volume': 2}),
+        'pas du json',
+        json.dumps({'ts': 1001.0, 'revenu': 5.0}),
+        json.dumps({'ts': 1002.0, 'secteur': 'TIC', 'revenu': 'n/a'}),
+        json.dumps({'ts': 1003.0, 'secteur': 'TIC', 'revenu': 40.0, 'volume': 1}),
+        json.dumps({'ts': 1004.0, 'secteur': 'BTP', 'revenu': 60.0, 'volume': 3}),
+    ]
+    chemin.write_text('\n'.join(lignes) + '\n', encoding='utf-8')
+
+    source = creer_source(f"replay://{chemin}?vitesse=0", intervalle_lot=0.05).start()
+    try:
+        evenements = attendre_fin(source)
+    finally:
+        source.close()
+
+    stats = source.stats()
+    assert stats['rejets'] == 3
+    assert stats['evenements'] == 3
+    assert [e['ts_origine'] for e in evenements] == [1000.0, 1003.0, 1004.0]
+    # Horodatages recalés sur l'heure du rejeu, écarts conservés (vitesse 0 : aucun)
+    assert all(e['ts'] > 1e9 for e in evenements)
+    agregats = agreger_lot(evenements)
+    assert agregats['BTP']['revenu'] == 160.0 and agregats['BTP']['n'] == 2
+    assert agregats['TIC']['volume'] == 1.0